@@ -10,9 +10,14 @@ Future improvements:
 
 '''
 
+import contextlib
+import functools
 import os
 import random
+import sys
+import threading
 from dataclasses import dataclass, field
+from typing import Callable
 
 CARD_SUITS = ('Hearts', 'Clubs', 'Diamonds', 'Spades')
 CARD_SUIT_SYMBOLS = {'Hearts': '♥', 'Clubs': '♣', 'Diamonds': '♦',
@@ -26,6 +31,21 @@ NUM_SHOE_DECKS = 6
 SHOE_CUT_CARD_POSITION = 52  # Reshuffle when one deck remains in the shoe
 MAX_SPLITS = 4
 SCREEN_WIDTH = 80
+CLEAR_SCREEN = '\x1b[2J\x1b[H'  # ANSI: erase the screen, cursor to top left
+
+# Per-thread state; see thread_rng()
+_thread_state = threading.local()
+
+
+def thread_rng() -> random.Random:
+    '''
+    Returns the calling thread's own random generator, creating it on first
+    use. Tables running in different threads never share generator state.
+    '''
+    rng = getattr(_thread_state, 'rng', None)
+    if rng is None:
+        rng = _thread_state.rng = random.Random()
+    return rng
 
 
 @dataclass
@@ -126,18 +146,32 @@ class Dealer:
     Represents a dealer in a game of Blackjack.
     '''
 
-    def __init__(self, num_shoe_decks: int, shoe_cut_card_position: int):
+    def __init__(self, num_shoe_decks: int, shoe_cut_card_position: int,
+                 rng: random.Random | None = None):
         self.hand: Hand = Hand()
         self.shoe: list[Card] = []
         self.discard: list[Card] = []
         self.shoe_cut_card_position: int = shoe_cut_card_position
         self.drew_cut_card: bool = False
+        # Running counts, e.g. for progress reporting
+        self.cards_dealt: int = 0
+        self.reshuffles: int = 0
+        # Uses the thread's generator unless a seeded one is supplied
+        self.rng: random.Random = rng if rng is not None else thread_rng()
 
         # Fill shoe and shuffle
         for _ in range(num_shoe_decks):
             deck = Deck()
             self.shoe.extend(deck.cards)
-        random.shuffle(self.shoe)
+        self.shuffle_shoe()
+
+    def shuffle_shoe(self) -> None:
+        '''
+        Shuffles the shoe in place. The last card of the list is the top of
+        the shoe. Subclasses can model other shuffles (see
+        blackjack_shuffles).
+        '''
+        self.rng.shuffle(self.shoe)
 
     def deal_one(self, face_up: bool = False) -> Card:
         '''
@@ -150,10 +184,12 @@ class Dealer:
         if len(self.shoe) == 0:
             # Special case: Put discard into shoe, shuffle, then deal
             self.shoe.extend(self.discard)
-            random.shuffle(self.shoe)
+            self.shuffle_shoe()
             self.discard.clear()
+            self.reshuffles += 1
         dealt_card = self.shoe.pop()
         dealt_card.face_up = face_up
+        self.cards_dealt += 1
         return dealt_card
 
     def reveal_blackjack(self) -> None:
@@ -172,8 +208,9 @@ class Dealer:
         if self.drew_cut_card:
             self.shoe.extend(self.discard)
             self.discard.clear()
-            random.shuffle(self.shoe)
+            self.shuffle_shoe()
             self.drew_cut_card = False
+            self.reshuffles += 1
 
 
 @dataclass
@@ -190,13 +227,19 @@ class Player:
         return f"Player {self.number} ({self.name})"
 
 
-def get_num_players() -> int:
+# Reads one line of user input given a prompt, like the built-in input()
+InputProvider = Callable[[str], str]
+# Redraws the table after a change (see blackjack_render)
+Refresh = Callable[[], None]
+
+
+def get_num_players(read_input: InputProvider = input) -> int:
     '''
     Requests number of players from the user and returns it as an int.
     '''
     while True:
         try:
-            num_players = int(input("Please enter number of players: "))
+            num_players = int(read_input("Please enter number of players: "))
         except ValueError:
             print("Sorry, that's not a valid input.")
         else:
@@ -205,7 +248,8 @@ def get_num_players() -> int:
             print("Please enter a number greater than 0.")
 
 
-def setup_players(num_players: int, starting_bank: int) -> list[Player]:
+def setup_players(num_players: int, starting_bank: int,
+                  read_input: InputProvider = input) -> list[Player]:
     '''
     Sets up each Player object. Requests player names and prints a message to
     welcome them.
@@ -213,8 +257,8 @@ def setup_players(num_players: int, starting_bank: int) -> list[Player]:
     players = []
     for player_num in range(1, num_players+1):
         while True:
-            player_name = input(f"Player {player_num} - "
-                                "Please enter your name: ")
+            player_name = read_input(f"Player {player_num} - "
+                                     "Please enter your name: ")
             if len(player_name) > 0:
                 break
         players.append(Player(player_num, player_name, starting_bank))
@@ -222,7 +266,8 @@ def setup_players(num_players: int, starting_bank: int) -> list[Player]:
     return players
 
 
-def get_player_bets(players: list[Player], minimum_bet: int) -> None:
+def get_player_bets(players: list[Player], minimum_bet: int,
+                    read_input: InputProvider = input) -> None:
     '''
     Requests the initial bet for each player.
     '''
@@ -231,7 +276,8 @@ def get_player_bets(players: list[Player], minimum_bet: int) -> None:
         placed_bet = False
         while not placed_bet:
             try:
-                bet = int(input(f"{player} has ${player.bank}. Your bet: "))
+                bet = int(read_input(f"{player} has ${player.bank}. "
+                                     "Your bet: "))
             except ValueError:
                 print("Sorry, that's not a valid input.")
             else:
@@ -249,32 +295,54 @@ def get_player_bets(players: list[Player], minimum_bet: int) -> None:
                     print(f"Bet must be at least ${minimum_bet}.")
 
 
-def hit_stay_split_or_dd(offer_double_down: bool, offer_split: bool) -> str:
+def hit_stay_split_or_dd(offer_double_down: bool, offer_split: bool,
+                         read_input: InputProvider = input) -> str:
     '''
     Requests that a user hit, stay, split or double down and performs input
     validation until a valid input is received.
     '''
     if offer_split:
         while True:
-            response = input(
+            response = read_input(
                 "Hit, Stay, Split, or Double Down? (h/s/p/d): ").lower()
             if response in ('h', 's', 'p', 'd'):
                 return response
             print("Please enter 'h', 's', 'p' or 'd'.")
     elif offer_double_down:
         while True:
-            response = input("Hit, Stay, or Double Down? (h/s/d): ").lower()
+            response = read_input(
+                "Hit, Stay, or Double Down? (h/s/d): ").lower()
             if response in ('h', 's', 'd'):
                 return response
             print("Please enter 'h', 's' or 'd'.")
     else:
         while True:
-            response = input("Hit or Stay? (h/s): ").lower()
+            response = read_input("Hit or Stay? (h/s): ").lower()
             if response in ('h', 's'):
                 return response
             print("Please enter 'h' or 's'.")
 
 
+def can_double_down(player: Player, hand: Hand, first_turn: bool) -> bool:
+    '''
+    Returns True if the player may double down on the hand: only on the first
+    decision for the hand, and only if the bank covers the extra bet.
+    '''
+    return first_turn and player.bank >= hand.bet
+
+
+def can_split(player: Player, hand: Hand, num_hands: int,
+              max_splits: int = MAX_SPLITS) -> bool:
+    '''
+    Returns True if the player may split the hand: two cards of equal value,
+    enough in the bank to match the bet, and fewer than max_splits hands.
+    '''
+    return (len(hand.cards) == 2 and
+            hand.cards[0].value() == hand.cards[1].value() and
+            player.bank >= hand.bet and
+            num_hands < max_splits)
+
+
 def print_header(message: object) -> None:
     '''
     Prints a message center aligned and padded by dashes. Fills the width of
@@ -340,10 +408,21 @@ def print_hand(player_name: str,
         print(f"{player_name} Hand {current_hand_index+1}: {hand}")
 
 
-def play_player_rounds(players: list[Player], dealer: Dealer) -> None:
+def play_player_rounds(players: list[Player],
+                       dealer: Dealer,
+                       strategy: Callable[[Hand, int, bool, bool], str]
+                       | None = None,
+                       read_input: InputProvider = input,
+                       refresh: Refresh | None = None) -> None:
     '''
     Plays each player's hand (for players with an active bet, e.g. > 0),
-    requesting hit/stay. Automatically handles busts and 21s.
+    requesting hit/stay. Automatically handles busts and 21s. If refresh is
+    given it is called after every change to a hand instead of printing the
+    hand.
+
+    If a strategy is given it makes every decision instead of prompting: it
+    is called with the hand, the dealer upcard value and whether doubling
+    down and splitting are offered, and returns 'h', 's', 'p' or 'd'.
     '''
     for player in players:
         initial_bet = player.hands[0].bet
@@ -351,27 +430,31 @@ def play_player_rounds(players: list[Player], dealer: Dealer) -> None:
             print_header(player)
             num_hands = 1
             current_hand_index = 0
-            print(f"Dealer: {dealer.hand}")
+            if refresh is None:
+                print(f"Dealer: {dealer.hand}")
             while current_hand_index < num_hands:
                 stay = False
                 first_turn = True
                 hand = player.hands[current_hand_index]
-                print_hand(player.name, hand, num_hands, current_hand_index)
+                if refresh is None:
+                    print_hand(player.name, hand, num_hands,
+                               current_hand_index)
                 while not stay:
-                    offer_double_down = (first_turn and
-                                         player.bank >= hand.bet)
-                    offer_split = (len(hand.cards) == 2 and
-                                   (hand.cards[0].value() ==
-                                    hand.cards[1].value()) and
-                                   player.bank >= hand.bet and
-                                   num_hands < MAX_SPLITS)
+                    offer_double_down = can_double_down(player, hand,
+                                                        first_turn)
+                    offer_split = can_split(player, hand, num_hands)
 
                     # Automatically hit if we have split
                     if len(hand.cards) == 1:
                         response = 'auto_hit_split'
+                    elif strategy is not None:
+                        response = strategy(hand,
+                                            dealer.hand.cards[1].value(),
+                                            offer_double_down, offer_split)
                     else:
                         response = hit_stay_split_or_dd(offer_double_down,
-                                                        offer_split)
+                                                        offer_split,
+                                                        read_input)
 
                     if response == 's':  # Stay
                         stay = True
@@ -392,17 +475,21 @@ def play_player_rounds(players: list[Player], dealer: Dealer) -> None:
                         player.bank -= hand.bet
                         player.hands.append(split_hand)
                         num_hands += 1
+                        if refresh is None:
+                            print_hand(player.name,
+                                       hand,
+                                       num_hands,
+                                       current_hand_index)
+
+                    # Hit and handle the outcome
+                    hand.cards.append(dealer.deal_one(True))
+                    if refresh is None:
                         print_hand(player.name,
                                    hand,
                                    num_hands,
                                    current_hand_index)
-
-                    # Hit and handle the outcome
-                    hand.cards.append(dealer.deal_one(True))
-                    print_hand(player.name,
-                               hand,
-                               num_hands,
-                               current_hand_index)
+                    else:
+                        refresh()
                     if hand.is_bust():
                         print(f"Bust! You lost your bet of ${hand.bet} and "
                               f"have ${player.bank} remaining.")
@@ -450,18 +537,26 @@ def resolve_player_bets(players: list[Player], dealer: Dealer) -> None:
                       f"They now have ${player.bank}.")
 
 
-def play_dealer_round(dealer: Dealer) -> None:
+def play_dealer_round(dealer: Dealer, refresh: Refresh | None = None) -> None:
     '''
-    Plays the dealer's hand (stands on 17, must hit on soft 17 or less)
+    Plays the dealer's hand (stands on 17, must hit on soft 17 or less). If
+    refresh is given it is called after every card instead of printing the
+    hand.
     '''
     print_header("Dealer")
     dealer.hand.cards[0].face_up = True
-    print(dealer.hand)
+    if refresh is None:
+        print(dealer.hand)
+    else:
+        refresh()
     while (dealer.hand.value() < 17 or
            (dealer.hand.value() == 17 and dealer.hand.is_soft())):
         print("Dealer hits.")
         dealer.hand.cards.append(dealer.deal_one(True))
-        print(dealer.hand)
+        if refresh is None:
+            print(dealer.hand)
+        else:
+            refresh()
     if dealer.hand.is_bust():
         print("Dealer busted!")
     else:
@@ -485,31 +580,40 @@ def remove_bankrupt_players(players: list[Player], minimum_bet: int) -> None:
     '''
     Remove players from the player list who cannot meet the minimum bet.
     '''
-    for player in players[:]:
+    remaining = []
+    for player in players:
         if player.bank < minimum_bet:
-            players.remove(player)
             print(f"{player} only has ${player.bank} which is less than the "
                   f"minimum bet of ${minimum_bet}. They are removed from the "
                   "table.")
+        else:
+            remaining.append(player)
+    # One pass instead of list.remove() per player, which is O(n^2)
+    players[:] = remaining
 
 
-def deal_first_two_cards(players: list[Player], dealer: Dealer) -> None:
+def deal_first_two_cards(players: list[Player], dealer: Dealer,
+                         refresh: Refresh | None = None) -> None:
     '''
     Deals the first two cards to the dealer and players. The first dealer card
-    is face down, all other cards are face up. Prints the results.
+    is face down, all other cards are face up. Prints the results, or calls
+    refresh after every card if it is given.
     '''
     print_header("Dealer")
     print("Dealing cards...")
 
-    # Deal first card
-    dealer.hand.cards.append(dealer.deal_one(False))
-    for player in players:
-        player.hands[0].cards.append(dealer.deal_one(True))
+    # Deal first card, then second card
+    for face_up in (False, True):
+        dealer.hand.cards.append(dealer.deal_one(face_up))
+        if refresh is not None:
+            refresh()
+        for player in players:
+            player.hands[0].cards.append(dealer.deal_one(True))
+            if refresh is not None:
+                refresh()
 
-    # Deal second card
-    dealer.hand.cards.append(dealer.deal_one(True))
-    for player in players:
-        player.hands[0].cards.append(dealer.deal_one(True))
+    if refresh is not None:
+        return
 
     # Announce cards
     print(f"Dealer shows: {dealer.hand}")
@@ -517,7 +621,8 @@ def deal_first_two_cards(players: list[Player], dealer: Dealer) -> None:
         print(f"{player} shows: {player.hands[0]}")
 
 
-def should_game_on(players: list[Player]) -> bool:
+def should_game_on(players: list[Player],
+                   read_input: InputProvider = input) -> bool:
     '''
     Decides whether the game should continue, returns True (to continue) or
     False (to end game).
@@ -527,7 +632,7 @@ def should_game_on(players: list[Player]) -> bool:
         return False
 
     while True:
-        response = input("Play another round? (y/n): ")
+        response = read_input("Play another round? (y/n): ")
         if response.lower() == 'y':
             return True
         if response.lower() == 'n':
@@ -535,45 +640,97 @@ def should_game_on(players: list[Player]) -> bool:
         print("Please enter 'y' or 'n'.")
 
 
-def main():
+def clear_terminal() -> None:
     '''
-    The Blackjack game.
+    Clears the terminal. Legacy Windows consoles do not understand ANSI
+    escape sequences, so there the screen is cleared with cls.
     '''
-    os.system('cls' if os.name == 'nt' else 'clear')  # Clear screen
+    if os.name == 'nt':
+        os.system('cls')
+    else:
+        print(CLEAR_SCREEN, end='', flush=True)
+
+
+def main(prepare_shoes: bool = False,
+         read_input: InputProvider = input,
+         clear_screen: bool = True,
+         rng: random.Random | None = None,
+         render: bool = False):
+    '''
+    The Blackjack game. With prepare_shoes the next shoe is shuffled in the
+    background so reshuffles do not pause the game (see blackjack_shoeprep).
+
+    Every prompt is answered by read_input, so a script can play the game
+    without a terminal (see blackjack_driver), in which case clear_screen
+    should be False. rng seeds the dealer's shuffles.
+
+    With render the table is kept in a panel at the top of the terminal that
+    is redrawn in place after every card (see blackjack_render) instead of
+    reprinting the hands.
+    '''
+    if clear_screen:
+        clear_terminal()
     print_header("Welcome to Blackjack!")
 
-    num_players = get_num_players()
-    active_players = setup_players(num_players, PLAYER_STARTING_BANK)
+    num_players = get_num_players(read_input)
+    active_players = setup_players(num_players, PLAYER_STARTING_BANK,
+                                   read_input)
     all_players = active_players[:]
 
-    dealer = Dealer(NUM_SHOE_DECKS, SHOE_CUT_CARD_POSITION)
+    # The shoe-preparing thread and the table panel are shut down however
+    # the game ends, including Ctrl-C or EOF at a prompt
+    with contextlib.ExitStack() as cleanup:
+        if prepare_shoes:
+            # pylint: disable-next=import-outside-toplevel
+            from blackjack_shoeprep import PreparedShoeDealer
+            dealer = cleanup.enter_context(PreparedShoeDealer(
+                NUM_SHOE_DECKS, SHOE_CUT_CARD_POSITION, rng))
+        else:
+            dealer = Dealer(NUM_SHOE_DECKS, SHOE_CUT_CARD_POSITION, rng)
+
+        refresh = None
+        if render:
+            # pylint: disable-next=import-outside-toplevel
+            from blackjack_render import panel_fits
+            # pylint: disable-next=import-outside-toplevel
+            from blackjack_render import TableDisplay
+            # A terminal too short for the panel gets the printed hands
+            if panel_fits(num_players):
+                display = cleanup.enter_context(TableDisplay(num_players))
+                refresh = functools.partial(display.update, dealer,
+                                            active_players)
+                refresh()
 
-    print_game_rules()
+        print_game_rules()
 
-    game_on = True
+        game_on = True
 
-    while game_on:
-        get_player_bets(active_players, MINIMUM_BET)
+        while game_on:
+            get_player_bets(active_players, MINIMUM_BET, read_input)
 
-        deal_first_two_cards(active_players, dealer)
+            deal_first_two_cards(active_players, dealer, refresh)
 
-        if dealer.hand.is_blackjack():
-            dealer.reveal_blackjack()
-        else:
-            payout_any_player_blackjacks(active_players)
-            play_player_rounds(active_players, dealer)
-            play_dealer_round(dealer)
+            if dealer.hand.is_blackjack():
+                dealer.reveal_blackjack()
+            else:
+                payout_any_player_blackjacks(active_players)
+                play_player_rounds(active_players, dealer,
+                                   read_input=read_input, refresh=refresh)
+                play_dealer_round(dealer, refresh)
 
-        resolve_player_bets(active_players, dealer)
+            resolve_player_bets(active_players, dealer)
 
-        discard_cards(active_players, dealer)
+            discard_cards(active_players, dealer)
 
-        remove_bankrupt_players(active_players, MINIMUM_BET)
+            remove_bankrupt_players(active_players, MINIMUM_BET)
 
-        if should_game_on(active_players):
-            dealer.reshuffle_shoe_if_needed()
-        else:
-            game_on = False
+            if refresh is not None:
+                refresh()
+
+            if should_game_on(active_players, read_input):
+                dealer.reshuffle_shoe_if_needed()
+            else:
+                game_on = False
 
     print_header("Game over")
     print_final_stats(all_players, PLAYER_STARTING_BANK)
@@ -581,4 +738,11 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == 'simulate':
+        # Imported here so the interactive game never pays for the simulator
+        import blackjack_sim
+        sys.exit(blackjack_sim.main(sys.argv[2:]))
+    # Legacy Windows consoles cannot draw the ANSI table panel
+    main(prepare_shoes='--prepare-shoes' in sys.argv[1:],
+         render=(sys.stdout.isatty() and os.name != 'nt' and
+                 '--plain' not in sys.argv[1:]))
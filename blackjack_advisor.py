@@ -0,0 +1,313 @@
+'''
+Composition-dependent optimal-play advisor.
+Author: Chris Leung
+
+Given the exact cards the player has not seen (the cards left in the shoe
+plus the dealer's face-down hole card), the hand being played and the dealer
+upcard, the Advisor works out the expected value of hitting, staying,
+doubling down and splitting under the blackjack_2026 house rules, and
+recommends the best one.
+
+* The dealer stands on hard 17 and hits soft 17.
+* The dealer has already checked for blackjack (see main()), so the hole
+  card is known not to complete a dealer blackjack.
+* A split is valued as two independent hands that may double down but are
+  not split again, and split aces get one card each.
+
+EVs are per unit of the hand's current bet. Results are kept in an LRU cache
+keyed by (composition, hand state, upcard) whose size is capped in bytes, so
+a long shoe session cannot exhaust memory.
+'''
+
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from blackjack_2026 import Card
+from blackjack_2026 import Dealer
+from blackjack_2026 import Hand
+
+# Compositions are tuples of card counts indexed by card value - 1, so
+# composition[0] is the number of aces and composition[9] the number of
+# ten-valued cards
+NUM_CARD_VALUES = 10
+DEALER_OUTCOMES = (17, 18, 19, 20, 21, 22)  # 22 means the dealer busted
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def composition_of(cards: list[Card]) -> tuple[int, ...]:
+    '''
+    Returns the composition (count of each card value) of a list of cards.
+    '''
+    counts = [0] * NUM_CARD_VALUES
+    for card in cards:
+        counts[card.value() - 1] += 1
+    return tuple(counts)
+
+
+def unseen_composition(dealer: Dealer) -> tuple[int, ...]:
+    '''
+    Returns the composition of the cards a player cannot see: the shoe and
+    any of the dealer's face-down cards.
+    '''
+    return composition_of(dealer.shoe + [card for card in dealer.hand.cards
+                                         if not card.face_up])
+
+
+@dataclass
+class Advice:
+    '''
+    The best action ('h', 's', 'd' or 'p') for a hand and the EV of every
+    action that was considered.
+    '''
+    action: str
+    evs: dict[str, float] = field(default_factory=dict)
+
+
+def remove_card(composition: tuple[int, ...],
+                value: int) -> tuple[int, ...]:
+    '''
+    Returns the composition with one card of the given value removed.
+    '''
+    return (composition[:value-1] + (composition[value-1] - 1,) +
+            composition[value:])
+
+
+def best_total(hard_total: int, has_ace: bool) -> int:
+    '''
+    Returns the total of a hand, counting an ace as 11 if that does not bust.
+    '''
+    if has_ace and hard_total + 10 <= 21:
+        return hard_total + 10
+    return hard_total
+
+
+def _approximate_size(obj: object) -> int:
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (tuple, list)):
+        size += sum(_approximate_size(item) for item in obj)
+    elif isinstance(obj, dict):
+        size += sum(_approximate_size(key) + _approximate_size(value)
+                    for key, value in obj.items())
+    elif isinstance(obj, Advice):
+        size += _approximate_size(obj.action) + _approximate_size(obj.evs)
+    return size
+
+
+class _Evaluation:
+    '''
+    The EV calculations for one dealer upcard. Memoizes intermediate results
+    for the duration of a single Advisor.advise() call.
+    '''
+
+    def __init__(self, upcard: int):
+        self.upcard = upcard
+        self.dealer_memo: dict = {}
+        self.stand_memo: dict = {}
+        self.hit_memo: dict = {}
+
+    def _dealer_draws(self, hard_total: int, has_ace: bool,
+                      composition: tuple[int, ...]) -> tuple[float, ...]:
+        key = (hard_total, has_ace, composition)
+        if key in self.dealer_memo:
+            return self.dealer_memo[key]
+        total = best_total(hard_total, has_ace)
+        outcome = [0.0] * len(DEALER_OUTCOMES)
+        if hard_total > 21:
+            outcome[-1] = 1.0
+        elif total > 17 or (total == 17 and total == hard_total):
+            outcome[total - 17] = 1.0
+        else:
+            num_cards = sum(composition)
+            for value in range(1, NUM_CARD_VALUES + 1):
+                count = composition[value-1]
+                if count == 0:
+                    continue
+                after = self._dealer_draws(hard_total + value,
+                                           has_ace or value == 1,
+                                           remove_card(composition, value))
+                for index, probability in enumerate(after):
+                    outcome[index] += probability * count / num_cards
+        result = tuple(outcome)
+        self.dealer_memo[key] = result
+        return result
+
+    def dealer_outcomes(self,
+                        composition: tuple[int, ...]) -> tuple[float, ...]:
+        '''
+        Returns the probability of each dealer final total, given that the
+        dealer does not have blackjack.
+        '''
+        # The hole card cannot complete a blackjack
+        excluded = {1: 10, 10: 1}.get(self.upcard)
+        num_cards = sum(composition)
+        if excluded is not None:
+            num_cards -= composition[excluded-1]
+        outcome = [0.0] * len(DEALER_OUTCOMES)
+        for value in range(1, NUM_CARD_VALUES + 1):
+            count = composition[value-1]
+            if count == 0 or value == excluded:
+                continue
+            after = self._dealer_draws(self.upcard + value,
+                                       self.upcard == 1 or value == 1,
+                                       remove_card(composition, value))
+            for index, probability in enumerate(after):
+                outcome[index] += probability * count / num_cards
+        return tuple(outcome)
+
+    def stand(self, total: int, composition: tuple[int, ...]) -> float:
+        '''
+        Returns the EV of standing on a total.
+        '''
+        key = (total, composition)
+        if key not in self.stand_memo:
+            ev = 0.0
+            for dealer_total, probability in zip(
+                    DEALER_OUTCOMES, self.dealer_outcomes(composition)):
+                if dealer_total > 21 or dealer_total < total:
+                    ev += probability
+                elif dealer_total > total:
+                    ev -= probability
+            self.stand_memo[key] = ev
+        return self.stand_memo[key]
+
+    def _draw(self, hard_total: int, has_ace: bool,
+              composition: tuple[int, ...], then_play: bool) -> float:
+        '''
+        Returns the EV of taking one card and then either playing on
+        optimally (then_play) or standing.
+        '''
+        num_cards = sum(composition)
+        ev = 0.0
+        for value in range(1, NUM_CARD_VALUES + 1):
+            count = composition[value-1]
+            if count == 0:
+                continue
+            new_hard = hard_total + value
+            if new_hard > 21:
+                ev -= count / num_cards
+                continue
+            new_ace = has_ace or value == 1
+            after = remove_card(composition, value)
+            total = best_total(new_hard, new_ace)
+            if then_play and total < 21:
+                result = max(self.stand(total, after),
+                             self.hit(new_hard, new_ace, after))
+            else:
+                result = self.stand(total, after)
+            ev += result * count / num_cards
+        return ev
+
+    def hit(self, hard_total: int, has_ace: bool,
+            composition: tuple[int, ...]) -> float:
+        '''
+        Returns the EV of hitting and then playing on optimally. A hand that
+        reaches 21 stays automatically, as in play_player_rounds().
+        '''
+        key = (hard_total, has_ace, composition)
+        if key not in self.hit_memo:
+            self.hit_memo[key] = self._draw(hard_total, has_ace, composition,
+                                            True)
+        return self.hit_memo[key]
+
+    def double(self, hard_total: int, has_ace: bool,
+               composition: tuple[int, ...]) -> float:
+        '''
+        Returns the EV of doubling down: one card at twice the bet.
+        '''
+        return 2 * self._draw(hard_total, has_ace, composition, False)
+
+    def split(self, pair_value: int, composition: tuple[int, ...]) -> float:
+        '''
+        Returns the EV of splitting a pair, counting both hands.
+        '''
+        num_cards = sum(composition)
+        ev = 0.0
+        for value in range(1, NUM_CARD_VALUES + 1):
+            count = composition[value-1]
+            if count == 0:
+                continue
+            hard_total = pair_value + value
+            has_ace = pair_value == 1 or value == 1
+            after = remove_card(composition, value)
+            total = best_total(hard_total, has_ace)
+            if pair_value == 1 or total == 21:
+                # Split aces get one card; 21 stays automatically
+                result = self.stand(total, after)
+            else:
+                result = max(self.stand(total, after),
+                             self.hit(hard_total, has_ace, after),
+                             self.double(hard_total, has_ace, after))
+            ev += result * count / num_cards
+        return 2 * ev
+
+
+class Advisor:
+    '''
+    Recommends the EV-maximizing action for a hand given the exact unseen
+    cards. Results are cached (least recently used first out) up to
+    max_cache_bytes.
+    '''
+
+    def __init__(self, max_cache_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_cache_bytes: int = max_cache_bytes
+        self.cache_bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self._cache: OrderedDict[tuple, tuple[Advice, int]] = OrderedDict()
+
+    def advise(self, composition: tuple[int, ...], hand: Hand, upcard: int,
+               offer_double_down: bool = True,
+               offer_split: bool = False) -> Advice:
+        '''
+        Returns the best action and the EV of each offered action for the
+        hand. The upcard is a card value as in CARD_RANK_VALUES (an ace is 1)
+        and the composition should come from unseen_composition().
+        '''
+        hard_total = sum(card.value() for card in hand.cards)
+        has_ace = any(card.rank == 'A' for card in hand.cards)
+        pair_value = hand.cards[0].value() if offer_split else 0
+        key = (composition, hard_total, has_ace, pair_value,
+               offer_double_down, upcard)
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return cached[0]
+        self.misses += 1
+
+        evaluation = _Evaluation(upcard)
+        evs = {'s': evaluation.stand(best_total(hard_total, has_ace),
+                                     composition),
+               'h': evaluation.hit(hard_total, has_ace, composition)}
+        if offer_double_down:
+            evs['d'] = evaluation.double(hard_total, has_ace, composition)
+        if offer_split:
+            evs['p'] = evaluation.split(pair_value, composition)
+        advice = Advice(max(evs, key=evs.get), evs)
+
+        size = _approximate_size(key) + _approximate_size(advice)
+        self._cache[key] = (advice, size)
+        self.cache_bytes += size
+        while self.cache_bytes > self.max_cache_bytes and self._cache:
+            _, (_, evicted_size) = self._cache.popitem(last=False)
+            self.cache_bytes -= evicted_size
+        return advice
+
+    def strategy_for(self, dealer: Dealer):
+        '''
+        Returns a Strategy that asks this advisor about every decision at
+        the given dealer's table.
+        '''
+        def strategy(hand: Hand, upcard: int, offer_double_down: bool,
+                     offer_split: bool) -> str:
+            return self.advise(unseen_composition(dealer), hand, upcard,
+                               offer_double_down, offer_split).action
+        return strategy
+
+    def cache_len(self) -> int:
+        '''
+        Returns the number of cached results.
+        '''
+        return len(self._cache)
@@ -0,0 +1,429 @@
+'''
+Streaming batch analyzer for hand decision logs.
+Author: Chris Leung
+
+Reads hand records (the player's cards, the dealer's upcard and the action
+taken) from CSV or JSON Lines files of any size, optionally gzipped, and
+writes every record back out with the basic-strategy action and the EV cost
+of the action actually taken. A cost of 0.05 means the decision gave up 5%
+of the hand's bet on average compared to basic strategy.
+
+Records flow through a generator pipeline (read, chunk, analyze, write), so
+memory use does not grow with the file. Each chunk is scored at once with
+NumPy: hand totals come from blackjack_batch.evaluate_hands(), which follows
+Hand._evaluate(), and the double down and split options follow
+can_double_down() and can_split() as used by play_player_rounds().
+
+Columns (CSV) or keys (JSON):
+    cards     the player's cards, e.g. "A 7" (or a JSON list of ranks)
+    upcard    the dealer's upcard, e.g. "K"
+    action    h, s, d or p (or hit, stay/stand, double, split)
+    bet, bank, num_hands
+              optional; when given they decide whether doubling down and
+              splitting were offered, as in the game
+Any other columns are passed through unchanged. Malformed records are
+reported in the error column rather than stopping the run.
+
+EVs are for the blackjack_2026 rules with the dealer known not to have
+blackjack, drawing from a full shoe (see blackjack_eor.PostDealTables). They
+are an approximation, so costs are never reported below 0 even where it
+slightly favours a departure from the chart (e.g. soft 13 against a 5).
+
+Usage:
+    python blackjack_analyzer.py audit.csv.gz --output scored.csv
+'''
+
+import argparse
+import contextlib
+import csv
+import gzip
+import json
+import sys
+from dataclasses import dataclass
+from itertools import islice
+from typing import ContextManager, Iterable, Iterator, TextIO
+
+import numpy as np
+
+from blackjack_2026 import CARD_RANK_VALUES
+from blackjack_2026 import CARD_RANKS
+from blackjack_2026 import MAX_SPLITS
+from blackjack_2026 import NUM_SHOE_DECKS
+from blackjack_batch import evaluate_hands
+from blackjack_batch import PAD
+from blackjack_crowd import ACTION_DOUBLE_DOWN
+from blackjack_crowd import ACTION_HIT
+from blackjack_crowd import ACTION_SPLIT
+from blackjack_crowd import ACTION_STAY
+from blackjack_crowd import compile_actions
+from blackjack_eor import PostDealTables
+from blackjack_eor import shoe_composition
+from blackjack_strategy import basic_strategy
+from blackjack_strategy import ChartStrategy
+from blackjack_strategy import NUM_ROWS
+from blackjack_strategy import NUM_UPCARDS
+from blackjack_strategy import PAIR_ROW
+from blackjack_strategy import SOFT_ROW
+
+DEFAULT_CHUNK_SIZE = 65536
+RESULT_FIELDS = ('basic_action', 'ev_cost', 'error')
+ACTION_LETTERS = 'shdp'  # Indexed by the blackjack_crowd ACTION_* codes
+_ACTION_NAMES = {'s': ACTION_STAY, 'stay': ACTION_STAY,
+                 'stand': ACTION_STAY, 'h': ACTION_HIT, 'hit': ACTION_HIT,
+                 'd': ACTION_DOUBLE_DOWN, 'double': ACTION_DOUBLE_DOWN,
+                 'p': ACTION_SPLIT, 'split': ACTION_SPLIT}
+_RANK_CODES = {rank: code for code, rank in enumerate(CARD_RANKS)}
+_RANK_CODES['T'] = CARD_RANKS.index('10')
+# Card values by rank code; padding (-1) looks up the trailing 0
+_CODE_VALUES = np.array([CARD_RANK_VALUES[rank] for rank in CARD_RANKS] + [0],
+                        dtype=np.int16)
+
+
+def action_ev_table(num_shoe_decks: int = NUM_SHOE_DECKS,
+                    strategy: ChartStrategy = basic_strategy) -> np.ndarray:
+    '''
+    Returns an array of EVs indexed by [chart row, upcard value, ACTION_*
+    code]: the EV of taking the action and then playing by the chart. Rows
+    are as in blackjack_strategy; cells for hands that cannot occur are NaN.
+    '''
+    tables = PostDealTables(shoe_composition(num_shoe_decks), strategy.table)
+    evs = np.full((NUM_ROWS, NUM_UPCARDS, len(ACTION_LETTERS)), np.nan)
+    hands = [(total, total, False, 0) for total in range(4, 22)]
+    hands += [(SOFT_ROW + total, total - 10, True, 0)
+              for total in range(12, 22)]
+    hands += [(PAIR_ROW + value, value * 2, value == 1, value)
+              for value in range(1, 11)]
+    for row, hard_total, has_ace, pair_value in hands:
+        for upcard in range(1, NUM_UPCARDS):
+            for code, action in enumerate(ACTION_LETTERS):
+                if action == 'p' and not pair_value:
+                    continue
+                evs[row, upcard, code] = tables.action_ev(
+                    upcard, hard_total, has_ace, action, pair_value)
+    return evs
+
+
+def _open_text(path: str, mode: str) -> ContextManager[TextIO]:
+    '''
+    Opens a text file, gzipped if the name ends in .gz, or stdin/stdout for
+    '-'.
+    '''
+    if path == '-':
+        return contextlib.nullcontext(sys.stdin if mode == 'r'
+                                      else sys.stdout)
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8', newline='')
+    return open(path, mode, encoding='utf-8', newline='')
+
+
+def _is_csv(path: str) -> bool:
+    return path.removesuffix('.gz').lower().endswith('.csv')
+
+
+@dataclass
+class MalformedLine:
+    '''
+    A line of a JSON Lines file that could not be decoded.
+    '''
+    text: str
+    error: str
+
+
+def read_records(stream: TextIO,
+                 is_csv: bool) -> Iterator[dict | MalformedLine]:
+    '''
+    Yields the records of a CSV file (with a header row) or a JSON Lines
+    file one at a time. Lines that are not JSON are yielded as
+    MalformedLines, so that one bad line does not end the stream.
+    '''
+    if is_csv:
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as error:
+            yield MalformedLine(line.rstrip('\r\n'),
+                                f"invalid JSON: {error.msg}")
+
+
+def chunked(records: Iterable, size: int) -> Iterator[list]:
+    '''
+    Yields lists of up to size records.
+    '''
+    records = iter(records)
+    while chunk := list(islice(records, size)):
+        yield chunk
+
+
+def _int_field(record: dict, name: str, default: int) -> int:
+    '''
+    Returns an optional integer field of a record. Raises ValueError if it
+    is not an integer that fits in 64 bits.
+    '''
+    try:
+        value = int(record.get(name) or default)
+    except (TypeError, ValueError, OverflowError) as error:
+        raise ValueError(f"bad {name} {record.get(name)!r}") from error
+    if not -2 ** 63 <= value < 2 ** 63:
+        raise ValueError(f"bad {name} {record.get(name)!r}")
+    return value
+
+
+def _parse(record: object) -> tuple[list[int], int, int, int, int, int]:
+    '''
+    Returns the rank codes, upcard value, action code, bet, bank and number
+    of hands of a record. Raises ValueError if the record or a field is
+    malformed.
+    '''
+    if isinstance(record, MalformedLine):
+        raise ValueError(record.error)
+    if not isinstance(record, dict):
+        raise ValueError("record is not an object")
+    cards = record.get('cards')
+    if isinstance(cards, str):
+        cards = cards.replace(',', ' ').split()
+    if not isinstance(cards, list):
+        raise ValueError(f"bad cards {cards!r}")
+    if not cards:
+        raise ValueError("missing cards")
+    try:
+        codes = [_RANK_CODES[str(rank).upper()] for rank in cards]
+        upcard = CARD_RANK_VALUES[CARD_RANKS[
+            _RANK_CODES[str(record.get('upcard')).upper()]]]
+    except KeyError as error:
+        raise ValueError(f"unknown rank {error}") from error
+    action = _ACTION_NAMES.get(str(record.get('action')).lower())
+    if action is None:
+        raise ValueError(f"unknown action {record.get('action')!r}")
+    # Missing bet and bank fields mean the player could cover any bet
+    bet = _int_field(record, 'bet', 0)
+    bank = _int_field(record, 'bank', 0)
+    num_hands = _int_field(record, 'num_hands', 1)
+    return codes, upcard, action, bet, bank, num_hands
+
+
+class Analyzer:
+    '''
+    Scores chunks of records against a strategy chart.
+    '''
+
+    def __init__(self, strategy: ChartStrategy = basic_strategy,
+                 num_shoe_decks: int = NUM_SHOE_DECKS,
+                 max_splits: int = MAX_SPLITS):
+        self.actions: np.ndarray = compile_actions(strategy)
+        self.evs: np.ndarray = action_ev_table(num_shoe_decks, strategy)
+        self.max_splits: int = max_splits
+
+    def analyze(self, chunk: list[dict | MalformedLine]) -> Iterator[dict]:
+        '''
+        Yields each record of the chunk with the RESULT_FIELDS added.
+        Records that are not objects are yielded as {'record': ...}.
+        '''
+        size = len(chunk)
+        errors: list[str] = [''] * size
+        parsed = []
+        for index, record in enumerate(chunk):
+            try:
+                parsed.append(_parse(record))
+            except ValueError as error:
+                errors[index] = str(error)
+                parsed.append(([], 1, ACTION_STAY, 0, 0, 1))
+        num_columns = max(2, *(len(codes) for codes, *_ in parsed))
+        hands = np.full((size, num_columns), PAD, dtype=np.int8)
+        for index, (codes, *_) in enumerate(parsed):
+            hands[index, :len(codes)] = codes
+        upcard, taken, bet, bank, num_hands = (
+            np.array(column, dtype=np.int64) for column in
+            list(zip(*(fields[1:] for fields in parsed))))
+
+        evaluation = evaluate_hands(hands)
+        total = evaluation.value
+        num_cards = (hands != PAD).sum(axis=1)
+        values = _CODE_VALUES[hands]
+        # can_double_down(): first decision only (two cards, including after
+        # a split), and the bank covers the bet. can_split(): two cards of
+        # equal value, the bank covers the bet and the split limit allows it.
+        two_cards = num_cards == 2
+        covers_bet = bank >= bet
+        offer_double_down = two_cards & covers_bet
+        offer_split = (two_cards & (values[:, 0] == values[:, 1]) &
+                       covers_bet & (num_hands < self.max_splits))
+        row = np.where(offer_split, PAIR_ROW + values[:, 0],
+                       np.where(evaluation.soft, SOFT_ROW + total, total))
+        # Only hands with a decision have a chart row; the rest (including
+        # errors and busted hands of any total) look up row 0 and are
+        # reported as errors below
+        decided = (num_cards >= 2) & (total < 21)
+        row = np.where(decided, row, 0)
+        basic = self.actions[(row * NUM_UPCARDS + upcard) * 2 +
+                             offer_double_down]
+        offered = np.stack([np.ones(size, dtype=bool),
+                            np.ones(size, dtype=bool),
+                            offer_double_down, offer_split], axis=1)
+        # The EVs are approximate (see action_ev_table()) and in a few
+        # close cells favour a departure from the chart slightly; such
+        # departures cost nothing rather than a negative amount
+        cost = np.maximum(self.evs[row, upcard, basic] -
+                          self.evs[row, upcard, taken], 0.0)
+
+        allowed = offered[np.arange(size), taken]
+        for index, record in enumerate(chunk):
+            error = errors[index]
+            if not error and not decided[index]:
+                error = "no decision with one card or 21 or more"
+            elif not error and not allowed[index]:
+                error = f"{ACTION_LETTERS[taken[index]]} was not offered"
+            if isinstance(record, MalformedLine):
+                result = {'record': record.text}
+            elif isinstance(record, dict):
+                result = dict(record)
+            else:
+                result = {'record': record}
+            result['basic_action'] = ('' if error
+                                      else ACTION_LETTERS[basic[index]])
+            result['ev_cost'] = ('' if error
+                                 else round(float(cost[index]), 6))
+            result['error'] = error
+            yield result
+
+
+@dataclass
+class AnalysisSummary:
+    '''
+    Totals over all the records analyzed.
+    '''
+    records: int = 0
+    errors: int = 0
+    mistakes: int = 0
+    total_cost: float = 0.0
+
+    def add(self, result: dict) -> None:
+        '''
+        Counts one analyzed record.
+        '''
+        self.records += 1
+        if result['error']:
+            self.errors += 1
+        elif result['ev_cost'] != 0:
+            self.mistakes += 1
+            self.total_cost += result['ev_cost']
+
+
+def analyze_records(records: Iterable[dict | MalformedLine],
+                    analyzer: Analyzer,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    summary: AnalysisSummary | None = None
+                    ) -> Iterator[dict]:
+    '''
+    Yields the analyzed records, scoring them chunk_size at a time. Adds
+    each one to the summary if given.
+    '''
+    for chunk in chunked(records, chunk_size):
+        for result in analyzer.analyze(chunk):
+            if summary is not None:
+                summary.add(result)
+            yield result
+
+
+def _is_malformed(result: dict) -> bool:
+    '''
+    Returns whether a result is for a record that was not an object.
+    '''
+    return set(result) == {'record', *RESULT_FIELDS}
+
+
+def _csv_writer(stream: TextIO, fieldnames: list[str]) -> csv.DictWriter:
+    writer = csv.DictWriter(stream, fieldnames=fieldnames, restval='')
+    writer.writeheader()
+    return writer
+
+
+def _write_row(writer: csv.DictWriter, result: dict) -> None:
+    if _is_malformed(result):
+        result = {'error': f"{result['error']}: {result['record']!r}"}
+    extra = [name for name in result if name not in writer.fieldnames]
+    if extra:
+        raise ValueError(f"record has fields missing from the CSV header: "
+                         f"{', '.join(map(str, extra))}; write JSON Lines "
+                         f"to keep them")
+    writer.writerow(result)
+
+
+def write_results(results: Iterable[dict], stream: TextIO,
+                  is_csv: bool) -> None:
+    '''
+    Writes analyzed records as CSV or JSON Lines. The CSV header holds the
+    fields of the first record that was an object. Records that were not
+    objects are written with their text in the error column. Raises
+    ValueError if a later record has fields the header lacks, rather than
+    dropping them; JSON Lines output keeps every field.
+    '''
+    if not is_csv:
+        for result in results:
+            stream.write(json.dumps(result) + '\n')
+        return
+    writer = None
+    waiting = []
+    for result in results:
+        if writer is None and _is_malformed(result):
+            waiting.append(result)
+            continue
+        if writer is None:
+            writer = _csv_writer(stream, list(result))
+            for malformed in waiting:
+                _write_row(writer, malformed)
+        _write_row(writer, result)
+    if writer is None and waiting:
+        writer = _csv_writer(stream, list(RESULT_FIELDS))
+        for malformed in waiting:
+            _write_row(writer, malformed)
+
+
+def main(argv: list[str] | None = None) -> int:
+    '''
+    Entry point for the analyzer. Returns the process exit code.
+    '''
+    parser = argparse.ArgumentParser(
+        description='Score logged decisions against basic strategy.')
+    parser.add_argument('input', help='.csv or .jsonl file, optionally .gz, '
+                                      'or - for JSON Lines on stdin')
+    parser.add_argument('--output', default='-',
+                        help='.csv or .jsonl file, optionally .gz (default: '
+                             'JSON Lines on stdout)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--strategy', metavar='CHART', default=None,
+                        help='.json/.csv chart to score against (default: '
+                             'basic strategy)')
+    parser.add_argument('--decks', type=int, default=NUM_SHOE_DECKS)
+    args = parser.parse_args(argv)
+    strategy = basic_strategy
+    if args.strategy is not None:
+        try:
+            strategy = ChartStrategy.from_file(args.strategy)
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+
+    analyzer = Analyzer(strategy, args.decks)
+    summary = AnalysisSummary()
+    with _open_text(args.input, 'r') as source, \
+            _open_text(args.output, 'w') as destination:
+        results = analyze_records(
+            read_records(source, _is_csv(args.input)), analyzer,
+            args.chunk_size, summary)
+        try:
+            write_results(results, destination, _is_csv(args.output))
+        except ValueError as error:
+            parser.error(str(error))
+    if args.output != '-':
+        print(f"Analyzed {summary.records} records: {summary.mistakes} "
+              f"departures from basic strategy costing "
+              f"{summary.total_cost:.2f} bets in total (approximate EVs), "
+              f"{summary.errors} records with errors")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,92 @@
+'''
+Vectorized hand evaluation over NumPy card arrays.
+Author: Chris Leung
+
+evaluate_hands() scores many hands at once with the same rules as
+blackjack_2026.Hand._evaluate(). Hands are given as a 2-D integer array with
+one row per hand and one column per card. Each card is its index into
+CARD_RANKS ('2' is 0, 'A' is 12), and rows shorter than the array are padded
+with PAD (or another padding value).
+'''
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from blackjack_2026 import CARD_RANK_VALUES
+from blackjack_2026 import CARD_RANKS
+from blackjack_2026 import Hand
+
+PAD = -1
+ACE_CODE = CARD_RANKS.index('A')
+# The trailing 0 is what padding looks up: PAD (-1) indexes it directly
+_CODE_VALUES = np.array([CARD_RANK_VALUES[rank] for rank in CARD_RANKS] + [0],
+                        dtype=np.int16)
+
+
+@dataclass
+class HandEvaluation:
+    '''
+    Per-hand results of evaluate_hands(), as arrays in the same order as the
+    input rows.
+    '''
+    value: np.ndarray
+    soft: np.ndarray
+    bust: np.ndarray
+    blackjack: np.ndarray
+
+
+def encode_hands(hands: list[Hand], num_columns: int | None = None,
+                 pad: int = PAD) -> np.ndarray:
+    '''
+    Converts Hand objects to a padded int8 array of rank codes.
+    '''
+    if num_columns is None:
+        num_columns = max((len(hand.cards) for hand in hands), default=0)
+    codes = np.full((len(hands), num_columns), pad, dtype=np.int8)
+    for row, hand in enumerate(hands):
+        codes[row, :len(hand.cards)] = [CARD_RANKS.index(card.rank)
+                                        for card in hand.cards]
+    return codes
+
+
+def _check_codes(hands: np.ndarray, pad: int) -> None:
+    '''
+    Raises ValueError if any entry is neither a rank code nor pad, which
+    would otherwise look up the wrong card value.
+    '''
+    if hands.size == 0:
+        return
+    num_ranks = len(CARD_RANKS)
+    low, high = int(hands.min()), int(hands.max())
+    if low >= min(pad, 0) and high <= max(pad, num_ranks - 1):
+        # Padding next to the rank codes leaves no gap for bad values
+        if pad in (-1, num_ranks):
+            return
+        if (((hands >= 0) & (hands < num_ranks)) | (hands == pad)).all():
+            return
+    raise ValueError(f"card codes must be 0 to {num_ranks - 1} or the "
+                     f"padding value {pad}")
+
+
+def evaluate_hands(hands: np.ndarray, pad: int = PAD) -> HandEvaluation:
+    '''
+    Returns the value, soft flag, bust flag and blackjack flag of every hand
+    (row) in the array. An ace counts as 11 when that does not bust the hand,
+    in which case the hand is soft; at most one ace can ever do so. Raises
+    ValueError for an entry that is neither a rank code nor pad.
+    '''
+    hands = np.asarray(hands)
+    if hands.ndim != 2:
+        raise ValueError("hands must be a 2-D array")
+    _check_codes(hands, pad)
+    codes = (hands if pad == PAD
+             else np.where(hands == pad, len(CARD_RANKS), hands))
+    hard_total = _CODE_VALUES[codes].sum(axis=1, dtype=np.int16)
+    soft = (hands == ACE_CODE).any(axis=1) & (hard_total <= 11)
+    value = hard_total + 10 * soft
+    num_cards = (hands != pad).sum(axis=1)
+    return HandEvaluation(value=value,
+                          soft=soft,
+                          bust=value > 21,
+                          blackjack=(num_cards == 2) & (value == 21))
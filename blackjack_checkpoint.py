@@ -0,0 +1,220 @@
+'''
+Checkpoint and resume for blackjack games and simulations.
+Author: Chris Leung
+
+A checkpoint is a compact binary snapshot of everything needed to carry on a
+game exactly where it stopped: the shoe in dealing order, the discard pile,
+the cut card state, the dealer's hand, every player's bank and hands, and the
+state of the dealer's random number generator. Each card is stored in one
+byte. Strategies are code, not state, so they are supplied again on load.
+
+Only a plain Dealer can be saved. Dealer subclasses (pooled, prepared or
+shuffle-model shoes) hold state outside the shoe that a checkpoint cannot
+restore, so dump_game() rejects them rather than resuming with a different
+dealer.
+'''
+
+import os
+import random
+import struct
+
+from blackjack_2026 import Card
+from blackjack_2026 import CARD_RANKS
+from blackjack_2026 import CARD_SUITS
+from blackjack_2026 import Dealer
+from blackjack_2026 import Hand
+from blackjack_2026 import Player
+from blackjack_sim import Rules
+from blackjack_sim import SimulationStats
+from blackjack_sim import Strategy
+from blackjack_sim import Table
+from blackjack_sim import temp_path_for
+
+MAGIC = b'BJCK'
+VERSION = 3
+FACE_UP_BIT = 0x80
+
+_HEADER = struct.Struct('<4sB')
+_COUNT = struct.Struct('<I')
+_DEALER = struct.Struct('<I?qq')
+# Version 2 did not save the dealer's cards_dealt and reshuffles counters
+_DEALER_V2 = struct.Struct('<I?')
+_PLAYER = struct.Struct('<Iq')
+_HAND = struct.Struct('<q')
+_RNG = struct.Struct('<B625I?d')
+_RULES = struct.Struct('<5q')
+_STATS = struct.Struct('<10qd')
+
+
+class CheckpointError(ValueError):
+    '''
+    Raised when a checkpoint cannot be read.
+    '''
+
+
+def _encode_cards(cards: list[Card]) -> bytes:
+    return _COUNT.pack(len(cards)) + bytes(
+        (CARD_RANKS.index(card.rank) * 4 + CARD_SUITS.index(card.suit)) |
+        (FACE_UP_BIT if card.face_up else 0)
+        for card in cards)
+
+
+class _Reader:
+    '''
+    Reads the fields of a checkpoint in order.
+    '''
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, layout: struct.Struct) -> tuple:
+        try:
+            values = layout.unpack_from(self.data, self.offset)
+        except struct.error as error:
+            raise CheckpointError("Checkpoint is truncated") from error
+        self.offset += layout.size
+        return values
+
+    def raw(self) -> bytes:
+        (length,) = self.unpack(_COUNT)
+        if self.offset + length > len(self.data):
+            raise CheckpointError("Checkpoint is truncated")
+        raw = self.data[self.offset:self.offset+length]
+        self.offset += length
+        return raw
+
+    def cards(self) -> list[Card]:
+        cards = []
+        for code in self.raw():
+            rank, suit = divmod(code & ~FACE_UP_BIT, 4)
+            cards.append(Card(CARD_RANKS[rank], CARD_SUITS[suit],
+                              bool(code & FACE_UP_BIT)))
+        return cards
+
+
+def dump_game(dealer: Dealer, players: list[Player]) -> bytes:
+    '''
+    Returns a binary snapshot of the dealer (including its RNG state and
+    counters) and the players. Raises ValueError for a Dealer subclass.
+    '''
+    if type(dealer) is not Dealer:
+        raise ValueError(f"Cannot checkpoint a {type(dealer).__name__}; "
+                         f"only a plain Dealer can be restored")
+    rng_version, internal_state, gauss_next = dealer.rng.getstate()
+    parts = [
+        _HEADER.pack(MAGIC, VERSION),
+        _DEALER.pack(dealer.shoe_cut_card_position, dealer.drew_cut_card,
+                     dealer.cards_dealt, dealer.reshuffles),
+        _encode_cards(dealer.shoe),
+        _encode_cards(dealer.discard),
+        _encode_cards(dealer.hand.cards),
+        _RNG.pack(rng_version, *internal_state, gauss_next is not None,
+                  gauss_next or 0.0),
+        _COUNT.pack(len(players)),
+    ]
+    for player in players:
+        parts.append(_PLAYER.pack(player.number, player.bank))
+        parts.append(_COUNT.pack(len(player.name.encode())) +
+                     player.name.encode())
+        parts.append(_COUNT.pack(len(player.hands)))
+        for hand in player.hands:
+            parts.append(_HAND.pack(hand.bet))
+            parts.append(_encode_cards(hand.cards))
+    return b''.join(parts)
+
+
+def _read_game(reader: _Reader) -> tuple[Dealer, list[Player]]:
+    magic, version = reader.unpack(_HEADER)
+    if magic != MAGIC:
+        raise CheckpointError("Not a blackjack checkpoint")
+    if version == VERSION:
+        (cut_card_position, drew_cut_card, cards_dealt,
+         reshuffles) = reader.unpack(_DEALER)
+    elif version == 2:
+        cut_card_position, drew_cut_card = reader.unpack(_DEALER_V2)
+        cards_dealt = reshuffles = 0
+    else:
+        raise CheckpointError(f"Unsupported checkpoint version {version}")
+
+    rng = random.Random()
+    dealer = Dealer(0, cut_card_position, rng)
+    dealer.drew_cut_card = drew_cut_card
+    dealer.cards_dealt = cards_dealt
+    dealer.reshuffles = reshuffles
+    dealer.shoe = reader.cards()
+    dealer.discard = reader.cards()
+    dealer.hand.cards = reader.cards()
+    rng_version, *internal_state, has_gauss, gauss_next = reader.unpack(_RNG)
+    rng.setstate((rng_version, tuple(internal_state),
+                  gauss_next if has_gauss else None))
+
+    players = []
+    (num_players,) = reader.unpack(_COUNT)
+    for _ in range(num_players):
+        number, bank = reader.unpack(_PLAYER)
+        player = Player(number, reader.raw().decode(), bank)
+        (num_hands,) = reader.unpack(_COUNT)
+        for _ in range(num_hands):
+            hand = Hand()
+            (hand.bet,) = reader.unpack(_HAND)
+            hand.cards = reader.cards()
+            player.hands.append(hand)
+        players.append(player)
+    return dealer, players
+
+
+def load_game(data: bytes) -> tuple[Dealer, list[Player]]:
+    '''
+    Restores a dealer and players from a snapshot made by dump_game().
+    '''
+    return _read_game(_Reader(data))
+
+
+def dump_table(table: Table) -> bytes:
+    '''
+    Returns a binary snapshot of a simulation table, including its rules and
+    running stats.
+    '''
+    rules = table.rules
+    stats = table.stats
+    return (dump_game(table.dealer, table.players) +
+            _RULES.pack(rules.num_shoe_decks, rules.shoe_cut_card_position,
+                        rules.minimum_bet, rules.starting_bank,
+                        rules.max_splits) +
+            _STATS.pack(stats.rounds, stats.hands, stats.wagered, stats.net,
+                        stats.wins, stats.pushes, stats.losses,
+                        stats.blackjacks, stats.cards_dealt,
+                        stats.reshuffles, stats.elapsed))
+
+
+def load_table(data: bytes, strategy: Strategy) -> Table:
+    '''
+    Restores a simulation table from a snapshot made by dump_table().
+    '''
+    reader = _Reader(data)
+    dealer, players = _read_game(reader)
+    rules = Rules(*reader.unpack(_RULES))
+    return Table.from_state(strategy, rules, dealer, players,
+                            SimulationStats(*reader.unpack(_STATS)))
+
+
+def save_checkpoint(table: Table, path: str) -> None:
+    '''
+    Writes a table snapshot to path. The file is replaced atomically so a
+    crash mid-write leaves the previous checkpoint intact.
+    '''
+    temp_path = temp_path_for(path)
+    with open(temp_path, 'wb') as checkpoint_file:
+        checkpoint_file.write(dump_table(table))
+        checkpoint_file.flush()
+        os.fsync(checkpoint_file.fileno())
+    os.replace(temp_path, path)
+
+
+def load_checkpoint(path: str, strategy: Strategy) -> Table:
+    '''
+    Reads a table snapshot written by save_checkpoint().
+    '''
+    with open(path, 'rb') as checkpoint_file:
+        return load_table(checkpoint_file.read(), strategy)
@@ -0,0 +1,209 @@
+'''
+Paired strategy comparison using common random numbers.
+Author: Chris Leung
+
+Every strategy plays each round from exactly the same shoe. Player cards are
+dealt from the top of the shoe as usual, but the dealer draws its hit cards
+from the bottom, so the dealer ends up with the same hand whatever the
+players decided. Since the shoe is randomly shuffled this does not change
+the odds of the game. After each round all tables are brought back in step
+with the first (reference) strategy's shoe. Each table's dealer has its own
+generator, set to the shared shoe's state at the start of every round, so a
+shoe that runs out mid-round on one table never moves the shuffles of the
+others.
+
+Because both results in a pair come from the same cards, most of the luck
+cancels out of their difference and far fewer rounds are needed to resolve
+a small EV gap than with independent runs. Bankrolls are unlimited so that
+every table keeps the same seats.
+'''
+
+import random
+from dataclasses import dataclass, field
+
+from blackjack_2026 import Card
+from blackjack_2026 import Dealer
+from blackjack_sim import Rules
+from blackjack_sim import SimulationStats
+from blackjack_sim import Strategy
+from blackjack_sim import Table
+
+UNLIMITED_BANK = 10**15
+
+
+class _PairedDealer(Dealer):
+    '''
+    A Dealer whose shoe is managed by compare_strategies(): it never
+    reshuffles at the end of a round, and can deal from the bottom.
+    '''
+
+    def deal_from_bottom(self) -> Card:
+        '''
+        Deals one face-up card from the bottom of the shoe.
+        '''
+        if len(self.shoe) <= self.shoe_cut_card_position:
+            self.drew_cut_card = True
+        if len(self.shoe) == 0:
+            return self.deal_one(True)
+        dealt_card = self.shoe.pop(0)
+        dealt_card.face_up = True
+        return dealt_card
+
+    def reshuffle_shoe_if_needed(self) -> None:
+        '''
+        Does nothing; the shared shoe is reshuffled by compare_strategies().
+        '''
+
+
+class _PairedTable(Table):
+    '''
+    A Table whose dealer draws from the bottom of the shoe.
+    '''
+
+    def _play_dealer(self) -> None:
+        hand = self.dealer.hand
+        while (hand.value() < 17 or
+               (hand.value() == 17 and hand.is_soft())):
+            hand.cards.append(self.dealer.deal_from_bottom())
+
+
+@dataclass
+class PairedDifference:
+    '''
+    Per-round difference in net result between a strategy and the reference,
+    in dollars. 'independent_variance' is the variance the difference would
+    have if the two strategies had been run on independent shoes.
+    '''
+    name: str
+    rounds: int = 0
+    mean: float = 0.0
+    variance: float = 0.0
+    independent_variance: float = 0.0
+
+    def standard_error(self) -> float:
+        '''
+        Returns the standard error of the mean difference.
+        '''
+        if self.rounds == 0:
+            return 0.0
+        return (self.variance / self.rounds) ** 0.5
+
+    def variance_reduction(self) -> float:
+        '''
+        Returns how many times fewer rounds the paired comparison needs than
+        independent runs for the same precision.
+        '''
+        if self.variance == 0:
+            return float('inf')
+        return self.independent_variance / self.variance
+
+
+@dataclass
+class ComparisonResult:
+    '''
+    The outcome of compare_strategies(): the stats of every strategy, and the
+    paired difference of each one against the reference (the first).
+    '''
+    reference: str
+    stats: dict[str, SimulationStats] = field(default_factory=dict)
+    differences: dict[str, PairedDifference] = field(default_factory=dict)
+
+
+def _variance(total: int, total_squares: int, count: int) -> float:
+    if count < 2:
+        return 0.0
+    return (total_squares - total * total / count) / (count - 1)
+
+
+def compare_strategies(rounds: int,
+                       strategies: dict[str, Strategy],
+                       num_players: int = 1,
+                       rules: Rules | None = None,
+                       seed: object = None) -> ComparisonResult:
+    '''
+    Plays every strategy against the same shoes for the given number of
+    rounds. The first strategy is the reference that the others are compared
+    against.
+    '''
+    rules = rules if rules is not None else Rules()
+    rules = Rules(rules.num_shoe_decks, rules.shoe_cut_card_position,
+                  rules.minimum_bet, UNLIMITED_BANK, rules.max_splits)
+    names = list(strategies)
+    shoe = Dealer(rules.num_shoe_decks, rules.shoe_cut_card_position,
+                  random.Random(seed))
+    tables = [
+        _PairedTable(num_players, strategies[name], rules,
+                     dealer=_PairedDealer(0, rules.shoe_cut_card_position,
+                                          random.Random()))
+        for name in names]
+
+    # Sums and sums of squares of per-round nets and of their differences
+    # from the reference, kept as exact integers
+    net_sums = [0] * len(names)
+    net_squares = [0] * len(names)
+    difference_sums = [0] * len(names)
+    difference_squares = [0] * len(names)
+
+    for _ in range(rounds):
+        nets = []
+        rng_state = shoe.rng.getstate()
+        for table in tables:
+            table.dealer.rng.setstate(rng_state)
+            table.dealer.shoe = shoe.shoe[:]
+            table.dealer.discard = shoe.discard[:]
+            table.dealer.drew_cut_card = shoe.drew_cut_card
+            net_before = table.stats.net
+            table.play_round()
+            nets.append(table.stats.net - net_before)
+        for index, net in enumerate(nets):
+            net_sums[index] += net
+            net_squares[index] += net * net
+            difference = net - nets[0]
+            difference_sums[index] += difference
+            difference_squares[index] += difference * difference
+
+        reference_dealer = tables[0].dealer
+        shoe.shoe = reference_dealer.shoe
+        shoe.discard = reference_dealer.discard
+        shoe.drew_cut_card = reference_dealer.drew_cut_card
+        shoe.reshuffle_shoe_if_needed()
+
+    result = ComparisonResult(names[0])
+    reference_variance = _variance(net_sums[0], net_squares[0], rounds)
+    for index, (name, table) in enumerate(zip(names, tables)):
+        # The tables only count shoes that ran out mid-round; the shared
+        # shoe counts the reshuffles between rounds
+        table.stats.reshuffles += shoe.reshuffles
+        result.stats[name] = table.stats
+        if index == 0:
+            continue
+        result.differences[name] = PairedDifference(
+            name, rounds,
+            difference_sums[index] / rounds if rounds else 0.0,
+            _variance(difference_sums[index], difference_squares[index],
+                      rounds),
+            reference_variance + _variance(net_sums[index],
+                                           net_squares[index], rounds))
+    return result
+
+
+def print_comparison(result: ComparisonResult) -> None:
+    '''
+    Prints the house edge of each strategy and its paired difference from
+    the reference, per initial bet.
+    '''
+    for name, stats in result.stats.items():
+        print(f"{name}: {stats.rounds} rounds, "
+              f"house edge {stats.house_edge():.3%}")
+    for name, difference in result.differences.items():
+        stats = result.stats[name]
+        if stats.wagered == 0:
+            print(f"{name} - {result.reference}: no rounds played")
+            continue
+        bet_per_round = stats.wagered / stats.rounds
+        print(f"{name} - {result.reference}: "
+              f"{difference.mean / bet_per_round:+.4%} per initial bet "
+              f"(std error "
+              f"{difference.standard_error() / bet_per_round:.4%}, "
+              f"{difference.variance_reduction():.1f}x fewer rounds than "
+              "independent runs)")
@@ -0,0 +1,312 @@
+'''
+Struct-of-arrays tables with thousands of seats sharing one shoe.
+Author: Chris Leung
+
+A CrowdTable plays the same round as blackjack_sim.Table, but instead of
+Player and Hand objects it keeps every seat's bank and every hand's bet,
+hard total, ace flag and card count in parallel NumPy arrays. Betting,
+dealing, blackjack payouts, bet resolution and bankrupt removal are each a
+handful of array operations over all seats, and removing bankrupt seats is
+a single O(n) compaction.
+
+Player hands are played in passes. In each pass every seat still playing
+makes one decision for its current hand, looked up in a compiled strategy
+chart (see blackjack_strategy), and every hand that takes a card gets the
+next card from the shoe in seat order. Each seat still plays its own hands
+one after another, exactly as in play_player_rounds(), so its bank limits
+doubling down and splitting in the same way. Only the order in which the
+shoe's cards are spread across seats differs from playing the seats one by
+one, which does not change the odds since the shoe is randomly shuffled.
+With a single seat a CrowdTable plays exactly the same game as a Table
+given the same shoe.
+
+The shoe holds card values (an ace is 1) and follows the Dealer rules: the
+cut card triggers a reshuffle of every card after the round, and an empty
+shoe mid-round is refilled by shuffling the discard pile. Large crowds need
+enough decks that the discard pile never runs out as well.
+'''
+
+import random
+import time
+
+import numpy as np
+
+from blackjack_2026 import CARD_RANK_VALUES
+from blackjack_2026 import CARD_RANKS
+from blackjack_2026 import CARD_SUITS
+from blackjack_sim import Rules
+from blackjack_sim import SimulationStats
+from blackjack_strategy import ChartStrategy
+from blackjack_strategy import NUM_UPCARDS
+from blackjack_strategy import PAIR_ROW
+from blackjack_strategy import SOFT_ROW
+
+ACTION_STAY = 0
+ACTION_HIT = 1
+ACTION_DOUBLE_DOWN = 2
+ACTION_SPLIT = 3
+_ACTION_CODES = {'s': ACTION_STAY, 'h': ACTION_HIT, 'd': ACTION_DOUBLE_DOWN,
+                 'p': ACTION_SPLIT}
+_DECK_VALUES = [CARD_RANK_VALUES[rank]
+                for rank in CARD_RANKS for _ in CARD_SUITS]
+
+
+def compile_actions(strategy: ChartStrategy) -> np.ndarray:
+    '''
+    Returns a chart strategy's lookup table as an array of ACTION_* codes.
+    '''
+    return np.array([_ACTION_CODES[action] for action in strategy.table],
+                    dtype=np.int8)
+
+
+def _best_totals(hard: np.ndarray,
+                 ace: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    soft = ace & (hard <= 11)
+    return hard + 10 * soft, soft
+
+
+class CrowdTable:
+    '''
+    A headless table of num_seats bots who all follow the same chart
+    strategy and bet the minimum every round. 'banks' holds every seat's
+    bank, including seats that have been removed, and 'active' the indices
+    of the seats still playing.
+    '''
+
+    def __init__(self, num_seats: int, strategy: ChartStrategy,
+                 rules: Rules | None = None, seed: object = None,
+                 shoe: np.ndarray | None = None):
+        if not isinstance(strategy, ChartStrategy):
+            raise ValueError("Crowd tables need a chart strategy")
+        self.rules: Rules = rules if rules is not None else Rules()
+        self.actions: np.ndarray = compile_actions(strategy)
+        self.rng = np.random.default_rng(random.Random(seed).getrandbits(128))
+        self.banks: np.ndarray = np.full(num_seats, self.rules.starting_bank,
+                                         dtype=np.int64)
+        self.active: np.ndarray = np.arange(num_seats)
+        self.stats: SimulationStats = SimulationStats()
+
+        # Cards order[:round_start] are the discard pile, cards
+        # order[round_start:position] are in play and the rest is the shoe
+        if shoe is None:
+            shoe = self.rng.permutation(np.array(
+                _DECK_VALUES * self.rules.num_shoe_decks, dtype=np.int8))
+        self.order: np.ndarray = np.asarray(shoe, dtype=np.int8)
+        self.position: int = 0
+        self.round_start: int = 0
+        self.drew_cut_card: bool = False
+
+    def _refill_from_discard(self) -> None:
+        '''
+        Shuffles the discard pile into the empty shoe, as Dealer.deal_one().
+        '''
+        discard = self.order[:self.round_start]
+        if len(discard) == 0:
+            raise ValueError("The shoe and discard pile ran out of cards; "
+                             "use more decks for this many seats")
+        self.order = np.concatenate(
+            (self.order[self.round_start:self.position],
+             self.rng.permutation(discard)))
+        self.position -= self.round_start
+        self.round_start = 0
+        self.drew_cut_card = True
+        self.stats.reshuffles += 1
+
+    def draw(self, count: int) -> np.ndarray:
+        '''
+        Deals count cards from the shoe and returns their values.
+        '''
+        available = len(self.order) - self.position
+        if count > available:
+            first = self.draw(available)
+            self._refill_from_discard()
+            return np.concatenate((first, self.draw(count - available)))
+        start = self.position
+        self.position += count
+        if count and (len(self.order) - self.position + 1 <=
+                      self.rules.shoe_cut_card_position):
+            self.drew_cut_card = True
+        self.stats.cards_dealt += count
+        return self.order[start:self.position].astype(np.int16)
+
+    def run(self, rounds: int) -> SimulationStats:
+        '''
+        Plays up to the given number of rounds, stopping early if every
+        seat has been removed. Returns the running stats.
+        '''
+        for _ in range(rounds):
+            if len(self.active) == 0:
+                break
+            self.play_round()
+        return self.stats
+
+    def play_round(self) -> None:
+        '''
+        Plays one full round for every active seat.
+        '''
+        rules = self.rules
+        stats = self.stats
+        seats = self.active
+        num_seats = len(seats)
+        max_hands = max(1, rules.max_splits)
+        banks = self.banks[seats]
+        bank_before = int(banks.sum())
+
+        # Hands are indexed [seat, hand]
+        bets = np.zeros((num_seats, max_hands), dtype=np.int64)
+        hard = np.zeros((num_seats, max_hands), dtype=np.int16)
+        ace = np.zeros((num_seats, max_hands), dtype=bool)
+        num_cards = np.zeros((num_seats, max_hands), dtype=np.int8)
+        first_card = np.zeros((num_seats, max_hands), dtype=np.int16)
+        second_card = np.zeros((num_seats, max_hands), dtype=np.int16)
+        num_hands = np.ones(num_seats, dtype=np.int64)
+
+        bets[:, 0] = rules.minimum_bet
+        banks -= rules.minimum_bet
+        stats.wagered += rules.minimum_bet * num_seats
+
+        hole_card = int(self.draw(1)[0])
+        first_card[:, 0] = self.draw(num_seats)
+        upcard = int(self.draw(1)[0])
+        second_card[:, 0] = self.draw(num_seats)
+        hard[:, 0] = first_card[:, 0] + second_card[:, 0]
+        ace[:, 0] = (first_card[:, 0] == 1) | (second_card[:, 0] == 1)
+        num_cards[:, 0] = 2
+        dealer_hard = hole_card + upcard
+        dealer_ace = 1 in (hole_card, upcard)
+        dealer_blackjack = dealer_ace and dealer_hard == 11
+
+        if not dealer_blackjack:
+            blackjack = ace[:, 0] & (hard[:, 0] == 11)
+            banks += np.where(blackjack, bets[:, 0] * 3 // 2 + bets[:, 0], 0)
+            bets[:, 0] *= ~blackjack
+            stats.blackjacks += int(blackjack.sum())
+            self._play_hands(banks, bets, hard, ace, num_cards, first_card,
+                             second_card, num_hands, upcard, blackjack)
+            while True:
+                total = dealer_hard + (10 if dealer_ace and
+                                       dealer_hard <= 11 else 0)
+                if total > 17 or (total == 17 and total == dealer_hard):
+                    break
+                card = int(self.draw(1)[0])
+                dealer_hard += card
+                dealer_ace = dealer_ace or card == 1
+
+        # Resolve bets over every hand that was played
+        dealer_total = dealer_hard + (10 if dealer_ace and
+                                      dealer_hard <= 11 else 0)
+        dealer_value = 0 if dealer_total > 21 else dealer_total
+        value, _ = _best_totals(hard, ace)
+        in_play = np.arange(max_hands) < num_hands[:, None]
+        settled = in_play & (value <= 21) & (bets > 0)
+        wins = settled & (value > dealer_value)
+        pushes = settled & (value == dealer_value)
+        banks += (bets * (2 * wins + pushes)).sum(axis=1)
+        stats.wins += int(wins.sum())
+        stats.pushes += int(pushes.sum())
+        stats.losses += int((settled & ~wins & ~pushes).sum())
+        stats.hands += int(num_hands.sum())
+        stats.net += int(banks.sum()) - bank_before
+        stats.rounds += 1
+
+        self.banks[seats] = banks
+        self.active = seats[banks >= rules.minimum_bet]
+        self.round_start = self.position
+        if self.drew_cut_card:
+            self.order = self.rng.permutation(self.order)
+            self.position = 0
+            self.round_start = 0
+            self.drew_cut_card = False
+            stats.reshuffles += 1
+
+    # pylint: disable-next=too-many-arguments,too-many-locals
+    def _play_hands(self, banks, bets, hard, ace, num_cards, first_card,
+                    second_card, num_hands, upcard, blackjack) -> None:
+        '''
+        Plays every seat's hands in passes, one decision per seat per pass,
+        following play_player_rounds().
+        '''
+        stats = self.stats
+        max_splits = self.rules.max_splits
+        current = np.where(blackjack, num_hands, 0)
+        first_turn = np.ones(len(banks), dtype=bool)
+        playing = np.flatnonzero(current < num_hands)
+        while len(playing):
+            hand = current[playing]
+            bet = bets[playing, hand]
+            cards = num_cards[playing, hand]
+            first = first_card[playing, hand]
+            total, soft = _best_totals(hard[playing, hand],
+                                       ace[playing, hand])
+            bank = banks[playing]
+
+            offer_double_down = first_turn[playing] & (bank >= bet)
+            offer_split = ((cards == 2) & (first == second_card[playing, hand])
+                           & (bank >= bet) & (num_hands[playing] < max_splits))
+            row = np.where(offer_split, PAIR_ROW + first,
+                           np.where(soft, SOFT_ROW + total, total))
+            action = self.actions[(row * NUM_UPCARDS + upcard) * 2 +
+                                  offer_double_down]
+            # A split hand with one card is automatically hit
+            auto_hit = cards == 1
+            action = np.where(auto_hit, ACTION_HIT, action)
+
+            double_down = action == ACTION_DOUBLE_DOWN
+            banks[playing] -= bet * double_down
+            bets[playing, hand] = bet * (1 + double_down)
+
+            split = np.flatnonzero(action == ACTION_SPLIT)
+            if len(split):
+                seats = playing[split]
+                split_hand = hand[split]
+                new_hand = num_hands[seats]
+                moved = second_card[seats, split_hand]
+                bets[seats, new_hand] = bet[split]
+                banks[seats] -= bet[split]
+                first_card[seats, new_hand] = moved
+                hard[seats, new_hand] = moved
+                ace[seats, new_hand] = moved == 1
+                num_cards[seats, new_hand] = 1
+                num_hands[seats] += 1
+                hard[seats, split_hand] = first[split]
+                ace[seats, split_hand] = first[split] == 1
+                num_cards[seats, split_hand] = 1
+
+            # Everything but staying takes a card, in seat order
+            takes_card = action != ACTION_STAY
+            seats = playing[takes_card]
+            hand_taking = hand[takes_card]
+            card = self.draw(len(seats))
+            second_card[seats, hand_taking] = np.where(
+                num_cards[seats, hand_taking] == 1, card,
+                second_card[seats, hand_taking])
+            hard[seats, hand_taking] += card
+            ace[seats, hand_taking] |= card == 1
+            num_cards[seats, hand_taking] += 1
+
+            new_total, _ = _best_totals(hard[playing, hand],
+                                        ace[playing, hand])
+            bust = takes_card & (new_total > 21)
+            stats.losses += int(bust.sum())
+            # Split aces are only allowed one card
+            one_card_ace = ((action == ACTION_SPLIT) | auto_hit) & (first == 1)
+            stay = (~takes_card | double_down | (new_total >= 21) |
+                    one_card_ace)
+            first_turn[playing] &= ~((action == ACTION_HIT) & ~auto_hit)
+            first_turn[playing[stay]] = True
+            current[playing[stay]] += 1
+            playing = playing[current[playing] < num_hands[playing]]
+
+
+def simulate_crowd(rounds: int, num_seats: int, strategy: ChartStrategy,
+                   rules: Rules | None = None,
+                   seed: object = None) -> SimulationStats:
+    '''
+    Plays the given number of rounds at one CrowdTable and returns the
+    stats.
+    '''
+    start = time.perf_counter()
+    table = CrowdTable(num_seats, strategy, rules, seed)
+    stats = table.run(rounds)
+    stats.elapsed = time.perf_counter() - start
+    return stats
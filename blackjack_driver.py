@@ -0,0 +1,262 @@
+'''
+Scripted and generated input for the interactive game.
+Author: Chris Leung
+
+Drives blackjack_2026.main() (the same code path a human plays) by
+answering every prompt from a script or a generator instead of the
+keyboard. No terminal is needed, the screen is not cleared and the game's
+output can be discarded, so sessions run at full speed for load testing and
+profiling.
+
+Every answer is timed: the latency of a prompt is the time the game took
+from receiving the answer until it asked for the next one (or ended), and
+is reported per kind of prompt.
+
+Usage:
+    python blackjack_driver.py --script answers.txt
+    python blackjack_driver.py --players 3 --rounds 1000 --seed 1
+'''
+
+import argparse
+import contextlib
+import io
+import random
+import re
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Iterable
+
+import blackjack_2026
+
+PROMPT_NUM_PLAYERS = 'num_players'
+PROMPT_NAME = 'name'
+PROMPT_BET = 'bet'
+PROMPT_DECISION = 'decision'
+PROMPT_GAME_ON = 'game_on'
+PROMPT_KINDS = (PROMPT_NUM_PLAYERS, PROMPT_NAME, PROMPT_BET, PROMPT_DECISION,
+                PROMPT_GAME_ON)
+_OPTIONS = re.compile(r'\(([a-z/]+)\): $')
+_BANK = re.compile(r'has \$(-?\d+)\.')
+
+
+def prompt_kind(prompt: str) -> str:
+    '''
+    Returns which of the game's prompts (PROMPT_KINDS) a prompt is.
+    '''
+    if prompt.startswith('Please enter number of players'):
+        return PROMPT_NUM_PLAYERS
+    if prompt.endswith('Please enter your name: '):
+        return PROMPT_NAME
+    if prompt.endswith('Your bet: '):
+        return PROMPT_BET
+    if prompt.startswith('Play another round'):
+        return PROMPT_GAME_ON
+    if prompt.startswith('Hit'):
+        return PROMPT_DECISION
+    raise ValueError(f"Unknown prompt: {prompt!r}")
+
+
+@dataclass
+class PromptLatency:
+    '''
+    Latencies of one kind of prompt, in seconds.
+    '''
+    samples: list[float] = field(default_factory=list)
+
+    def percentile(self, fraction: float) -> float:
+        '''
+        Returns the latency below which the given fraction of samples fall.
+        '''
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def mean(self) -> float:
+        '''
+        Returns the mean latency.
+        '''
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
+
+
+class InputDriver(ABC):
+    '''
+    Base class for input providers. Calling the driver with a prompt returns
+    the answer from answer() and records how long the game took to act on
+    the previous answer.
+    '''
+
+    def __init__(self):
+        self.latencies: dict[str, PromptLatency] = {
+            kind: PromptLatency() for kind in PROMPT_KINDS}
+        self.prompts: int = 0
+        self._last_kind: str | None = None
+        self._answered_at: float = 0.0
+
+    @abstractmethod
+    def answer(self, prompt: str, kind: str) -> str:
+        '''
+        Returns the answer to a prompt. Implemented by subclasses.
+        '''
+
+    def finish(self) -> None:
+        '''
+        Records the latency of the last answer once the game has ended.
+        '''
+        if self._last_kind is not None:
+            self.latencies[self._last_kind].samples.append(
+                time.perf_counter() - self._answered_at)
+            self._last_kind = None
+
+    def __call__(self, prompt: str) -> str:
+        self.finish()
+        kind = prompt_kind(prompt)
+        response = self.answer(prompt, kind)
+        self.prompts += 1
+        self._last_kind = kind
+        self._answered_at = time.perf_counter()
+        return response
+
+
+class ScriptedInput(InputDriver):
+    '''
+    Answers prompts with the given responses in order. Raises EOFError, as
+    input() does, if the script runs out.
+    '''
+
+    def __init__(self, responses: Iterable[str]):
+        super().__init__()
+        self.responses = iter(responses)
+
+    def answer(self, prompt: str, kind: str) -> str:
+        try:
+            return next(self.responses)
+        except StopIteration as error:
+            raise EOFError(f"Script ended at prompt {prompt!r}") from error
+
+
+class GeneratedInput(InputDriver):
+    '''
+    Plays a session of the given number of players and rounds, betting
+    between the minimum and max_bet and picking a random offered action at
+    every decision. With an invalid_rate above 0 some answers are invalid,
+    to exercise the game's input validation.
+    '''
+
+    def __init__(self, num_players: int, rounds: int,
+                 rng: random.Random | None = None,
+                 max_bet: int = blackjack_2026.MINIMUM_BET * 4,
+                 invalid_rate: float = 0.0):
+        super().__init__()
+        self.num_players = num_players
+        self.rounds = rounds
+        self.rng = rng if rng is not None else random.Random()
+        self.max_bet = max_bet
+        self.invalid_rate = invalid_rate
+        self.rounds_played = 0
+        self.names = 0
+
+    def answer(self, prompt: str, kind: str) -> str:
+        rng = self.rng
+        if kind != PROMPT_NAME and rng.random() < self.invalid_rate:
+            return 'x'
+        if kind == PROMPT_NUM_PLAYERS:
+            return str(self.num_players)
+        if kind == PROMPT_NAME:
+            self.names += 1
+            return f"Bot {self.names}"
+        if kind == PROMPT_BET:
+            bank = int(_BANK.search(prompt).group(1))
+            return str(rng.randint(blackjack_2026.MINIMUM_BET,
+                                   max(blackjack_2026.MINIMUM_BET,
+                                       min(bank, self.max_bet))))
+        if kind == PROMPT_DECISION:
+            return rng.choice(_OPTIONS.search(prompt).group(1).split('/'))
+        self.rounds_played += 1
+        return 'y' if self.rounds_played < self.rounds else 'n'
+
+
+@dataclass
+class SessionReport:
+    '''
+    The result of run_session(): the prompts answered, total time and the
+    latencies of each kind of prompt.
+    '''
+    prompts: int
+    elapsed: float
+    latencies: dict[str, PromptLatency]
+    output: str = ''
+
+
+def run_session(driver: InputDriver, seed: object = None,
+                quiet: bool = True, prepare_shoes: bool = False
+                ) -> SessionReport:
+    '''
+    Plays blackjack_2026.main() with the driver answering every prompt and
+    without clearing the screen. With quiet the game's output is captured
+    into the report instead of printed.
+    '''
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        if quiet:
+            stack.enter_context(contextlib.redirect_stdout(output))
+        blackjack_2026.main(prepare_shoes, driver, False,
+                            random.Random(seed))
+        driver.finish()
+    return SessionReport(driver.prompts, time.perf_counter() - start,
+                         driver.latencies, output.getvalue())
+
+
+def print_report(report: SessionReport) -> None:
+    '''
+    Prints the latency of each kind of prompt in microseconds.
+    '''
+    print(f"Answered {report.prompts} prompts in {report.elapsed:.2f}s")
+    print(f"{'prompt':<12}{'count':>9}{'mean':>10}{'p50':>10}{'p99':>10}"
+          f"{'max':>10}")
+    for kind, latency in report.latencies.items():
+        if not latency.samples:
+            continue
+        print(f"{kind:<12}{len(latency.samples):>9}"
+              f"{latency.mean() * 1e6:>10.1f}"
+              f"{latency.percentile(0.5) * 1e6:>10.1f}"
+              f"{latency.percentile(0.99) * 1e6:>10.1f}"
+              f"{max(latency.samples) * 1e6:>10.1f}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    '''
+    Entry point for the driver. Returns the process exit code.
+    '''
+    parser = argparse.ArgumentParser(
+        description='Play the interactive game from a script or generated '
+                    'answers and report per-prompt latency.')
+    parser.add_argument('--script', metavar='PATH', default=None,
+                        help='answer prompts with the lines of PATH')
+    parser.add_argument('-p', '--players', type=int, default=3)
+    parser.add_argument('-n', '--rounds', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--invalid-rate', type=float, default=0.0,
+                        help='fraction of generated answers that are invalid')
+    parser.add_argument('--prepare-shoes', action='store_true')
+    parser.add_argument('--show-output', action='store_true',
+                        help="print the game's output")
+    args = parser.parse_args(argv)
+
+    if args.script is not None:
+        with open(args.script, encoding='utf-8') as script_file:
+            driver = ScriptedInput(script_file.read().splitlines())
+    else:
+        driver = GeneratedInput(args.players, args.rounds,
+                                random.Random(args.seed),
+                                invalid_rate=args.invalid_rate)
+    report = run_session(driver, args.seed, not args.show_output,
+                         args.prepare_shoes)
+    print_report(report)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
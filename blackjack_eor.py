@@ -0,0 +1,428 @@
+'''
+Effects of removal for designing card counting systems.
+Author: Chris Leung
+
+Computes the expected value of one round of blackjack_2026 played by a
+strategy chart (basic strategy by default) for the full shoe, and again with
+one card of each rank removed. The effect of removal of a rank is the
+change in EV, which is what count tags are designed from: ranks whose
+removal helps the player get positive tags.
+
+The calculation follows the blackjack_2026 rules: the dealer checks for
+blackjack before anyone plays, hits soft 17, blackjack pays 3:2 (rounded
+down to whole dollars on the given bet), doubling down is allowed on any
+first two cards and after splits, and split aces get one card. As in
+blackjack_advisor, a split is valued as two independent hands that are not
+split again.
+
+The player's two cards and the dealer's upcard are dealt exactly from the
+shoe. The cards drawn after that are drawn with the probabilities of the
+composition left after the deal, without further depletion. Every table
+(dealer outcomes, standing and playing EVs) then depends only on that
+post-deal composition, and the shoes with different ranks removed reach
+mostly the same ones: removing a 5 and dealing 2-9 against a 7 leaves the
+same cards as removing a 2 and dealing 5-9 against a 7. Each post-deal
+composition is calculated once, in parallel, and shared by the full shoe
+and every rank.
+
+Usage:
+    python blackjack_eor.py --decks 6 --workers 4
+'''
+
+import argparse
+import multiprocessing
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from blackjack_2026 import CARD_RANK_VALUES
+from blackjack_2026 import CARD_RANKS
+from blackjack_2026 import MINIMUM_BET
+from blackjack_2026 import NUM_SHOE_DECKS
+from blackjack_advisor import best_total
+from blackjack_advisor import DEALER_OUTCOMES
+from blackjack_advisor import NUM_CARD_VALUES
+from blackjack_advisor import remove_card
+from blackjack_strategy import basic_strategy
+from blackjack_strategy import ChartStrategy
+from blackjack_strategy import NUM_UPCARDS
+from blackjack_strategy import PAIR_ROW
+from blackjack_strategy import SOFT_ROW
+
+_VALUES = range(1, NUM_CARD_VALUES + 1)
+# Compositions are processed in chunks of this many per worker task
+_CHUNK_SIZE = 16
+
+
+def shoe_composition(num_shoe_decks: int) -> tuple[int, ...]:
+    '''
+    Returns the composition (count of each card value, aces first) of a full
+    shoe.
+    '''
+    counts = [0] * NUM_CARD_VALUES
+    for rank in CARD_RANKS:
+        counts[CARD_RANK_VALUES[rank] - 1] += 4 * num_shoe_decks
+    return tuple(counts)
+
+
+def hand_index(first: int, upcard: int, second: int) -> int:
+    '''
+    Returns the index of a dealt hand in the tuples returned by hand_evs().
+    '''
+    return ((upcard - 1) * NUM_CARD_VALUES + first - 1) * NUM_CARD_VALUES + \
+        second - 1
+
+
+class PostDealTables:
+    '''
+    The EV tables for the cards drawn after the deal, which are drawn with
+    the fixed probabilities of one post-deal composition.
+    '''
+
+    def __init__(self, composition: tuple[int, ...],
+                 strategy_table: tuple[str, ...]):
+        num_cards = sum(composition)
+        self.composition = composition
+        self.probabilities = [count / num_cards for count in composition]
+        self.strategy_table = strategy_table
+        self.dealer_memo: dict[tuple[int, bool], tuple[float, ...]] = {}
+        self.stand_memo: dict[tuple[int, int], float] = {}
+        self.play_memo: dict[tuple, float] = {}
+
+    def _dealer_draws(self, hard_total: int,
+                      has_ace: bool) -> tuple[float, ...]:
+        key = (hard_total, has_ace)
+        if key in self.dealer_memo:
+            return self.dealer_memo[key]
+        total = best_total(hard_total, has_ace)
+        outcome = [0.0] * len(DEALER_OUTCOMES)
+        if hard_total > 21:
+            outcome[-1] = 1.0
+        elif total > 17 or (total == 17 and total == hard_total):
+            outcome[total - 17] = 1.0
+        else:
+            for value, probability in zip(_VALUES, self.probabilities):
+                if probability == 0:
+                    continue
+                after = self._dealer_draws(hard_total + value,
+                                           has_ace or value == 1)
+                for index, after_probability in enumerate(after):
+                    outcome[index] += probability * after_probability
+        result = tuple(outcome)
+        self.dealer_memo[key] = result
+        return result
+
+    def dealer_blackjack(self, upcard: int) -> float:
+        '''
+        Returns the probability that the hole card completes a dealer
+        blackjack.
+        '''
+        completing = {1: 10, 10: 1}.get(upcard)
+        return 0.0 if completing is None else \
+            self.probabilities[completing-1]
+
+    def stand(self, total: int, upcard: int) -> float:
+        '''
+        Returns the EV of standing on a total, given that the dealer does not
+        have blackjack.
+        '''
+        key = (total, upcard)
+        if key in self.stand_memo:
+            return self.stand_memo[key]
+        # The hole card cannot complete a blackjack
+        excluded = {1: 10, 10: 1}.get(upcard)
+        no_blackjack = 1 - self.dealer_blackjack(upcard)
+        outcome = [0.0] * len(DEALER_OUTCOMES)
+        for value, probability in zip(_VALUES, self.probabilities):
+            if probability == 0 or value == excluded:
+                continue
+            after = self._dealer_draws(upcard + value,
+                                       upcard == 1 or value == 1)
+            for index, after_probability in enumerate(after):
+                outcome[index] += probability * after_probability
+        ev = 0.0
+        for dealer_total, probability in zip(DEALER_OUTCOMES, outcome):
+            if dealer_total > 21 or dealer_total < total:
+                ev += probability / no_blackjack
+            elif dealer_total > total:
+                ev -= probability / no_blackjack
+        self.stand_memo[key] = ev
+        return ev
+
+    def play(self, upcard: int, hard_total: int, has_ace: bool,
+             first_turn: bool, pair_value: int) -> float:
+        '''
+        Returns the EV of playing a hand by the chart, given that the dealer
+        does not have blackjack. pair_value is the value of a pair that may
+        be split, or 0.
+        '''
+        key = (upcard, hard_total, has_ace, first_turn, pair_value)
+        if key in self.play_memo:
+            return self.play_memo[key]
+        total = best_total(hard_total, has_ace)
+        if pair_value:
+            row = PAIR_ROW + pair_value
+        elif total != hard_total:
+            row = SOFT_ROW + total
+        else:
+            row = total
+        action = self.strategy_table[(row * NUM_UPCARDS + upcard) * 2 +
+                                     first_turn]
+        ev = self.action_ev(upcard, hard_total, has_ace, action, pair_value)
+        self.play_memo[key] = ev
+        return ev
+
+    def action_ev(self, upcard: int, hard_total: int, has_ace: bool,
+                  action: str, pair_value: int = 0) -> float:
+        '''
+        Returns the EV of taking an action ('h', 's', 'd' or 'p') on a hand
+        and then playing on by the chart, given that the dealer does not
+        have blackjack. Splitting needs the pair_value.
+        '''
+        if action == 's':
+            return self.stand(best_total(hard_total, has_ace), upcard)
+        if action == 'd':
+            return 2 * self._draw(upcard, hard_total, has_ace, False)
+        if action == 'p':
+            return 2 * self._split_hand(upcard, pair_value)
+        return self._draw(upcard, hard_total, has_ace, True)
+
+    def _draw(self, upcard: int, hard_total: int, has_ace: bool,
+              then_play: bool) -> float:
+        '''
+        Returns the EV of taking one card and then either playing on by the
+        chart (then_play) or standing. 21 stays automatically.
+        '''
+        ev = 0.0
+        for value, probability in zip(_VALUES, self.probabilities):
+            if probability == 0:
+                continue
+            new_hard = hard_total + value
+            if new_hard > 21:
+                ev -= probability
+                continue
+            new_ace = has_ace or value == 1
+            total = best_total(new_hard, new_ace)
+            if then_play and total < 21:
+                result = self.play(upcard, new_hard, new_ace, False, 0)
+            else:
+                result = self.stand(total, upcard)
+            ev += probability * result
+        return ev
+
+    def _split_hand(self, upcard: int, pair_value: int) -> float:
+        '''
+        Returns the EV of one of the two hands of a split.
+        '''
+        ev = 0.0
+        for value, probability in zip(_VALUES, self.probabilities):
+            if probability == 0:
+                continue
+            hard_total = pair_value + value
+            has_ace = pair_value == 1 or value == 1
+            total = best_total(hard_total, has_ace)
+            if pair_value == 1 or total == 21:
+                # Split aces get one card; 21 stays automatically
+                result = self.stand(total, upcard)
+            else:
+                result = self.play(upcard, hard_total, has_ace, True, 0)
+            ev += probability * result
+        return ev
+
+
+def hand_evs(composition: tuple[int, ...],
+             strategy_table: tuple[str, ...],
+             blackjack_payout: float) -> tuple[float, ...]:
+    '''
+    Returns the EV of every dealt hand (indexed by hand_index()) that leaves
+    the given post-deal composition, including the dealer's check for
+    blackjack.
+    '''
+    tables = PostDealTables(composition, strategy_table)
+    evs = [0.0] * NUM_CARD_VALUES ** 3
+    for upcard in _VALUES:
+        dealer_blackjack = tables.dealer_blackjack(upcard)
+        for first in _VALUES:
+            for second in range(first, NUM_CARD_VALUES + 1):
+                if {first, second} == {1, 10}:
+                    ev = (1 - dealer_blackjack) * blackjack_payout
+                else:
+                    play = tables.play(upcard, first + second,
+                                       1 in (first, second), True,
+                                       first if first == second else 0)
+                    ev = (1 - dealer_blackjack) * play - dealer_blackjack
+                evs[hand_index(first, upcard, second)] = ev
+                evs[hand_index(second, upcard, first)] = ev
+    return tuple(evs)
+
+
+def _deals(shoe: tuple[int, ...]):
+    '''
+    Yields (probability, first, upcard, second, post-deal composition) for
+    every way the player's two cards and the dealer's upcard can be dealt.
+    '''
+    num_cards = sum(shoe)
+    for first in _VALUES:
+        if shoe[first-1] == 0:
+            continue
+        after_first = remove_card(shoe, first)
+        for upcard in _VALUES:
+            if after_first[upcard-1] == 0:
+                continue
+            after_upcard = remove_card(after_first, upcard)
+            for second in _VALUES:
+                if after_upcard[second-1] == 0:
+                    continue
+                probability = (shoe[first-1] * after_first[upcard-1] *
+                               after_upcard[second-1] /
+                               (num_cards * (num_cards - 1) *
+                                (num_cards - 2)))
+                yield (probability, first, upcard, second,
+                       remove_card(after_upcard, second))
+
+
+def _hand_evs_chunk(compositions: list[tuple[int, ...]],
+                    strategy_table: tuple[str, ...],
+                    blackjack_payout: float) -> list[tuple[float, ...]]:
+    return [hand_evs(composition, strategy_table, blackjack_payout)
+            for composition in compositions]
+
+
+class RoundEV:
+    '''
+    EV of one round, per initial bet, for a chart strategy. Keeps the hand
+    EVs of every post-deal composition it has seen, so shoes that reach the
+    same compositions share them.
+    '''
+
+    def __init__(self, strategy: ChartStrategy = basic_strategy,
+                 bet: int = MINIMUM_BET):
+        self.strategy_table: tuple[str, ...] = strategy.table
+        self.blackjack_payout: float = (bet * 3 // 2) / bet
+        self.tables: dict[tuple[int, ...], tuple[float, ...]] = {}
+
+    def prepare(self, shoes: Iterable[tuple[int, ...]],
+                workers: int = 1) -> int:
+        '''
+        Calculates the tables every shoe needs that are not already kept,
+        using the given number of worker processes. Returns how many were
+        calculated.
+        '''
+        missing = list(dict.fromkeys(
+            deal[-1] for shoe in shoes for deal in _deals(shoe)
+            if deal[-1] not in self.tables))
+        chunks = [missing[start:start + _CHUNK_SIZE]
+                  for start in range(0, len(missing), _CHUNK_SIZE)]
+        tasks = [(chunk, self.strategy_table, self.blackjack_payout)
+                 for chunk in chunks]
+        if workers <= 1:
+            results = [_hand_evs_chunk(*task) for task in tasks]
+        else:
+            with multiprocessing.Pool(workers) as pool:
+                results = pool.starmap(_hand_evs_chunk, tasks)
+        for chunk, evs in zip(chunks, results):
+            self.tables.update(zip(chunk, evs))
+        return len(missing)
+
+    def round_ev(self, shoe: tuple[int, ...]) -> float:
+        '''
+        Returns the player's EV per initial bet for a round dealt from the
+        given shoe composition.
+        '''
+        self.prepare([shoe])
+        return sum(probability *
+                   self.tables[composition][hand_index(first, upcard,
+                                                       second)]
+                   for probability, first, upcard, second, composition
+                   in _deals(shoe))
+
+
+@dataclass
+class RemovalEffects:
+    '''
+    The full-shoe EV and the change in EV from removing one card of each
+    rank, per initial bet.
+    '''
+    num_shoe_decks: int
+    full_shoe_ev: float
+    effects: dict[str, float] = field(default_factory=dict)
+    tables: int = 0
+    elapsed: float = 0.0
+
+    def tags(self) -> dict[str, float]:
+        '''
+        Returns the effects scaled so that the largest is 1, a starting
+        point for the tags of a count.
+        '''
+        largest = max(abs(effect) for effect in self.effects.values())
+        return {rank: effect / largest if largest else 0.0
+                for rank, effect in self.effects.items()}
+
+
+def effects_of_removal(num_shoe_decks: int = NUM_SHOE_DECKS,
+                       strategy: ChartStrategy = basic_strategy,
+                       bet: int = MINIMUM_BET,
+                       workers: int = 1) -> RemovalEffects:
+    '''
+    Returns the effect on the EV of removing one card of each rank from a
+    full shoe of num_shoe_decks decks. Ranks with the same value (10, J, Q
+    and K) share a calculation.
+    '''
+    start = time.perf_counter()
+    full_shoe = shoe_composition(num_shoe_decks)
+    removed = {value: remove_card(full_shoe, value) for value in _VALUES}
+    calculator = RoundEV(strategy, bet)
+    tables = calculator.prepare([full_shoe, *removed.values()], workers)
+
+    result = RemovalEffects(num_shoe_decks, calculator.round_ev(full_shoe),
+                            tables=tables)
+    removal_evs = {value: calculator.round_ev(shoe)
+                   for value, shoe in removed.items()}
+    for rank in CARD_RANKS:
+        result.effects[rank] = (removal_evs[CARD_RANK_VALUES[rank]] -
+                                result.full_shoe_ev)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def print_effects(result: RemovalEffects) -> None:
+    '''
+    Prints the full-shoe EV and the effect of removing each rank.
+    '''
+    print(f"{result.num_shoe_decks}-deck shoe EV: "
+          f"{result.full_shoe_ev:+.4%}")
+    tags = result.tags()
+    print(f"{'rank':<6}{'effect':>10}{'scaled':>9}")
+    for rank, effect in result.effects.items():
+        print(f"{rank:<6}{effect:>+10.4%}{tags[rank]:>+9.2f}")
+    print(f"{result.tables} post-deal tables calculated in "
+          f"{result.elapsed:.1f}s")
+
+
+def main(argv: list[str] | None = None) -> int:
+    '''
+    Entry point for the calculator. Returns the process exit code.
+    '''
+    parser = argparse.ArgumentParser(
+        description='Compute the effect of removing each rank on the EV.')
+    parser.add_argument('--decks', type=int, default=NUM_SHOE_DECKS)
+    parser.add_argument('--strategy', metavar='CHART', default=None,
+                        help='.json/.csv chart to play (default: basic '
+                             'strategy)')
+    parser.add_argument('--bet', type=int, default=MINIMUM_BET)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+    strategy = basic_strategy
+    if args.strategy is not None:
+        try:
+            strategy = ChartStrategy.from_file(args.strategy)
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+    print_effects(effects_of_removal(args.decks, strategy, args.bet,
+                                     args.workers))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
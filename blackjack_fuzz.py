@@ -0,0 +1,237 @@
+'''
+Differential fuzzing of the hand scorers in blackjack.py and blackjack_2026.py.
+Author: Chris Leung
+
+Random hands are generated as integer arrays (one row per hand, one column
+per card) and scored by a vectorized NumPy reference evaluator. Every
+distinct hand is then scored by Player.max_hand_value() from blackjack.py
+(aces valued at 11) and Hand._evaluate() from blackjack_2026.py (aces valued
+at 1, then promoted), and the whole batch by the vectorized
+blackjack_batch.evaluate_hands(). Any disagreement on value or softness is
+reported.
+
+Cards are encoded as their index into CARD_RANKS ('2' is 0, 'A' is 12) and
+rows are padded with PAD.
+
+Usage:
+    python -m blackjack_fuzz --hands 1000000 --seed 1
+'''
+
+import argparse
+from dataclasses import dataclass, field
+
+import numpy as np
+
+import blackjack
+from blackjack_batch import evaluate_hands
+from blackjack_batch import PAD
+from blackjack_2026 import Card
+from blackjack_2026 import CARD_RANK_VALUES
+from blackjack_2026 import CARD_RANKS
+from blackjack_2026 import Hand
+
+ACE_CODE = CARD_RANKS.index('A')
+RANK_CODE_VALUES = np.array([CARD_RANK_VALUES[rank] for rank in CARD_RANKS],
+                            dtype=np.int16)
+
+
+@dataclass
+class Disagreement:
+    '''
+    A hand on which a scorer disagrees with the reference evaluator. 'soft'
+    is None for scorers that do not report softness.
+    '''
+    scorer: str
+    ranks: tuple[str, ...]
+    expected_value: int
+    expected_soft: bool
+    value: int
+    soft: bool | None
+
+    def __str__(self):
+        soft = '' if self.soft is None else f", soft={self.soft}"
+        return (f"{self.scorer}: {' '.join(self.ranks) or '(empty)'} -> "
+                f"value={self.value}{soft}, expected "
+                f"value={self.expected_value}, soft={self.expected_soft}")
+
+
+@dataclass
+class FuzzReport:
+    '''
+    Totals for a fuzzing run. Only the first few disagreements are kept as
+    examples; 'mismatches' counts all of them per scorer.
+    '''
+    hands: int = 0
+    distinct_hands: int = 0
+    mismatches: dict[str, int] = field(default_factory=dict)
+    examples: list[Disagreement] = field(default_factory=list)
+
+    def passed(self) -> bool:
+        '''
+        Returns True if no scorer disagreed with the reference.
+        '''
+        return not any(self.mismatches.values())
+
+
+def random_hands(num_hands: int, max_cards: int,
+                 rng: np.random.Generator) -> np.ndarray:
+    '''
+    Returns a (num_hands, max_cards) array of random rank codes. Each hand has
+    between 0 and max_cards cards; unused columns are set to PAD.
+    '''
+    hands = rng.integers(0, len(CARD_RANKS), size=(num_hands, max_cards),
+                         dtype=np.int8)
+    lengths = rng.integers(0, max_cards + 1, size=num_hands)
+    hands[np.arange(max_cards) >= lengths[:, np.newaxis]] = PAD
+    return hands
+
+
+def reference_evaluate(hands: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    '''
+    Vectorized reference scorer. Returns arrays of hand values and soft
+    flags. At most one ace can ever count as 11, so a hand is soft exactly
+    when it holds an ace and its hard total is 11 or less.
+    '''
+    valid = hands != PAD
+    totals = np.where(valid, RANK_CODE_VALUES[hands], 0).sum(axis=1)
+    soft = (hands == ACE_CODE).any(axis=1) & (totals <= 11)
+    return totals + 10 * soft, soft
+
+
+def score_blackjack(ranks: tuple[str, ...]) -> tuple[int, bool | None]:
+    '''
+    Scores a hand with Player.max_hand_value() from blackjack.py, which does
+    not report softness.
+    '''
+    player = blackjack.Player('Fuzz', 0)
+    player.hand = [blackjack.Card('♠', rank) for rank in ranks]
+    return (player.max_hand_value(), None)
+
+
+def score_blackjack_2026(ranks: tuple[str, ...]) -> tuple[int, bool | None]:
+    '''
+    Scores a hand with Hand._evaluate() from blackjack_2026.py.
+    '''
+    hand = Hand()
+    hand.cards = [Card(rank, 'Spades') for rank in ranks]
+    return hand._evaluate()  # pylint: disable=protected-access
+
+
+def score_batch(hands: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    '''
+    Scores a whole batch with blackjack_batch.evaluate_hands().
+    '''
+    evaluation = evaluate_hands(hands)
+    return (evaluation.value, evaluation.soft)
+
+
+SCORERS = {
+    'blackjack.Player.max_hand_value': score_blackjack,
+    'blackjack_2026.Hand._evaluate': score_blackjack_2026,
+}
+
+
+# Vectorized scorers take the whole batch and return arrays of values and
+# soft flags
+BATCH_SCORERS = {
+    'blackjack_batch.evaluate_hands': score_batch,
+}
+
+
+def check_hands(hands: np.ndarray, report: FuzzReport,
+                max_examples: int = 10) -> None:
+    '''
+    Scores a batch of hands with every scorer and records disagreements with
+    the reference evaluator in the report. Each distinct hand is scored only
+    once per batch.
+    '''
+    expected_values, expected_soft = reference_evaluate(hands)
+    distinct, first_index, inverse = np.unique(
+        hands, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    report.hands += len(hands)
+    report.distinct_hands += len(distinct)
+    rows = [tuple(CARD_RANKS[code] for code in row if code != PAD)
+            for row in distinct.tolist()]
+
+    for name, scorer in SCORERS.items():
+        values = np.empty(len(distinct), dtype=np.int16)
+        soft = np.empty(len(distinct), dtype=np.int8)
+        for index, ranks in enumerate(rows):
+            value, is_soft = scorer(ranks)
+            values[index] = value
+            soft[index] = -1 if is_soft is None else is_soft
+        wrong = values != expected_values[first_index]
+        wrong |= ((soft != -1) &
+                  (soft != expected_soft[first_index].astype(np.int8)))
+        report.mismatches[name] = (report.mismatches.get(name, 0) +
+                                   int(np.count_nonzero(wrong[inverse])))
+        for index in np.flatnonzero(wrong):
+            if len(report.examples) >= max_examples:
+                break
+            reference = first_index[index]
+            report.examples.append(Disagreement(
+                name, rows[index], int(expected_values[reference]),
+                bool(expected_soft[reference]), int(values[index]),
+                None if soft[index] == -1 else bool(soft[index])))
+
+    for name, batch_scorer in BATCH_SCORERS.items():
+        values, soft = batch_scorer(hands)
+        wrong = (values != expected_values) | (soft != expected_soft)
+        report.mismatches[name] = (report.mismatches.get(name, 0) +
+                                   int(np.count_nonzero(wrong)))
+        for index in np.flatnonzero(wrong):
+            if len(report.examples) >= max_examples:
+                break
+            report.examples.append(Disagreement(
+                name,
+                tuple(CARD_RANKS[code] for code in hands[index]
+                      if code != PAD),
+                int(expected_values[index]), bool(expected_soft[index]),
+                int(values[index]), bool(soft[index])))
+
+
+def fuzz(num_hands: int,
+         max_cards: int = 8,
+         seed: int | None = None,
+         chunk_size: int = 100_000,
+         max_examples: int = 10) -> FuzzReport:
+    '''
+    Generates num_hands random hands in chunks and checks every scorer against
+    the reference evaluator. Returns the report.
+    '''
+    rng = np.random.default_rng(seed)
+    report = FuzzReport()
+    remaining = num_hands
+    while remaining > 0:
+        hands = random_hands(min(chunk_size, remaining), max_cards, rng)
+        check_hands(hands, report, max_examples)
+        remaining -= len(hands)
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    '''
+    Runs the fuzzer from the command line. Returns 1 if any scorer disagreed.
+    '''
+    parser = argparse.ArgumentParser(
+        prog='python -m blackjack_fuzz',
+        description='Compare the blackjack hand scorers on random hands.')
+    parser.add_argument('-n', '--hands', type=int, default=1_000_000)
+    parser.add_argument('--max-cards', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    report = fuzz(args.hands, args.max_cards, args.seed, args.chunk_size)
+    print(f"Checked {report.hands} hands "
+          f"({report.distinct_hands} scored individually)")
+    for name, count in report.mismatches.items():
+        print(f"{name}: {count} disagreements")
+    for example in report.examples:
+        print(f"  {example}")
+    return 0 if report.passed() else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,433 @@
+'''
+Directory-based job queue for sharded simulations across machines.
+Author: Chris Leung
+
+A job splits a large simulation into seeded shards, numbered from 0, and
+stores them in a queue directory that any number of workers can share, on
+one host or over NFS. No broker is needed. The directory holds:
+
+    job.json            the job: rounds, players, strategy, rules, seed
+    pending/            one file per shard waiting to run
+    claimed/            shards being run; the file's age is its lease
+    done/               shards whose results are written
+    results/            one JSON file of SimulationStats per shard
+    checkpoints/        the checkpoint of each running shard
+    status/             the progress report of each running shard
+
+A worker claims a shard by renaming its file from pending/ to claimed/.
+The rename is atomic, so exactly one worker gets each shard. The shard runs
+through blackjack_sim.simulate_shard(), saving checkpoints as it goes,
+while a background thread touches the claim every quarter of a lease to
+keep it alive. Its result is written atomically before the claim moves to
+done/.
+
+A claim whose lease runs out (the worker crashed or lost the share) goes
+back to pending/ and the next worker resumes it from its checkpoint.
+Workers with nothing left to claim wait for running shards, so crashed ones
+are retried without anyone restarting a worker. Shard seeds are fixed by
+the job, so every run of a shard gives the same result, and each shard has
+a single result file. A shard retried, or finished twice by a slow worker,
+is therefore never counted twice. Only the worker named in a claim moves it
+to done/ and removes its checkpoint. merge_results() adds the results in
+shard order, so merging is deterministic and matches simulate() with one
+worker per shard. Leases are judged by file times, so the hosts' clocks
+should be in sync.
+
+Usage:
+    python blackjack_jobs.py create QUEUE --rounds 1000000000 --shards 1000
+    python blackjack_jobs.py work QUEUE       (on every machine)
+    python blackjack_jobs.py status QUEUE
+    python blackjack_jobs.py merge QUEUE
+'''
+
+import argparse
+import json
+import os
+import random
+import shutil
+import socket
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+from blackjack_sim import add_rules_arguments
+from blackjack_sim import get_strategy
+from blackjack_sim import print_summary
+from blackjack_sim import Rules
+from blackjack_sim import rules_from_args
+from blackjack_sim import SimulationStats
+from blackjack_sim import simulate_shard
+from blackjack_sim import STRATEGIES
+from blackjack_sim import temp_path_for
+
+JOB_FILE = 'job.json'
+PENDING = 'pending'
+CLAIMED = 'claimed'
+DONE = 'done'
+RESULTS = 'results'
+CHECKPOINTS = 'checkpoints'
+STATUS = 'status'
+# A claim not refreshed for this long is given to another worker, in seconds
+DEFAULT_LEASE_SECONDS = 600.0
+# Running shards refresh their claims this many times per lease
+HEARTBEATS_PER_LEASE = 4
+# How often a worker with nothing to claim checks for stale claims, seconds
+DEFAULT_POLL_SECONDS = 30.0
+DEFAULT_CHECKPOINT_EVERY = 100000
+
+
+@dataclass
+class JobSpec:
+    '''
+    A sharded simulation. The strategy is a built-in name or a chart file in
+    the queue directory.
+    '''
+    rounds: int
+    num_shards: int
+    num_players: int = 1
+    strategy: str = 'basic'
+    rules: Rules | None = None
+    seed: str = ''
+
+    def shard_rounds(self, index: int) -> int:
+        '''
+        Returns the number of rounds in a shard, as simulate() splits them.
+        '''
+        return (self.rounds // self.num_shards +
+                (index < self.rounds % self.num_shards))
+
+    def shard_seed(self, index: int) -> str:
+        '''
+        Returns the seed of a shard, as simulate() derives it.
+        '''
+        return f"{self.seed}:{index}"
+
+
+def _write_json(path: str, data: dict) -> None:
+    '''
+    Writes data to path as JSON, replacing the file atomically.
+    '''
+    temp_path = temp_path_for(path)
+    with open(temp_path, 'w', encoding='utf-8') as json_file:
+        json.dump(data, json_file, indent=2)
+        json_file.write('\n')
+    os.replace(temp_path, path)
+
+
+def _read_json(path: str) -> dict:
+    with open(path, encoding='utf-8') as json_file:
+        return json.load(json_file)
+
+
+def _shard_name(index: int) -> str:
+    return f"shard-{index:06d}.json"
+
+
+def _shard_index(name: str) -> int:
+    return int(name.removeprefix('shard-').removesuffix('.json'))
+
+
+def _shards(queue_dir: str, state: str) -> list[str]:
+    '''
+    Returns the names of the shard files in one of the state directories.
+    '''
+    return sorted(name for name in os.listdir(os.path.join(queue_dir, state))
+                  if name.startswith('shard-') and name.endswith('.json'))
+
+
+def create_job(queue_dir: str, spec: JobSpec) -> JobSpec:
+    '''
+    Creates a queue directory for the job with every shard pending, and
+    returns the job as stored. A strategy chart file is copied into the
+    queue, and a job without a seed is given a random one so that every
+    shard is reproducible. Raises ValueError for a job without rounds,
+    shards or players, before anything is written, and FileExistsError if
+    the directory already holds a job.
+    '''
+    for value, name in ((spec.rounds, 'rounds'),
+                        (spec.num_shards, 'shards'),
+                        (spec.num_players, 'players')):
+        if value < 1:
+            raise ValueError(f"The number of {name} must be at least 1")
+    if spec.strategy not in STRATEGIES:
+        get_strategy(spec.strategy)
+    os.makedirs(queue_dir, exist_ok=True)
+    if os.path.exists(os.path.join(queue_dir, JOB_FILE)):
+        raise FileExistsError(f"{queue_dir} already holds a job")
+    for state in (PENDING, CLAIMED, DONE, RESULTS, CHECKPOINTS, STATUS):
+        os.makedirs(os.path.join(queue_dir, state), exist_ok=True)
+
+    strategy = spec.strategy
+    if strategy not in STRATEGIES:
+        copied = 'strategy' + os.path.splitext(strategy)[1].lower()
+        shutil.copyfile(strategy, os.path.join(queue_dir, copied))
+        strategy = copied
+    seed = spec.seed or str(random.SystemRandom().getrandbits(64))
+    stored = JobSpec(spec.rounds, spec.num_shards, spec.num_players,
+                     strategy, spec.rules or Rules(), seed)
+    for index in range(stored.num_shards):
+        _write_json(os.path.join(queue_dir, PENDING, _shard_name(index)),
+                    {'index': index})
+    # Written last: workers only start once every shard is queued
+    job = asdict(stored)
+    _write_json(os.path.join(queue_dir, JOB_FILE), job)
+    return stored
+
+
+def load_job(queue_dir: str) -> JobSpec:
+    '''
+    Returns the job stored in a queue directory.
+    '''
+    data = _read_json(os.path.join(queue_dir, JOB_FILE))
+    data['rules'] = Rules(**data['rules'])
+    return JobSpec(**data)
+
+
+def requeue_stale(queue_dir: str,
+                  lease_seconds: float = DEFAULT_LEASE_SECONDS) -> list[int]:
+    '''
+    Moves claims whose lease has run out back to pending and returns their
+    shard indices. The lease runs from the claim file's modification time.
+    '''
+    now = time.time()
+    requeued = []
+    for name in _shards(queue_dir, CLAIMED):
+        claim = os.path.join(queue_dir, CLAIMED, name)
+        try:
+            refreshed = os.path.getmtime(claim)
+        except FileNotFoundError:
+            continue
+        if now - refreshed <= lease_seconds:
+            continue
+        try:
+            os.rename(claim, os.path.join(queue_dir, PENDING, name))
+        except FileNotFoundError:
+            # Finished or requeued by someone else in the meantime
+            continue
+        requeued.append(_shard_index(name))
+    return requeued
+
+
+def claim_shard(queue_dir: str, worker_id: str) -> int | None:
+    '''
+    Claims the lowest pending shard and returns its index, or None if no
+    shard is pending.
+    '''
+    for name in _shards(queue_dir, PENDING):
+        pending = os.path.join(queue_dir, PENDING, name)
+        claim = os.path.join(queue_dir, CLAIMED, name)
+        try:
+            # The rename keeps the file's time, which starts the lease, so
+            # stamp it first or the claim could look stale from the start
+            os.utime(pending)
+            os.rename(pending, claim)
+        except FileNotFoundError:
+            # Another worker got it first
+            continue
+        index = _shard_index(name)
+        _write_json(claim, {'index': index, 'worker': worker_id,
+                            'claimed_at': time.time()})
+        return index
+    return None
+
+
+def _owns_claim(claim: str, worker_id: str) -> bool:
+    '''
+    Returns whether a claim file exists and names the worker.
+    '''
+    try:
+        return _read_json(claim).get('worker') == worker_id
+    except (OSError, ValueError):
+        return False
+
+
+def _renew_lease(claim: str, worker_id: str, interval: float,
+                 stopped: threading.Event) -> None:
+    '''
+    Touches the claim every interval seconds until stopped, or until the
+    claim is no longer the worker's.
+    '''
+    while not stopped.wait(interval):
+        if not _owns_claim(claim, worker_id):
+            return
+        try:
+            os.utime(claim)
+        except FileNotFoundError:
+            return
+
+
+def run_shard(queue_dir: str, job: JobSpec, index: int, worker_id: str,
+              checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+              lease_seconds: float = DEFAULT_LEASE_SECONDS
+              ) -> SimulationStats:
+    '''
+    Runs a shard claimed by the worker, resuming from its checkpoint if a
+    previous claim left one, and writes its result. A shard whose result
+    already exists is not run again. The claim's lease is renewed while the
+    shard runs. If the worker still owns the claim at the end, the shard is
+    marked done and its checkpoint and status are removed; otherwise they
+    belong to whoever claimed the shard since.
+    '''
+    name = _shard_name(index)
+    claim = os.path.join(queue_dir, CLAIMED, name)
+    result_path = os.path.join(queue_dir, RESULTS, name)
+    checkpoint_path = os.path.join(queue_dir, CHECKPOINTS,
+                                   name.removesuffix('.json'))
+    status_path = os.path.join(queue_dir, STATUS, name)
+    if os.path.exists(result_path):
+        stats = SimulationStats(**_read_json(result_path))
+    else:
+        strategy = (job.strategy if job.strategy in STRATEGIES
+                    else os.path.join(queue_dir, job.strategy))
+        stopped = threading.Event()
+        heartbeat = threading.Thread(
+            target=_renew_lease, daemon=True,
+            args=(claim, worker_id, lease_seconds / HEARTBEATS_PER_LEASE,
+                  stopped))
+        heartbeat.start()
+        try:
+            stats = simulate_shard(
+                job.shard_rounds(index), job.num_players, strategy,
+                job.rules, job.shard_seed(index), checkpoint_path,
+                checkpoint_every, status_path=status_path,
+                status_every=checkpoint_every)
+        finally:
+            stopped.set()
+            heartbeat.join()
+        _write_json(result_path, asdict(stats))
+    if _owns_claim(claim, worker_id):
+        try:
+            os.rename(claim, os.path.join(queue_dir, DONE, name))
+        except FileNotFoundError:
+            # Requeued at the last moment; the next claimant finds the result
+            return stats
+        for leftover in (checkpoint_path, status_path):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+    return stats
+
+
+def work(queue_dir: str, worker_id: str | None = None,
+         lease_seconds: float = DEFAULT_LEASE_SECONDS,
+         checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+         max_shards: int | None = None,
+         poll_seconds: float = DEFAULT_POLL_SECONDS) -> int:
+    '''
+    Claims and runs shards until every shard is done (or max_shards have
+    been run), requeuing stale claims first. While shards are claimed but
+    none are pending, checks again every poll_seconds, so that a shard
+    whose worker died is picked up once its lease runs out. Returns the
+    number of shards run.
+    '''
+    if worker_id is None:
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    job = load_job(queue_dir)
+    completed = 0
+    while max_shards is None or completed < max_shards:
+        requeue_stale(queue_dir, lease_seconds)
+        index = claim_shard(queue_dir, worker_id)
+        if index is not None:
+            run_shard(queue_dir, job, index, worker_id, checkpoint_every,
+                      lease_seconds)
+            completed += 1
+        elif _shards(queue_dir, CLAIMED):
+            time.sleep(poll_seconds)
+        else:
+            break
+    return completed
+
+
+def merge_results(queue_dir: str) -> SimulationStats:
+    '''
+    Returns the combined stats of every shard, added in shard order.
+    'elapsed' is the total time spent in shards. Raises ValueError if any
+    shard has no result yet.
+    '''
+    job = load_job(queue_dir)
+    names = [_shard_name(index) for index in range(job.num_shards)]
+    missing = [name for name in names if not os.path.exists(
+        os.path.join(queue_dir, RESULTS, name))]
+    if missing:
+        raise ValueError(f"{len(missing)} of {job.num_shards} shards have "
+                         f"no result yet")
+    combined = SimulationStats()
+    for name in names:
+        stats = SimulationStats(**_read_json(
+            os.path.join(queue_dir, RESULTS, name)))
+        combined.merge(stats)
+        combined.elapsed += stats.elapsed
+    return combined
+
+
+def queue_counts(queue_dir: str) -> dict[str, int]:
+    '''
+    Returns the number of shards pending, claimed and done.
+    '''
+    return {state: len(_shards(queue_dir, state))
+            for state in (PENDING, CLAIMED, DONE)}
+
+
+def main(argv: list[str] | None = None) -> int:
+    '''
+    Entry point for the job queue. Returns the process exit code.
+    '''
+    parser = argparse.ArgumentParser(
+        description='Run a sharded simulation from a shared queue '
+                    'directory.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    create = commands.add_parser('create', help='create a job')
+    create.add_argument('queue')
+    create.add_argument('-n', '--rounds', type=int, required=True)
+    create.add_argument('--shards', type=int, required=True)
+    create.add_argument('-p', '--players', type=int, default=1)
+    create.add_argument('--strategy', default='basic')
+    create.add_argument('--seed', default='')
+    add_rules_arguments(create)
+    worker = commands.add_parser('work', help='run shards until every '
+                                              'shard is done')
+    worker.add_argument('queue')
+    worker.add_argument('--worker-id', default=None)
+    worker.add_argument('--lease', type=float, default=DEFAULT_LEASE_SECONDS,
+                        metavar='SECONDS')
+    worker.add_argument('--checkpoint-every', type=int,
+                        default=DEFAULT_CHECKPOINT_EVERY, metavar='ROUNDS')
+    worker.add_argument('--max-shards', type=int, default=None)
+    worker.add_argument('--poll', type=float, default=DEFAULT_POLL_SECONDS,
+                        metavar='SECONDS',
+                        help='how often to check for stale claims when no '
+                             'shard is pending')
+    for command in ('status', 'merge'):
+        commands.add_parser(command).add_argument('queue')
+    args = parser.parse_args(argv)
+
+    if args.command == 'create':
+        try:
+            job = create_job(args.queue, JobSpec(
+                args.rounds, args.shards, args.players, args.strategy,
+                rules_from_args(args), args.seed))
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+        print(f"Created {job.num_shards} shards of about "
+              f"{job.shard_rounds(0)} rounds with seed {job.seed}")
+    elif args.command == 'work':
+        if args.lease <= 0 or args.poll <= 0 or args.checkpoint_every <= 0:
+            parser.error('--lease, --poll and --checkpoint-every must be '
+                         'positive')
+        completed = work(args.queue, args.worker_id, args.lease,
+                         args.checkpoint_every, args.max_shards, args.poll)
+        print(f"Ran {completed} shards")
+    elif args.command == 'status':
+        counts = queue_counts(args.queue)
+        print("  ".join(f"{state}: {count}"
+                        for state, count in counts.items()))
+    else:
+        try:
+            stats = merge_results(args.queue)
+        except ValueError as error:
+            parser.error(str(error))
+        print_summary(stats)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,406 @@
+'''
+Parallel strategy optimizer for charts and betting ramps.
+Author: Chris Leung
+
+Hill climbing over candidates made of a strategy chart (see
+blackjack_strategy) and a betting ramp. Each generation mutates the current
+best candidate a number of times and races the mutants against it:
+
+* Every candidate is simulated in stages of stage_rounds rounds, all
+  candidates using the same seed for the same stage so that they see the
+  same shoes at the start of each stage.
+* After each stage any candidate whose upper confidence bound on EV falls
+  below the best lower bound is dropped, so weak candidates cost one stage
+  instead of a full evaluation.
+* Stage results are cached by the candidate's compiled chart and ramp. A
+  candidate that comes up again (a mutation that is undone, or the
+  incumbent in the next generation) is never simulated again for a stage it
+  has already played.
+
+Stages of all the candidates still in the race run in parallel in a process
+pool.
+
+A betting ramp is the number of minimum bets to wager at each Hi-Lo true
+count: ramp[0] for true counts of 0 or less, ramp[1] for 1 and so on, with
+the last entry covering every higher count. EV is reported in minimum bets
+per round, per player.
+
+Usage:
+    python blackjack_optimizer.py --generations 20 --population 8 \\
+        --stages 5 --stage-rounds 20000 --seed 1 --output best.json
+'''
+
+import argparse
+import copy
+import json
+import os
+import random
+from dataclasses import dataclass, field
+
+from blackjack_compare import UNLIMITED_BANK
+from blackjack_sim import add_rules_arguments
+from blackjack_sim import Rules
+from blackjack_sim import rules_from_args
+from blackjack_sim import Strategy
+from blackjack_sim import Table
+from blackjack_strategy import BASIC_CHART
+from blackjack_strategy import ChartStrategy
+from blackjack_strategy import compile_chart
+from blackjack_strategy import load_chart
+from blackjack_strategy import PAIR_ACTIONS
+from blackjack_strategy import TOTAL_ACTIONS
+
+HI_LO = {'2': 1, '3': 1, '4': 1, '5': 1, '6': 1, '7': 0, '8': 0, '9': 0,
+         '10': -1, 'J': -1, 'Q': -1, 'K': -1, 'A': -1}
+RAMP_STEPS = 6
+MAX_UNITS = 8
+FLAT_RAMP = (1,) * RAMP_STEPS
+DEFAULT_Z = 2.0
+
+
+class RampTable(Table):
+    '''
+    A Table whose players bet by a ramp on the Hi-Lo true count of the cards
+    seen since the last reshuffle.
+    '''
+
+    def __init__(self, num_players: int, strategy: Strategy,
+                 ramp: tuple[int, ...] = FLAT_RAMP,
+                 rules: Rules | None = None,
+                 rng: random.Random | None = None):
+        super().__init__(num_players, strategy, rules, rng)
+        self.ramp: tuple[int, ...] = ramp
+        self.running_count: int = 0
+        self._counted: int = 0
+        self._reshuffles: int = self.dealer.reshuffles
+
+    def true_count(self) -> float:
+        '''
+        Returns the running count divided by the number of decks left.
+        '''
+        dealer = self.dealer
+        if dealer.reshuffles != self._reshuffles:
+            self.running_count = 0
+            self._counted = 0
+            self._reshuffles = dealer.reshuffles
+        discard = dealer.discard
+        for card in discard[self._counted:]:
+            self.running_count += HI_LO[card.rank]
+        self._counted = len(discard)
+        return self.running_count / max(len(dealer.shoe) / 52, 0.5)
+
+    def bet_size(self) -> int:
+        step = min(max(int(self.true_count()), 0), len(self.ramp) - 1)
+        return self.ramp[step] * self.rules.minimum_bet
+
+
+def _normalize_chart(chart: dict) -> dict:
+    '''
+    Returns a copy of a chart with every row as a list of upper-case cells.
+    '''
+    normalized = {}
+    for table in ('hard', 'soft', 'pairs'):
+        normalized[table] = {
+            player: [str(cell).strip().upper()
+                     for cell in (cells.split() if isinstance(cells, str)
+                                  else cells)]
+            for player, cells in chart.get(table, {}).items()}
+    return normalized
+
+
+@dataclass
+class Candidate:
+    '''
+    A chart and betting ramp to evaluate. 'key' identifies candidates that
+    play identically, whatever the layout of their chart.
+    '''
+    chart: dict
+    ramp: tuple[int, ...] = FLAT_RAMP
+    key: tuple = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.chart = _normalize_chart(self.chart)
+        self.ramp = tuple(self.ramp)
+        self.key = (compile_chart(self.chart), self.ramp)
+
+    def to_json(self) -> dict:
+        '''
+        Returns the candidate as a chart that ChartStrategy can load, with
+        the ramp as an extra key.
+        '''
+        chart = {table: {player: ' '.join(cells)
+                         for player, cells in rows.items()}
+                 for table, rows in self.chart.items()}
+        chart['ramp'] = list(self.ramp)
+        return chart
+
+
+def mutate(candidate: Candidate, rng: random.Random, mutate_chart: bool = True,
+           mutate_ramp: bool = True) -> Candidate:
+    '''
+    Returns a copy of the candidate with one chart cell or one ramp step
+    changed.
+    '''
+    chart = copy.deepcopy(candidate.chart)
+    ramp = list(candidate.ramp)
+    if mutate_chart and (not mutate_ramp or rng.random() < 0.5):
+        table = rng.choice([name for name in ('hard', 'soft', 'pairs')
+                            if chart[name]])
+        cells = chart[table][rng.choice(sorted(chart[table]))]
+        column = rng.randrange(len(cells))
+        allowed = PAIR_ACTIONS if table == 'pairs' else tuple(TOTAL_ACTIONS)
+        cells[column] = rng.choice([action for action in allowed
+                                    if action != cells[column]])
+    elif mutate_ramp:
+        step = rng.randrange(len(ramp))
+        ramp[step] = rng.choice([units for units in (ramp[step] - 1,
+                                                     ramp[step] + 1)
+                                 if 1 <= units <= MAX_UNITS])
+        # Betting less at a higher count is never sensible
+        ramp.sort()
+    return Candidate(chart, tuple(ramp))
+
+
+@dataclass
+class Estimate:
+    '''
+    The EV of a candidate in minimum bets per player per round, over the
+    stages played so far.
+    '''
+    rounds: int = 0
+    mean: float = 0.0
+    standard_error: float = 0.0
+
+    def lower(self, z: float) -> float:
+        '''
+        Returns the lower confidence bound.
+        '''
+        return self.mean - z * self.standard_error
+
+    def upper(self, z: float) -> float:
+        '''
+        Returns the upper confidence bound.
+        '''
+        return self.mean + z * self.standard_error
+
+
+def _play_stage(chart: dict, ramp: tuple[int, ...], num_players: int,
+                rules: Rules, seed: str,
+                rounds: int) -> tuple[int, float, float]:
+    '''
+    Plays one stage of a candidate and returns the number of rounds and the
+    sum and sum of squares of the per-round nets in minimum bets per player.
+    Module-level so that it can be pickled for worker processes.
+    '''
+    table = RampTable(num_players, ChartStrategy(chart), ramp, rules,
+                      random.Random(seed))
+    scale = rules.minimum_bet * num_players
+    total = 0.0
+    squares = 0.0
+    for _ in range(rounds):
+        net_before = table.stats.net
+        table.play_round()
+        net = (table.stats.net - net_before) / scale
+        total += net
+        squares += net * net
+    return rounds, total, squares
+
+
+class Evaluator:
+    '''
+    Races candidates against each other, caching every stage result by
+    candidate key.
+    '''
+
+    def __init__(self, num_players: int = 1, rules: Rules | None = None,
+                 seed: object = None, stages: int = 5,
+                 stage_rounds: int = 20000, z: float = DEFAULT_Z,
+                 pool=None):
+        rules = rules if rules is not None else Rules()
+        # Unlimited banks so that no candidate is cut short by bankruptcy
+        self.rules: Rules = Rules(rules.num_shoe_decks,
+                                  rules.shoe_cut_card_position,
+                                  rules.minimum_bet, UNLIMITED_BANK,
+                                  rules.max_splits)
+        self.num_players: int = num_players
+        self.seed: object = seed
+        self.stages: int = stages
+        self.stage_rounds: int = stage_rounds
+        self.z: float = z
+        self.pool = pool
+        self.cache: dict[tuple, list[tuple[int, float, float]]] = {}
+        self.stages_played: int = 0
+        self.stages_cached: int = 0
+
+    def estimate(self, candidate: Candidate) -> Estimate:
+        '''
+        Returns the estimate from the stages of a candidate played so far.
+        '''
+        results = self.cache.get(candidate.key, [])
+        rounds = sum(result[0] for result in results)
+        if rounds == 0:
+            return Estimate()
+        total = sum(result[1] for result in results)
+        squares = sum(result[2] for result in results)
+        mean = total / rounds
+        variance = (max(squares - total * mean, 0.0) / (rounds - 1)
+                    if rounds > 1 else 0.0)
+        return Estimate(rounds, mean, (variance / rounds) ** 0.5)
+
+    def _play(self, candidates: list[Candidate], stage: int) -> None:
+        tasks = []
+        for candidate in candidates:
+            if len(self.cache.setdefault(candidate.key, [])) > stage:
+                self.stages_cached += 1
+                continue
+            tasks.append(candidate)
+        seed = None if self.seed is None else f"{self.seed}:{stage}"
+        arguments = [(candidate.chart, candidate.ramp, self.num_players,
+                      self.rules, seed, self.stage_rounds)
+                     for candidate in tasks]
+        if self.pool is None:
+            results = [_play_stage(*argument) for argument in arguments]
+        else:
+            results = self.pool.starmap(_play_stage, arguments)
+        for candidate, result in zip(tasks, results):
+            self.cache[candidate.key].append(result)
+            self.stages_played += 1
+
+    def race(self, candidates: list[Candidate]) -> list[Candidate]:
+        '''
+        Plays the candidates stage by stage, dropping those that are
+        confidently worse than the best. Returns the candidates still in the
+        race after the last stage, best first.
+        '''
+        alive = list({candidate.key: candidate
+                      for candidate in candidates}.values())
+        for stage in range(self.stages):
+            self._play(alive, stage)
+            estimates = {candidate.key: self.estimate(candidate)
+                         for candidate in alive}
+            best_lower = max(estimate.lower(self.z)
+                             for estimate in estimates.values())
+            alive = [candidate for candidate in alive
+                     if estimates[candidate.key].upper(self.z) >= best_lower]
+            if len(alive) == 1:
+                break
+        return sorted(alive, key=lambda candidate:
+                      -self.estimate(candidate).mean)
+
+
+@dataclass
+class OptimizationResult:
+    '''
+    The best candidate found, its estimate, and the estimate of the best
+    candidate after each generation.
+    '''
+    best: Candidate
+    estimate: Estimate
+    history: list[Estimate] = field(default_factory=list)
+    stages_played: int = 0
+    stages_cached: int = 0
+
+
+def optimize(generations: int = 20,
+             population: int = 8,
+             start: Candidate | None = None,
+             num_players: int = 1,
+             rules: Rules | None = None,
+             seed: object = None,
+             workers: int = 1,
+             stages: int = 5,
+             stage_rounds: int = 20000,
+             z: float = DEFAULT_Z,
+             mutate_chart: bool = True,
+             mutate_ramp: bool = True) -> OptimizationResult:
+    '''
+    Hill-climbs from the start candidate (basic strategy with a flat bet by
+    default). A mutant replaces the incumbent only if it outlasts it in the
+    race and has the higher mean.
+    '''
+    rng = random.Random(None if seed is None else f"{seed}:search")
+    incumbent = start if start is not None else Candidate(BASIC_CHART)
+    pool = None
+    if workers > 1:
+        import multiprocessing  # pylint: disable=import-outside-toplevel
+
+        pool = multiprocessing.Pool(workers)
+    try:
+        evaluator = Evaluator(num_players, rules, seed, stages,
+                              stage_rounds, z, pool)
+        history = []
+        for _ in range(generations):
+            mutants = [mutate(incumbent, rng, mutate_chart, mutate_ramp)
+                       for _ in range(population)]
+            incumbent = evaluator.race([incumbent] + mutants)[0]
+            history.append(evaluator.estimate(incumbent))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    if not history:
+        evaluator.race([incumbent])
+    return OptimizationResult(incumbent, evaluator.estimate(incumbent),
+                              history, evaluator.stages_played,
+                              evaluator.stages_cached)
+
+
+def main(argv: list[str] | None = None) -> int:
+    '''
+    Entry point for the optimizer. Returns the process exit code.
+    '''
+    parser = argparse.ArgumentParser(
+        description='Search for better strategy charts and betting ramps.')
+    parser.add_argument('--generations', type=int, default=20)
+    parser.add_argument('--population', type=int, default=8)
+    parser.add_argument('--start', metavar='CHART', default=None,
+                        help='.json/.csv chart to start from (default: '
+                             'basic strategy with a flat bet)')
+    parser.add_argument('-p', '--players', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--stages', type=int, default=5)
+    parser.add_argument('--stage-rounds', type=int, default=20000,
+                        metavar='ROUNDS')
+    parser.add_argument('--z', type=float, default=DEFAULT_Z,
+                        help='confidence bound width in standard errors')
+    parser.add_argument('--chart-only', action='store_true',
+                        help='keep the betting ramp flat')
+    parser.add_argument('--ramp-only', action='store_true',
+                        help='keep the chart fixed')
+    parser.add_argument('--output', metavar='PATH', default=None,
+                        help='write the best chart and ramp to PATH as JSON')
+    add_rules_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.chart_only and args.ramp_only:
+        parser.error("--chart-only and --ramp-only cannot be combined")
+
+    start = None
+    if args.start is not None:
+        try:
+            chart = load_chart(args.start)
+            start = Candidate(chart, chart.get('ramp', FLAT_RAMP))
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+    result = optimize(args.generations, args.population, start, args.players,
+                      rules_from_args(args), args.seed, args.workers,
+                      args.stages, args.stage_rounds, args.z,
+                      not args.ramp_only, not args.chart_only)
+
+    for generation, estimate in enumerate(result.history, 1):
+        print(f"Generation {generation}: EV {estimate.mean:+.4f} "
+              f"(std error {estimate.standard_error:.4f}, "
+              f"{estimate.rounds} rounds)")
+    print(f"Best ramp: {' '.join(map(str, result.best.ramp))}")
+    print(f"Best EV: {result.estimate.mean:+.4f} minimum bets per round")
+    print(f"Stages simulated: {result.stages_played}, "
+          f"reused from cache: {result.stages_cached}")
+    if args.output is not None:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(result.best.to_json(), output_file, indent=2)
+            output_file.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
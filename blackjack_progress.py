@@ -0,0 +1,138 @@
+'''
+Live progress reporting for long simulation runs.
+Author: Chris Leung
+
+A ProgressReporter rewrites a small JSON status file each time it is given
+the running stats of a simulation. Simulations sample at most once every N
+rounds (between blocks of Table.run()), so the round loop itself does no
+extra work. The file is replaced atomically and can be watched with, e.g.:
+
+    watch cat status.json
+
+It holds the rounds played and requested, hands, cards dealt, reshuffles,
+the amounts wagered and won, the current house edge estimate, throughput,
+an ETA and the time it was written. A status that stops being updated while
+its state is still "running" means the job has hung or died; a slow job
+keeps updating at a low rate.
+
+With several workers each shard writes its own status file and the parent
+process combines them into the main one (see combine_statuses()).
+'''
+
+import json
+import os
+import time
+
+from blackjack_sim import SimulationStats
+from blackjack_sim import temp_path_for
+
+STATE_RUNNING = 'running'
+STATE_DONE = 'done'
+
+
+def write_status(path: str, status: dict) -> None:
+    '''
+    Writes a status to path as JSON, replacing the file atomically.
+    '''
+    temp_path = temp_path_for(path)
+    with open(temp_path, 'w', encoding='utf-8') as status_file:
+        json.dump(status, status_file, indent=2)
+        status_file.write('\n')
+    os.replace(temp_path, path)
+
+
+def read_status(path: str) -> dict | None:
+    '''
+    Returns the status in path, or None if it has not been written yet.
+    '''
+    try:
+        with open(path, encoding='utf-8') as status_file:
+            return json.load(status_file)
+    except FileNotFoundError:
+        return None
+
+
+def _finish_status(status: dict) -> dict:
+    '''
+    Fills in the figures derived from the totals in a status.
+    '''
+    remaining = max(0, status['total_rounds'] - status['rounds'])
+    rate = status['rounds_per_sec']
+    status['house_edge'] = (-status['net'] / status['wagered']
+                            if status['wagered'] else 0.0)
+    if status['state'] == STATE_DONE:
+        status['eta_seconds'] = 0.0
+    else:
+        status['eta_seconds'] = remaining / rate if rate > 0 else None
+    status['updated'] = time.time()
+    return status
+
+
+class ProgressReporter:
+    '''
+    Turns running SimulationStats into status reports for one table.
+    Throughput is measured from when the reporter was created, so a resumed
+    run reports the rate of the current process rather than an average that
+    includes the time it was stopped.
+    '''
+
+    def __init__(self, path: str, total_rounds: int, start_rounds: int = 0):
+        self.path: str = path
+        self.total_rounds: int = total_rounds
+        self.start_rounds: int = start_rounds
+        self.start_time: float = time.perf_counter()
+
+    def status(self, stats: SimulationStats, done: bool = False) -> dict:
+        '''
+        Returns the status for the given running stats.
+        '''
+        elapsed = time.perf_counter() - self.start_time
+        rounds = stats.rounds - self.start_rounds
+        return _finish_status({
+            'state': STATE_DONE if done else STATE_RUNNING,
+            'rounds': stats.rounds,
+            'total_rounds': self.total_rounds,
+            'hands': stats.hands,
+            'cards_dealt': stats.cards_dealt,
+            'reshuffles': stats.reshuffles,
+            'wagered': stats.wagered,
+            'net': stats.net,
+            'elapsed': elapsed,
+            'rounds_per_sec': rounds / elapsed if elapsed > 0 else 0.0,
+        })
+
+    def report(self, stats: SimulationStats, done: bool = False) -> dict:
+        '''
+        Writes and returns the status for the given running stats.
+        '''
+        status = self.status(stats, done)
+        write_status(self.path, status)
+        return status
+
+
+def combine_statuses(statuses: list[dict | None],
+                     total_rounds: int) -> dict:
+    '''
+    Combines the statuses of concurrently running shards into one. Shards
+    that have not reported yet count as running with nothing played.
+    '''
+    combined = {'state': STATE_DONE, 'rounds': 0,
+                'total_rounds': total_rounds, 'hands': 0, 'cards_dealt': 0,
+                'reshuffles': 0, 'wagered': 0, 'net': 0, 'elapsed': 0.0,
+                'rounds_per_sec': 0.0}
+    running_rate = 0.0
+    for status in statuses:
+        if status is None or status['state'] != STATE_DONE:
+            combined['state'] = STATE_RUNNING
+        if status is None:
+            continue
+        for key in ('rounds', 'hands', 'cards_dealt', 'reshuffles',
+                    'wagered', 'net', 'rounds_per_sec'):
+            combined[key] += status[key]
+        combined['elapsed'] = max(combined['elapsed'], status['elapsed'])
+        if status['state'] != STATE_DONE:
+            running_rate += status['rounds_per_sec']
+    if combined['state'] == STATE_RUNNING:
+        # Finished shards no longer bring the remaining rounds any closer
+        combined['rounds_per_sec'] = running_rate
+    return _finish_status(combined)
@@ -0,0 +1,210 @@
+'''
+Differential terminal rendering for the interactive game.
+Author: Chris Leung
+
+A TableDisplay keeps the dealer's hand and every player's bank, bets and
+hands in a panel at the top of the terminal. The game's messages and prompts
+scroll in the region below it. After every card the panel is rendered again
+into a model of its lines, and only the characters that differ from what is
+already on screen are sent, positioned with ANSI escape sequences. Dealing a
+card typically sends a dozen bytes instead of a whole reprinted hand, which
+matters on terminals at the end of slow SSH links.
+
+Player lines that do not fit the width wrap onto indented continuation
+lines, and the panel grows to hold them (it never shrinks during a game, so
+the scrolling region does not jump). A terminal too short for the panel and
+MIN_SCROLL_ROWS rows of messages gets no panel: see panel_fits().
+
+Nothing here spawns a process: clearing the screen is an escape sequence
+too.
+'''
+
+import shutil
+import sys
+from typing import TextIO
+
+from blackjack_2026 import CLEAR_SCREEN
+from blackjack_2026 import Dealer
+from blackjack_2026 import Player
+from blackjack_2026 import SCREEN_WIDTH
+
+_CSI = '\x1b['
+CLEAR_TO_END_OF_LINE = _CSI + 'K'
+SAVE_CURSOR = '\x1b7'
+RESTORE_CURSOR = '\x1b8'
+RESET_SCROLL_REGION = _CSI + 'r'
+# Rows kept below the panel for the game's messages and prompts
+MIN_SCROLL_ROWS = 3
+_CONTINUATION_INDENT = '    '
+
+
+def move_to(row: int, column: int) -> str:
+    '''
+    Returns the escape sequence that moves the cursor to a (0-based) row and
+    column.
+    '''
+    return f"{_CSI}{row + 1};{column + 1}H"
+
+
+def set_scroll_region(top: int, bottom: int) -> str:
+    '''
+    Returns the escape sequence that limits scrolling to the (0-based,
+    inclusive) rows from top to bottom.
+    '''
+    return f"{_CSI}{top + 1};{bottom + 1}r"
+
+
+class DiffRenderer:
+    '''
+    Keeps a model of the lines on screen from row top down, and turns new
+    lines into the output that changes only the characters that differ.
+    Lines are cut to width.
+    '''
+
+    def __init__(self, top: int = 0, width: int = SCREEN_WIDTH):
+        self.top: int = top
+        self.width: int = width
+        self.lines: list[str] = []
+
+    def diff(self, lines: list[str]) -> str:
+        '''
+        Returns the output that changes the screen from the current lines to
+        the given ones, and makes them the current lines.
+        '''
+        lines = [line[:self.width] for line in lines]
+        output = []
+        for row in range(max(len(lines), len(self.lines))):
+            new = lines[row] if row < len(lines) else ''
+            old = self.lines[row] if row < len(self.lines) else ''
+            if new == old:
+                continue
+            start = 0
+            while (start < min(len(new), len(old)) and
+                   new[start] == old[start]):
+                start += 1
+            end = len(new)
+            if len(new) == len(old):
+                # Nothing after the last difference moves
+                while new[end-1] == old[end-1]:
+                    end -= 1
+            output.append(move_to(self.top + row, start))
+            output.append(new[start:end])
+            if len(new) < len(old):
+                output.append(CLEAR_TO_END_OF_LINE)
+        self.lines = lines
+        return ''.join(output)
+
+
+def _wrap(prefix: str, items: list[str], width: int) -> list[str]:
+    '''
+    Returns the prefix followed by the items, two spaces apart, starting an
+    indented continuation line whenever the next item would pass width.
+    '''
+    lines = [prefix]
+    separator = ' '
+    for item in items:
+        if len(lines[-1]) + len(separator) + len(item) > width:
+            lines.append(_CONTINUATION_INDENT + item)
+        else:
+            lines[-1] += separator + item
+        separator = '  '
+    return lines
+
+
+def table_lines(dealer: Dealer, players: list[Player],
+                width: int = SCREEN_WIDTH) -> list[str]:
+    '''
+    Returns the lines of the table panel: the dealer's hand, then each
+    player's bank and hands with their bets, wrapped to width.
+    '''
+    lines = [" Table ".center(width, "-"), f"Dealer: {dealer.hand}"]
+    for player in players:
+        lines += _wrap(f"{player} ${player.bank}:",
+                       [f"{hand} ${hand.bet}" for hand in player.hands],
+                       width)
+    lines.append("-" * width)
+    return lines
+
+
+def panel_fits(num_players: int, rows: int | None = None) -> bool:
+    '''
+    Returns whether a terminal of the given number of rows (by default the
+    current terminal's) has room for the table panel of num_players and
+    MIN_SCROLL_ROWS rows of messages below it.
+    '''
+    if rows is None:
+        rows = shutil.get_terminal_size().lines
+    return num_players + 3 + MIN_SCROLL_ROWS <= rows
+
+
+class TableDisplay:
+    '''
+    The table panel at the top of the terminal, above a scrolling region for
+    everything else the game prints. Call update() whenever the table
+    changes and close() at the end of the game. Raises ValueError if the
+    terminal is too short for the panel (see panel_fits()).
+    '''
+
+    def __init__(self, num_players: int, stream: TextIO | None = None,
+                 width: int = SCREEN_WIDTH, rows: int | None = None):
+        self.stream: TextIO = stream if stream is not None else sys.stdout
+        self.width: int = width
+        self.rows: int = (rows if rows is not None
+                          else shutil.get_terminal_size().lines)
+        if not panel_fits(num_players, self.rows):
+            raise ValueError(f"{self.rows} rows are too few for a table of "
+                             f"{num_players} players")
+        # Header, dealer, one line per player and a closing rule, to start
+        self.height: int = num_players + 3
+        self.renderer: DiffRenderer = DiffRenderer(0, width)
+        self.bytes_written: int = 0
+        self._write(CLEAR_SCREEN +
+                    set_scroll_region(self.height, self.rows - 1) +
+                    move_to(self.height, 0))
+
+    def _write(self, output: str) -> None:
+        self.stream.write(output)
+        self.stream.flush()
+        self.bytes_written += len(output.encode())
+
+    def update(self, dealer: Dealer, players: list[Player]) -> None:
+        '''
+        Redraws the parts of the panel that changed, leaving the cursor where
+        it was in the scrolling region.
+        '''
+        lines = table_lines(dealer, players, self.width)
+        if len(lines) > self.height:
+            self._grow(min(len(lines), self.rows - MIN_SCROLL_ROWS))
+        # Players who left the table leave blank lines; on a terminal too
+        # short for every wrapped line the last ones are cut
+        lines = lines[:self.height]
+        lines += [''] * (self.height - len(lines))
+        changes = self.renderer.diff(lines)
+        if changes:
+            self._write(SAVE_CURSOR + changes + RESTORE_CURSOR)
+
+    def _grow(self, height: int) -> None:
+        '''
+        Moves the top of the scrolling region down to make the panel height
+        rows tall. The rows taken from the scrolling region are cleared and
+        the cursor continues from the bottom of the screen.
+        '''
+        if height <= self.height:
+            return
+        cleared = ''.join(move_to(row, 0) + CLEAR_TO_END_OF_LINE
+                          for row in range(self.height, height))
+        self.height = height
+        self._write(set_scroll_region(height, self.rows - 1) + cleared +
+                    move_to(self.rows - 1, 0))
+
+    def close(self) -> None:
+        '''
+        Gives the whole screen back to scrolling output.
+        '''
+        self._write(RESET_SCROLL_REGION + move_to(self.rows - 1, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,159 @@
+'''
+Columnar per-hand results export with memory-mapped readers.
+Author: Chris Leung
+
+A ResultWriter is attached to a simulation Table as its recorder and buffers
+one row per settled hand. Every chunk_rows rows it writes a chunk directory
+holding one .npy file per column:
+
+    results/chunk-00000/round.npy
+    results/chunk-00000/seat.npy
+    ...
+
+A ResultReader memory-maps those files, so analysis reads only the columns
+and chunks it touches instead of parsing printed output.
+
+Outcome codes are the OUTCOME_* constants in blackjack_sim.
+'''
+
+import os
+import shutil
+
+import numpy as np
+
+COLUMNS = (
+    ('round', np.int64),
+    ('seat', np.int32),
+    ('hand', np.int8),
+    ('initial_bet', np.int64),
+    ('final_bet', np.int64),
+    ('player_total', np.int8),
+    ('dealer_total', np.int8),
+    ('outcome', np.int8),
+    ('bank_after', np.int64),
+)
+COLUMN_NAMES = tuple(name for name, _ in COLUMNS)
+DEFAULT_CHUNK_ROWS = 1 << 16
+
+
+class ResultWriter:
+    '''
+    Buffers per-hand results in memory and writes them to directory one
+    chunk at a time. Call close() (or use it as a context manager) to write
+    the last partial chunk. With chunk_rows of 0 chunks are only written by
+    explicit calls to flush().
+    '''
+
+    def __init__(self, directory: str, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        self.directory: str = directory
+        self.chunk_rows: int = chunk_rows
+        self.rows: list[tuple] = []
+        os.makedirs(directory, exist_ok=True)
+        # Only this writer's own chunks: subdirectories may hold the shards
+        # of an earlier run with several workers
+        self.next_chunk: int = len(_chunk_directories(directory, False))
+
+    def record(self, round_number: int, seat: int, hand_index: int,
+               initial_bet: int, final_bet: int, player_total: int,
+               dealer_total: int, outcome: int, bank_after: int) -> None:
+        '''
+        Buffers one settled hand, writing a chunk when the buffer is full.
+        '''
+        self.rows.append((round_number, seat, hand_index, initial_bet,
+                          final_bet, player_total, dealer_total, outcome,
+                          bank_after))
+        if 0 < self.chunk_rows <= len(self.rows):
+            self.flush()
+
+    def flush(self) -> None:
+        '''
+        Writes any buffered rows as a new chunk. The chunk directory is
+        renamed into place once complete, so readers never see half a chunk.
+        '''
+        if not self.rows:
+            return
+        columns = list(zip(*self.rows))
+        name = f"chunk-{self.next_chunk:05d}"
+        temp_path = os.path.join(self.directory, f".{name}.tmp")
+        os.makedirs(temp_path, exist_ok=True)
+        for (column, dtype), values in zip(COLUMNS, columns):
+            np.save(os.path.join(temp_path, f"{column}.npy"),
+                    np.array(values, dtype=dtype))
+        os.replace(temp_path, os.path.join(self.directory, name))
+        self.next_chunk += 1
+        self.rows.clear()
+
+    def discard_from_round(self, round_number: int) -> None:
+        '''
+        Deletes chunks that start at or after the given round, e.g. rounds
+        played after the checkpoint a simulation is resuming from.
+        '''
+        for path in _chunk_directories(self.directory, False):
+            rounds = np.load(os.path.join(path, 'round.npy'), mmap_mode='r')
+            if len(rounds) and rounds[0] >= round_number:
+                shutil.rmtree(path)
+        self.next_chunk = len(_chunk_directories(self.directory, False))
+
+    def close(self) -> None:
+        '''
+        Writes the final partial chunk.
+        '''
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _chunk_directories(directory: str, recursive: bool = True) -> list[str]:
+    '''
+    Returns the chunk directories under directory in order, including those
+    in subdirectories (e.g. one per shard) unless recursive is False.
+    '''
+    if not recursive:
+        return sorted(entry.path for entry in os.scandir(directory)
+                      if entry.is_dir() and entry.name.startswith('chunk-'))
+    chunks = []
+    for root, directories, _ in os.walk(directory):
+        directories.sort()
+        chunks.extend(os.path.join(root, name) for name in directories
+                      if name.startswith('chunk-'))
+    return sorted(chunks)
+
+
+class ResultReader:
+    '''
+    Reads the chunks under a results directory (including those written by
+    separate shards in subdirectories) as memory-mapped arrays.
+    '''
+
+    def __init__(self, directory: str):
+        self.directory: str = directory
+        self.chunk_paths: list[str] = _chunk_directories(directory)
+
+    def chunks(self, columns: tuple[str, ...] = COLUMN_NAMES):
+        '''
+        Yields one dict per chunk mapping each requested column name to a
+        read-only memory-mapped array.
+        '''
+        for path in self.chunk_paths:
+            yield {column: np.load(os.path.join(path, f"{column}.npy"),
+                                   mmap_mode='r')
+                   for column in columns}
+
+    def column(self, name: str) -> np.ndarray:
+        '''
+        Returns a whole column across all chunks. A single chunk is returned
+        as its memory map; several chunks are concatenated into memory.
+        '''
+        arrays = [chunk[name] for chunk in self.chunks((name,))]
+        if len(arrays) == 1:
+            return arrays[0]
+        if not arrays:
+            return np.empty(0, dtype=dict(COLUMNS)[name])
+        return np.concatenate(arrays)
+
+    def __len__(self):
+        return sum(len(chunk['round']) for chunk in self.chunks(('round',)))
@@ -0,0 +1,212 @@
+'''
+Shared-memory pool of pre-shuffled shoes for multiprocess simulations.
+Author: Chris Leung
+
+A producer shuffles a large batch of shoes at once with NumPy and publishes
+them as a (num_shoes, cards_per_shoe) uint8 array in
+multiprocessing.shared_memory. Workers attach to the pool by name and deal
+straight from their slice of it, so no process shuffles privately and no
+card lists are pickled between processes. Because the shoes are fixed up
+front, several strategies can be played against exactly the same cards.
+
+Cards are encoded as rank index * 4 + suit index (see CARD_RANKS and
+CARD_SUITS), and each row is stored in dealing order.
+'''
+
+import random
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from blackjack_2026 import Card
+from blackjack_2026 import CARD_RANKS
+from blackjack_2026 import CARD_SUITS
+from blackjack_2026 import Dealer
+from blackjack_2026 import NUM_SHOE_DECKS
+from blackjack_sim import Rules
+from blackjack_sim import SimulationStats
+from blackjack_sim import get_strategy
+from blackjack_sim import Table
+
+CODE_CARDS = tuple((rank, suit) for rank in CARD_RANKS for suit in CARD_SUITS)
+
+
+class ShoePool:
+    '''
+    A block of shared memory holding pre-shuffled shoes. The creating
+    process owns the block and should unlink() it when every worker is done.
+    '''
+
+    def __init__(self, memory: shared_memory.SharedMemory, num_shoes: int,
+                 cards_per_shoe: int):
+        self.memory = memory
+        self.shoes: np.ndarray = np.ndarray((num_shoes, cards_per_shoe),
+                                            dtype=np.uint8, buffer=memory.buf)
+
+    @classmethod
+    def create(cls, num_shoes: int, num_shoe_decks: int = NUM_SHOE_DECKS,
+               seed: int | None = None) -> 'ShoePool':
+        '''
+        Allocates a new pool and fills it with independently shuffled shoes.
+        '''
+        cards_per_shoe = num_shoe_decks * len(CODE_CARDS)
+        memory = shared_memory.SharedMemory(
+            create=True, size=max(1, num_shoes * cards_per_shoe))
+        pool = cls(memory, num_shoes, cards_per_shoe)
+        pool.shoes[:] = np.tile(np.arange(len(CODE_CARDS), dtype=np.uint8),
+                                num_shoe_decks)
+        np.random.default_rng(seed).permuted(pool.shoes, axis=1,
+                                             out=pool.shoes)
+        return pool
+
+    @classmethod
+    def attach(cls, name: str, num_shoes: int,
+               cards_per_shoe: int) -> 'ShoePool':
+        '''
+        Attaches to a pool created by another process.
+        '''
+        try:
+            memory = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Before Python 3.13 attaching always registers the block with the
+            # resource tracker. Pool workers share their parent's tracker, so
+            # the block is still only unlinked once, by the creator.
+            memory = shared_memory.SharedMemory(name=name)
+        return cls(memory, num_shoes, cards_per_shoe)
+
+    def spec(self) -> tuple[str, int, int]:
+        '''
+        Returns the arguments a worker passes to attach().
+        '''
+        return (self.memory.name, *self.shoes.shape)
+
+    def close(self) -> None:
+        '''
+        Detaches this process from the pool.
+        '''
+        del self.shoes
+        self.memory.close()
+
+    def unlink(self) -> None:
+        '''
+        Frees the shared memory. Only the creating process should call this.
+        '''
+        self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class PooledDealer(Dealer):
+    '''
+    A Dealer that takes a fresh pre-shuffled shoe from a pool at each
+    reshuffle instead of shuffling the discard pile. Once the shoes run out
+    'exhausted' is set and the last shoe is kept.
+
+    If the shoe runs out mid-round the discard pile is shuffled in with
+    'rng' as usual, since the cards in play cannot be returned.
+    '''
+
+    def __init__(self, shoes: np.ndarray, shoe_cut_card_position: int,
+                 rng: random.Random | None = None):
+        super().__init__(0, shoe_cut_card_position, rng)
+        self.shoes: np.ndarray = shoes
+        self.next_shoe: int = 0
+        self.exhausted: bool = False
+        self._load_next_shoe()
+
+    def _load_next_shoe(self) -> None:
+        if self.next_shoe >= len(self.shoes):
+            self.exhausted = True
+            return
+        # Dealer deals from the end of the list
+        codes = self.shoes[self.next_shoe].tolist()
+        self.shoe = [Card(*CODE_CARDS[code]) for code in reversed(codes)]
+        self.discard.clear()
+        self.next_shoe += 1
+
+    def reshuffle_shoe_if_needed(self) -> None:
+        '''
+        Replaces the shoe with the next one from the pool if the cut card has
+        been reached.
+        '''
+        if self.drew_cut_card:
+            self._load_next_shoe()
+            self.drew_cut_card = self.exhausted
+            self.reshuffles += not self.exhausted
+
+
+def _play_shoes(shoes: np.ndarray, num_players: int, strategy_name: str,
+                rules: Rules, seed: object) -> SimulationStats:
+    '''
+    Plays one table through the given shoes and returns its stats.
+    '''
+    dealer = PooledDealer(shoes, rules.shoe_cut_card_position,
+                          random.Random(seed))
+    table = Table(num_players, get_strategy(strategy_name), rules,
+                  dealer=dealer)
+    while table.players and not dealer.exhausted:
+        table.play_round()
+    return table.stats
+
+
+def _play_pool_shard(spec: tuple[str, int, int], start: int, stop: int,
+                     num_players: int, strategy_name: str,
+                     rules: Rules, seed: object) -> SimulationStats:
+    '''
+    Attaches to a pool from a worker process and plays shoes [start, stop).
+    '''
+    pool = ShoePool.attach(*spec)
+    try:
+        return _play_shoes(pool.shoes[start:stop], num_players,
+                           strategy_name, rules, seed)
+    finally:
+        pool.close()
+
+
+def simulate_pool(num_shoes: int,
+                  num_players: int = 1,
+                  strategy_names: tuple[str, ...] = ('basic',),
+                  rules: Rules | None = None,
+                  seed: int | None = None,
+                  workers: int = 1) -> dict[str, SimulationStats]:
+    '''
+    Generates num_shoes shoes into a shared pool and plays every strategy
+    through all of them, splitting the shoes into one contiguous slice per
+    worker. Returns the combined stats for each strategy; 'elapsed' is the
+    wall time of the whole run.
+    '''
+    rules = rules if rules is not None else Rules()
+    start_time = time.perf_counter()
+    pool = ShoePool.create(num_shoes, rules.num_shoe_decks, seed)
+    try:
+        tasks = []
+        for strategy_name in strategy_names:
+            for index in range(workers):
+                start = num_shoes * index // workers
+                stop = num_shoes * (index + 1) // workers
+                shard_seed = None if seed is None else f"{seed}:{index}"
+                tasks.append((pool.spec(), start, stop, num_players,
+                              strategy_name, rules, shard_seed))
+        if workers <= 1:
+            results = [_play_shoes(pool.shoes[task[1]:task[2]], *task[3:])
+                       for task in tasks]
+        else:
+            # pylint: disable-next=import-outside-toplevel
+            import multiprocessing
+            with multiprocessing.Pool(workers) as process_pool:
+                results = process_pool.starmap(_play_pool_shard, tasks)
+    finally:
+        pool.close()
+        pool.unlink()
+
+    combined = {name: SimulationStats() for name in strategy_names}
+    for task, stats in zip(tasks, results):
+        combined[task[4]].merge(stats)
+    for stats in combined.values():
+        stats.elapsed = time.perf_counter() - start_time
+    return combined
@@ -0,0 +1,114 @@
+'''
+Background shoe preparation for the Dealer.
+Author: Chris Leung
+
+A PreparedShoeDealer shuffles its next shoe in a background thread while
+the current one is still being dealt. When the cut card comes out,
+reshuffle_shoe_if_needed() swaps in the prepared shoe, which takes constant
+time, and the thread starts on the one after it. Busy tables see no pause
+for the shuffle between rounds.
+
+The prepared shoes are shuffled with their own generator, seeded once from
+the dealer's generator when the dealer is created. The nth prepared shoe is
+always the nth shuffle of that generator, so a seeded dealer deals the same
+cards whatever the thread timing.
+
+If a round runs through the entire shoe, deal_one() still shuffles the
+discard pile in place with the dealer's own generator, as the cards in play
+cannot be part of a prepared shoe.
+
+If the preparing thread stops (it failed, or the dealer was closed), the
+next reshuffle raises RuntimeError, from the thread's exception if it had
+one, instead of waiting forever for a shoe.
+'''
+
+import queue
+import random
+import threading
+
+from blackjack_2026 import Card
+from blackjack_2026 import Deck
+from blackjack_2026 import Dealer
+
+# How often the preparing thread checks whether the dealer has closed
+_POLL_SECONDS = 0.1
+
+
+class PreparedShoeDealer(Dealer):
+    '''
+    A Dealer whose reshuffles swap in a shoe shuffled ahead of time by a
+    background thread. Call close() (or use it as a context manager) to stop
+    the thread.
+    '''
+
+    def __init__(self, num_shoe_decks: int, shoe_cut_card_position: int,
+                 rng: random.Random | None = None):
+        super().__init__(num_shoe_decks, shoe_cut_card_position, rng)
+        self.num_shoe_decks: int = num_shoe_decks
+        self.prepare_rng: random.Random = random.Random(
+            self.rng.getrandbits(64))
+        self._prepared: queue.Queue[list[Card]] = queue.Queue(maxsize=1)
+        self._closed = threading.Event()
+        self._error: Exception | None = None
+        self._thread = threading.Thread(target=self._prepare_shoes,
+                                        name='shoe-preparation', daemon=True)
+        self._thread.start()
+
+    def _prepare_shoes(self) -> None:
+        '''
+        Keeps one shuffled shoe ready until the dealer is closed. An
+        exception stops the thread and is kept for reshuffle_shoe_if_needed()
+        to report.
+        '''
+        try:
+            while not self._closed.is_set():
+                shoe = []
+                for _ in range(self.num_shoe_decks):
+                    shoe.extend(Deck().cards)
+                self.prepare_rng.shuffle(shoe)
+                while not self._closed.is_set():
+                    try:
+                        self._prepared.put(shoe, timeout=_POLL_SECONDS)
+                        break
+                    except queue.Full:
+                        continue
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            self._error = error
+
+    def _next_shoe(self) -> list[Card]:
+        '''
+        Returns the prepared shoe, waiting for it while the thread runs.
+        Raises RuntimeError if the thread has stopped without one.
+        '''
+        while True:
+            try:
+                return self._prepared.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                if not self._thread.is_alive():
+                    raise RuntimeError("Shoe preparation has stopped") \
+                        from self._error
+
+    def reshuffle_shoe_if_needed(self) -> None:
+        '''
+        Replaces the shoe with the prepared one if the cut card has been
+        reached. Every card has been discarded at the end of a round, so the
+        prepared shoe holds the same cards.
+        '''
+        if self.drew_cut_card:
+            self.shoe = self._next_shoe()
+            self.discard.clear()
+            self.drew_cut_card = False
+            self.reshuffles += 1
+
+    def close(self) -> None:
+        '''
+        Stops the preparing thread.
+        '''
+        self._closed.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
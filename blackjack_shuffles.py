@@ -0,0 +1,253 @@
+'''
+Realistic shuffle models for the Dealer.
+Author: Chris Leung
+
+A perfect random.shuffle() is not what a dealer does. This module models the
+procedures used at real tables as permutations of integer-coded shoes,
+vectorized with NumPy over a whole batch of shoes (one shoe per row, the top
+of the shoe first):
+
+* riffle: a Gilbert-Shannon-Reeds riffle. The cut is binomial and each card
+  drops from a packet with probability proportional to the packet's size.
+* strip: the shoe is cut into packets near evenly spaced points, and the
+  packets are stacked in reverse order.
+* box: the shoe is cut into packets that are placed round-robin onto a
+  number of piles, and the piles are stacked.
+
+A ShuffleProcedure chains steps, e.g. "riffle*2,strip,riffle". It can
+generate thousands of shoes a second with generate_shoes(), or shuffle a
+ShuffleModelDealer's cards in play. A poorly mixing procedure leaves cards
+near their neighbors from the previous shoe, which is what shuffle trackers
+exploit. exposure() measures how much of that order survives.
+
+Usage:
+    python blackjack_shuffles.py --procedure riffle*3,strip,riffle
+'''
+
+import argparse
+import random
+import time
+from typing import Callable
+
+import numpy as np
+
+from blackjack_2026 import Dealer
+from blackjack_2026 import NUM_SHOE_DECKS
+from blackjack_2026 import thread_rng
+from blackjack_shoepool import CODE_CARDS
+
+# A shuffle step permutes each row of a batch of shoes
+ShuffleStep = Callable[[np.ndarray, np.random.Generator], np.ndarray]
+
+DEFAULT_PROCEDURE = 'riffle*3,strip,riffle'
+# Standard deviation of a dealer's cut points from where they aim, in cards
+CUT_SD = 4.0
+
+
+def riffle(shoes: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    '''
+    Returns the shoes after one Gilbert-Shannon-Reeds riffle each.
+    '''
+    # Choosing which positions the top packet lands in uniformly at random
+    # is the GSR model: the number of them (the cut) is binomial, and every
+    # interleaving of the two packets is equally likely
+    from_bottom = rng.integers(0, 2, shoes.shape, dtype=np.uint8)
+    destinations = np.argsort(from_bottom, axis=1, kind='stable')
+    riffled = np.empty_like(shoes)
+    np.put_along_axis(riffled, destinations, shoes, axis=1)
+    return riffled
+
+
+def _packet_shuffle(shoes: np.ndarray, rng: np.random.Generator,
+                    num_packets: int, num_piles: int,
+                    cut_sd: float) -> np.ndarray:
+    '''
+    Cuts each shoe into num_packets packets near evenly spaced points and
+    places them in turn on top of num_piles piles, then stacks the piles
+    with the first on top.
+    '''
+    num_shoes, num_cards = shoes.shape
+    aims = np.arange(1, num_packets) * num_cards / num_packets
+    cuts = np.sort(np.clip(
+        np.rint(aims + rng.normal(0.0, cut_sd, (num_shoes, num_packets - 1))),
+        0, num_cards).astype(np.int64), axis=1)
+    positions = np.arange(num_cards)
+    packets = (positions[None, :, None] >= cuts[:, None, :]).sum(axis=2)
+    piles = packets % num_piles
+    # Later packets go on top of earlier ones in the same pile; a packet's
+    # cards keep their order
+    keys = ((piles * num_packets + num_packets - 1 - packets) * num_cards +
+            positions)
+    return np.take_along_axis(shoes, np.argsort(keys, axis=1), axis=1)
+
+
+def strip(shoes: np.ndarray, rng: np.random.Generator,
+          num_packets: int = 6, cut_sd: float = CUT_SD) -> np.ndarray:
+    '''
+    Returns the shoes after a strip cut into num_packets packets.
+    '''
+    return _packet_shuffle(shoes, rng, num_packets, 1, cut_sd)
+
+
+def box(shoes: np.ndarray, rng: np.random.Generator, num_piles: int = 4,
+        packets_per_pile: int = 2, cut_sd: float = CUT_SD) -> np.ndarray:
+    '''
+    Returns the shoes after a box shuffle onto num_piles piles.
+    '''
+    return _packet_shuffle(shoes, rng, num_piles * packets_per_pile,
+                           num_piles, cut_sd)
+
+
+def perfect(shoes: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    '''
+    Returns the shoes uniformly shuffled, for comparison.
+    '''
+    return rng.permuted(shoes, axis=1)
+
+
+SHUFFLE_STEPS: dict[str, ShuffleStep] = {
+    'riffle': riffle,
+    'strip': strip,
+    'box': box,
+    'perfect': perfect,
+}
+
+
+class ShuffleProcedure:
+    '''
+    A sequence of shuffle steps applied in order. Create one from a spec of
+    comma-separated step names (see SHUFFLE_STEPS), each optionally
+    repeated with *N.
+    '''
+
+    def __init__(self, spec: str = DEFAULT_PROCEDURE):
+        self.spec: str = spec
+        self.steps: list[ShuffleStep] = []
+        for part in spec.split(','):
+            name, _, repeat = part.strip().partition('*')
+            if name not in SHUFFLE_STEPS:
+                raise ValueError(f"Unknown shuffle step '{name}'")
+            try:
+                times = int(repeat) if repeat else 1
+            except ValueError as error:
+                raise ValueError(f"Bad repeat count in '{part}'") from error
+            self.steps.extend([SHUFFLE_STEPS[name]] * times)
+
+    def __call__(self, shoes: np.ndarray,
+                 rng: np.random.Generator) -> np.ndarray:
+        for step in self.steps:
+            shoes = step(shoes, rng)
+        return shoes
+
+
+def generate_shoes(num_shoes: int, procedure: ShuffleProcedure,
+                   num_shoe_decks: int = NUM_SHOE_DECKS,
+                   seed: int | None = None,
+                   start: np.ndarray | None = None) -> np.ndarray:
+    '''
+    Returns a (num_shoes, cards) uint8 array of shoes, coded as in
+    blackjack_shoepool, each shuffled by the procedure from the start order
+    (top first; new decks by default).
+    '''
+    if start is None:
+        start = np.tile(np.arange(len(CODE_CARDS), dtype=np.uint8),
+                        num_shoe_decks)
+    shoes = np.tile(start, (num_shoes, 1))
+    return procedure(shoes, np.random.default_rng(seed))
+
+
+def exposure(procedure: ShuffleProcedure, num_shoes: int = 1000,
+             num_cards: int = NUM_SHOE_DECKS * 52, window: int = 10,
+             seed: int | None = None) -> tuple[float, float]:
+    '''
+    Shuffles num_shoes shoes of num_cards cards and returns how much of the
+    previous order survives: the mean correlation between a card's position
+    before and after, and the fraction of neighboring cards that end up
+    within window positions of each other. For a perfect shuffle these are
+    about 0 and 2 * window / num_cards.
+    '''
+    positions = np.tile(np.arange(num_cards, dtype=np.int32), (num_shoes, 1))
+    before = procedure(positions, np.random.default_rng(seed))
+    # before[shoe, new position] is the old position; invert it
+    after = np.argsort(before, axis=1)
+    centered = after - (num_cards - 1) / 2
+    old = np.arange(num_cards) - (num_cards - 1) / 2
+    correlation = float(((centered * old).sum(axis=1) /
+                         (old * old).sum()).mean())
+    neighbors = np.abs(np.diff(after, axis=1)) <= window
+    return correlation, float(neighbors.mean())
+
+
+class ShuffleModelDealer(Dealer):
+    '''
+    A Dealer whose shuffles follow a ShuffleProcedure rather than
+    random.shuffle(). At a reshuffle the shoe's cards and the discard pile
+    are shuffled together in the order they were collected, as at a real
+    table, so the order of play carries into the next shoe as far as the
+    procedure lets it.
+    '''
+
+    def __init__(self, num_shoe_decks: int, shoe_cut_card_position: int,
+                 rng: random.Random | None = None,
+                 procedure: ShuffleProcedure | None = None):
+        rng = rng if rng is not None else thread_rng()
+        # Set before Dealer.__init__() shuffles the new shoe
+        self.procedure: ShuffleProcedure = (procedure
+                                            if procedure is not None
+                                            else ShuffleProcedure())
+        self.shuffle_rng: np.random.Generator = np.random.default_rng(
+            rng.getrandbits(64))
+        super().__init__(num_shoe_decks, shoe_cut_card_position, rng)
+
+    def shuffle_shoe(self) -> None:
+        '''
+        Applies the procedure to the shoe.
+        '''
+        if not self.shoe:
+            return
+        # The end of the list is the top of the shoe
+        top_first = np.arange(len(self.shoe) - 1, -1, -1)[None, :]
+        order = self.procedure(top_first, self.shuffle_rng)[0]
+        self.shoe = [self.shoe[index] for index in order[::-1].tolist()]
+
+
+def main(argv: list[str] | None = None) -> int:
+    '''
+    Entry point for shuffle benchmarking. Returns the process exit code.
+    '''
+    parser = argparse.ArgumentParser(
+        description='Generate shoes with a shuffle procedure and report the '
+                    'throughput and how much order survives.')
+    parser.add_argument('--procedure', default=DEFAULT_PROCEDURE,
+                        help=f"comma-separated steps from "
+                             f"{', '.join(SHUFFLE_STEPS)}, each optionally "
+                             "repeated with *N")
+    parser.add_argument('--shoes', type=int, default=10000)
+    parser.add_argument('--decks', type=int, default=NUM_SHOE_DECKS)
+    parser.add_argument('--window', type=int, default=10,
+                        help='distance at which neighbors count as together')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+    try:
+        procedure = ShuffleProcedure(args.procedure)
+    except ValueError as error:
+        parser.error(str(error))
+
+    start = time.perf_counter()
+    generate_shoes(args.shoes, procedure, args.decks, args.seed)
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    correlation, together = exposure(procedure, min(args.shoes, 1000),
+                                     args.decks * len(CODE_CARDS),
+                                     args.window, args.seed)
+    print(f"Procedure: {procedure.spec}")
+    print(f"Generated {args.shoes} shoes in {elapsed:.2f}s "
+          f"({args.shoes / elapsed:.0f} shoes/sec)")
+    print(f"Position correlation: {correlation:+.3f}")
+    print(f"Neighbors within {args.window} cards: {together:.1%} "
+          f"(perfect shuffle: "
+          f"{2 * args.window / (args.decks * len(CODE_CARDS)):.1%})")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
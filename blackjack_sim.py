@@ -0,0 +1,698 @@
+'''
+Headless simulator for the blackjack_2026 house rules.
+Author: Chris Leung
+
+Bots play the same round flow as blackjack_2026.main() (bets, deal, player
+blackjack payouts, player hands, dealer hand, resolution, discard, bankrupt
+removal and reshuffle) without any prompts or printing, so that long runs can
+measure throughput and house edge.
+
+Usage:
+    python -m blackjack_2026 simulate --rounds 100000 --players 3 --seed 1
+
+Heavier modules (multiprocessing, checkpointing, NumPy for --shoe-pool,
+--crowd and --results) are imported only by the modes that use them so that
+short jobs start quickly.
+
+With --threads the --workers tables run on a thread pool in this process
+instead of in worker processes. Every table has its own Dealer generator and
+state, and they share the read-only module tables and strategy charts, so
+there is nothing to pickle or copy per worker. Threads only run tables in
+parallel on free-threaded (no-GIL) Python builds, so on other builds the
+command line falls back to worker processes with a warning.
+'''
+
+import argparse
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from dataclasses import dataclass, fields
+
+from blackjack_2026 import Dealer
+from blackjack_2026 import Hand
+from blackjack_2026 import Player
+from blackjack_2026 import can_double_down
+from blackjack_2026 import can_split
+from blackjack_2026 import MAX_SPLITS
+from blackjack_2026 import MINIMUM_BET
+from blackjack_2026 import NUM_SHOE_DECKS
+from blackjack_2026 import PLAYER_STARTING_BANK
+from blackjack_2026 import SHOE_CUT_CARD_POSITION
+from blackjack_strategy import basic_strategy
+from blackjack_strategy import ChartStrategy
+from blackjack_strategy import Strategy
+
+
+# How often simulate() combines shard progress reports, in seconds
+STATUS_POLL_SECONDS = 1.0
+
+# Outcome codes passed to a Table's recorder for each hand
+OUTCOME_LOSS = 0
+OUTCOME_PUSH = 1
+OUTCOME_WIN = 2
+OUTCOME_BLACKJACK = 3
+OUTCOME_BUST = 4
+
+
+@dataclass
+class Rules:
+    '''
+    Table rules for a simulation. Defaults are the blackjack_2026 house rules.
+    '''
+    num_shoe_decks: int = NUM_SHOE_DECKS
+    shoe_cut_card_position: int = SHOE_CUT_CARD_POSITION
+    minimum_bet: int = MINIMUM_BET
+    starting_bank: int = PLAYER_STARTING_BANK
+    max_splits: int = MAX_SPLITS
+
+
+@dataclass
+class SimulationStats:
+    '''
+    Running totals for a simulation. 'wagered' counts initial bets only, so
+    the house edge is expressed per initial bet.
+    '''
+    rounds: int = 0
+    hands: int = 0
+    wagered: int = 0
+    net: int = 0
+    wins: int = 0
+    pushes: int = 0
+    losses: int = 0
+    blackjacks: int = 0
+    cards_dealt: int = 0
+    reshuffles: int = 0
+    elapsed: float = 0.0
+
+    def merge(self, other: 'SimulationStats') -> None:
+        '''
+        Adds the totals of another SimulationStats into this one. Elapsed
+        time is left alone since shards run concurrently.
+        '''
+        for stat in fields(self):
+            if stat.name != 'elapsed':
+                setattr(self, stat.name,
+                        getattr(self, stat.name) + getattr(other, stat.name))
+
+    def house_edge(self) -> float:
+        '''
+        Returns the house edge as a fraction of the initial bets.
+        '''
+        if self.wagered == 0:
+            return 0.0
+        return -self.net / self.wagered
+
+
+def mimic_dealer_strategy(hand: Hand, upcard: int, offer_double_down: bool,
+                          offer_split: bool) -> str:
+    '''
+    Plays like the dealer: hits below 17 and on soft 17, never doubles down
+    or splits.
+    '''
+    total = hand.value()
+    if total < 17 or (total == 17 and hand.is_soft()):
+        return 'h'
+    return 's'
+
+
+STRATEGIES: dict[str, Strategy] = {
+    'basic': basic_strategy,
+    'mimic': mimic_dealer_strategy,
+}
+
+
+def get_strategy(name: str) -> Strategy:
+    '''
+    Returns a built-in strategy by name, or a ChartStrategy for the chart in
+    a .json or .csv file.
+    '''
+    if name in STRATEGIES:
+        return STRATEGIES[name]
+    if name.lower().endswith(('.json', '.csv')):
+        return ChartStrategy.from_file(name)
+    raise ValueError(f"Unknown strategy '{name}'")
+
+
+def temp_path_for(path: str) -> str:
+    '''
+    Returns a temporary path to write before replacing path atomically.
+    The name is unique to this host, process and thread, so writers sharing
+    a directory (or a network share) never write the same temporary file.
+    '''
+    return (f"{path}.{socket.gethostname()}.{os.getpid()}."
+            f"{threading.get_ident()}.tmp")
+
+
+def gil_enabled() -> bool:
+    '''
+    Returns whether the interpreter runs with the GIL, in which case threads
+    take turns rather than running tables in parallel.
+    '''
+    # sys._is_gil_enabled() is new in Python 3.13
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+class Table:
+    '''
+    A headless table: one Dealer and a list of bot Players who all follow the
+    same strategy and bet the minimum every round (subclasses can change the
+    bet by overriding bet_size()).
+    '''
+
+    def __init__(self, num_players: int, strategy: Strategy,
+                 rules: Rules | None = None,
+                 rng: random.Random | None = None,
+                 dealer: Dealer | None = None):
+        self.rules: Rules = rules if rules is not None else Rules()
+        self.strategy: Strategy = strategy
+        if dealer is None:
+            dealer = Dealer(self.rules.num_shoe_decks,
+                            self.rules.shoe_cut_card_position, rng)
+        self.dealer: Dealer = dealer
+        self.players: list[Player] = [
+            Player(number, f"Bot {number}", self.rules.starting_bank)
+            for number in range(1, num_players+1)]
+        self.stats: SimulationStats = SimulationStats()
+        # Optional object whose record() method receives every settled hand:
+        # record(round_number, seat, hand_index, initial_bet, final_bet,
+        #        player_total, dealer_total, outcome, bank_after)
+        self.recorder = None
+        self._initial_bets: list[int] = []
+
+    @classmethod
+    def from_state(cls, strategy: Strategy, rules: Rules, dealer: Dealer,
+                   players: list[Player],
+                   stats: SimulationStats) -> 'Table':
+        '''
+        Returns a table that carries on from a saved dealer, players and
+        running stats (see blackjack_checkpoint).
+        '''
+        table = cls(0, strategy, rules, dealer=dealer)
+        table.players = players
+        table.stats = stats
+        return table
+
+    def run(self, rounds: int) -> SimulationStats:
+        '''
+        Plays up to the given number of rounds, stopping early if every
+        player has been removed from the table. Returns the running stats.
+        '''
+        start = time.perf_counter()
+        for _ in range(rounds):
+            if not self.players:
+                break
+            self.play_round()
+        self.stats.elapsed += time.perf_counter() - start
+        return self.stats
+
+    def play_round(self) -> None:
+        '''
+        Plays one full round, following the same steps as
+        blackjack_2026.main().
+        '''
+        dealer = self.dealer
+        players = self.players
+        stats = self.stats
+        bank_before = 0
+        cards_dealt_before = dealer.cards_dealt
+        reshuffles_before = dealer.reshuffles
+        self._initial_bets.clear()
+        bet = self.bet_size()
+
+        for player in players:
+            bank_before += player.bank
+            initial_hand = Hand()
+            # Every remaining player can afford the minimum bet
+            initial_hand.bet = bet if bet <= player.bank else player.bank
+            player.hands.append(initial_hand)
+            player.bank -= initial_hand.bet
+            stats.wagered += initial_hand.bet
+            self._initial_bets.append(initial_hand.bet)
+
+        dealer.hand.cards.append(dealer.deal_one(False))
+        for player in players:
+            player.hands[0].cards.append(dealer.deal_one(True))
+        dealer.hand.cards.append(dealer.deal_one(True))
+        for player in players:
+            player.hands[0].cards.append(dealer.deal_one(True))
+
+        if not dealer.hand.is_blackjack():
+            self._payout_blackjacks()
+            upcard = dealer.hand.cards[1].value()
+            for player in players:
+                if player.hands[0].bet > 0:
+                    self._play_player(player, upcard)
+            self._play_dealer()
+
+        self._resolve_bets()
+
+        bank_after = 0
+        dealer.discard.extend(dealer.hand.cards)
+        dealer.hand.cards.clear()
+        for player in players:
+            bank_after += player.bank
+            stats.hands += len(player.hands)
+            for hand in player.hands:
+                dealer.discard.extend(hand.cards)
+            player.hands.clear()
+        stats.net += bank_after - bank_before
+        stats.rounds += 1
+
+        self.players = [player for player in players
+                        if player.bank >= self.rules.minimum_bet]
+        dealer.reshuffle_shoe_if_needed()
+        stats.cards_dealt += dealer.cards_dealt - cards_dealt_before
+        stats.reshuffles += dealer.reshuffles - reshuffles_before
+
+    def bet_size(self) -> int:
+        '''
+        Returns the initial bet for every player this round, called once at
+        the start of each round before any cards are dealt.
+        '''
+        return self.rules.minimum_bet
+
+    def _payout_blackjacks(self) -> None:
+        '''
+        Pays 3:2 on any player blackjack, as payout_any_player_blackjacks().
+        '''
+        for player in self.players:
+            initial_hand = player.hands[0]
+            if initial_hand.is_blackjack():
+                player.bank += initial_hand.bet * 3 // 2 + initial_hand.bet
+                initial_hand.bet = 0
+                self.stats.blackjacks += 1
+
+    def _play_player(self, player: Player, upcard: int) -> None:
+        '''
+        Plays each of the player's hands with the table strategy, as
+        play_player_rounds().
+        '''
+        dealer = self.dealer
+        hands = player.hands
+        current_hand_index = 0
+        while current_hand_index < len(hands):
+            hand = hands[current_hand_index]
+            stay = False
+            first_turn = True
+            while not stay:
+                # Automatically hit if we have split
+                if len(hand.cards) == 1:
+                    response = 'auto_hit_split'
+                else:
+                    response = self.strategy(
+                        hand, upcard,
+                        can_double_down(player, hand, first_turn),
+                        can_split(player, hand, len(hands),
+                                  self.rules.max_splits))
+
+                if response == 's':
+                    break
+
+                if response == 'd':
+                    player.bank -= hand.bet
+                    hand.bet *= 2
+                    stay = True
+
+                if response == 'p':
+                    split_hand = Hand()
+                    split_hand.cards.append(hand.cards.pop())
+                    split_hand.bet = hand.bet
+                    player.bank -= hand.bet
+                    hands.append(split_hand)
+
+                hand.cards.append(dealer.deal_one(True))
+                total = hand.value()
+                if total > 21:
+                    # The bet is kept (unlike play_player_rounds()) so the
+                    # recorder can report it; busted hands are never paid
+                    self.stats.losses += 1
+                    stay = True
+                elif total == 21:
+                    stay = True
+
+                if response in ('h', 'd'):
+                    first_turn = False
+
+                if (response in ('p', 'auto_hit_split')
+                        and hand.cards[0].rank == 'A'):
+                    # Split aces are only allowed one card
+                    stay = True
+
+            current_hand_index += 1
+
+    def _play_dealer(self) -> None:
+        '''
+        Plays the dealer's hand (stands on 17, must hit on soft 17 or less),
+        as play_dealer_round().
+        '''
+        hand = self.dealer.hand
+        while (hand.value() < 17 or
+               (hand.value() == 17 and hand.is_soft())):
+            hand.cards.append(self.dealer.deal_one(True))
+
+    def _resolve_bets(self) -> None:
+        '''
+        Settles every remaining bet against the dealer, as
+        resolve_player_bets(), and reports every hand to the recorder.
+        '''
+        stats = self.stats
+        recorder = self.recorder
+        dealer_total = self.dealer.hand.value()
+        dealer_value = 0 if dealer_total > 21 else dealer_total
+        for seat, player in enumerate(self.players):
+            outcomes = []
+            for hand in player.hands:
+                if hand.is_bust():
+                    outcome = OUTCOME_BUST
+                elif hand.bet == 0:
+                    outcome = OUTCOME_BLACKJACK
+                elif hand.value() > dealer_value:
+                    player.bank += hand.bet * 2
+                    stats.wins += 1
+                    outcome = OUTCOME_WIN
+                elif hand.value() == dealer_value:
+                    player.bank += hand.bet
+                    stats.pushes += 1
+                    outcome = OUTCOME_PUSH
+                else:
+                    stats.losses += 1
+                    outcome = OUTCOME_LOSS
+                outcomes.append(outcome)
+            if recorder is None:
+                continue
+            initial_bet = self._initial_bets[seat]
+            for hand_index, (hand, outcome) in enumerate(
+                    zip(player.hands, outcomes)):
+                recorder.record(stats.rounds, player.number, hand_index,
+                                initial_bet, hand.bet or initial_bet,
+                                hand.value(), dealer_total, outcome,
+                                player.bank)
+
+
+def simulate_shard(rounds: int, num_players: int,
+                   strategy: Strategy | str,
+                   rules: Rules, seed: object,
+                   checkpoint_path: str | None = None,
+                   checkpoint_every: int = 0,
+                   results_dir: str | None = None,
+                   status_path: str | None = None,
+                   status_every: int = 0) -> SimulationStats:
+    '''
+    Runs one independent table with the given strategy, or the strategy
+    named (see get_strategy()). Module-level so that it can be pickled for
+    worker processes. With a checkpoint path the table is resumed from that
+    file if it exists and saved to it every checkpoint_every rounds. With a
+    results directory every settled hand is written there in columnar
+    chunks. With a status path a progress report is written there every
+    status_every rounds.
+    '''
+    # pylint: disable=import-outside-toplevel
+    if isinstance(strategy, str):
+        strategy = get_strategy(strategy)
+    table = None
+    if checkpoint_path is not None:
+        import blackjack_checkpoint
+
+        if os.path.exists(checkpoint_path):
+            table = blackjack_checkpoint.load_checkpoint(checkpoint_path,
+                                                         strategy)
+    if table is None:
+        table = Table(num_players, strategy, rules, random.Random(seed))
+
+    writer = None
+    if results_dir is not None:
+        import blackjack_results
+
+        if checkpoint_path is None:
+            writer = blackjack_results.ResultWriter(results_dir)
+        else:
+            # Chunks are only written at checkpoints, so anything written
+            # after the last checkpoint is dropped and played again
+            writer = blackjack_results.ResultWriter(results_dir, 0)
+            writer.discard_from_round(table.stats.rounds)
+        table.recorder = writer
+
+    reporter = None
+    if status_path is not None:
+        import blackjack_progress
+
+        reporter = blackjack_progress.ProgressReporter(
+            status_path, rounds, table.stats.rounds)
+        reporter.report(table.stats)
+
+    # Play in blocks so that checkpoints and progress reports happen between
+    # calls to Table.run() rather than inside the round loop
+    intervals = [every for every, wanted in ((checkpoint_every,
+                                              checkpoint_path),
+                                             (status_every, status_path))
+                 if every > 0 and wanted is not None]
+    block = min(intervals, default=max(1, rounds))
+    next_checkpoint = table.stats.rounds + (checkpoint_every
+                                            if checkpoint_every > 0
+                                            else rounds)
+    while table.stats.rounds < rounds and table.players:
+        table.run(min(block, rounds - table.stats.rounds))
+        finished = table.stats.rounds >= rounds or not table.players
+        if checkpoint_path is not None and (
+                finished or table.stats.rounds >= next_checkpoint):
+            if writer is not None:
+                writer.flush()
+            blackjack_checkpoint.save_checkpoint(table, checkpoint_path)
+            next_checkpoint = table.stats.rounds + checkpoint_every
+        if reporter is not None and not finished:
+            reporter.report(table.stats)
+    if writer is not None:
+        writer.close()
+    if reporter is not None:
+        reporter.report(table.stats, done=True)
+    return table.stats
+
+
+def simulate(rounds: int,
+             num_players: int = 1,
+             strategy_name: str = 'basic',
+             rules: Rules | None = None,
+             seed: object = None,
+             workers: int = 1,
+             checkpoint_path: str | None = None,
+             checkpoint_every: int = 0,
+             results_dir: str | None = None,
+             status_path: str | None = None,
+             status_every: int = 0,
+             threads: bool = False) -> SimulationStats:
+    '''
+    Simulates the given number of rounds and returns the combined stats. With
+    more than one worker the rounds are split across independent tables in a
+    process pool (or a thread pool with threads), each seeded from the base
+    seed and its shard index.
+
+    With a checkpoint path, progress is saved every checkpoint_every rounds
+    (one file per shard) and a rerun with the same arguments resumes from the
+    saved state, giving the same results as an uninterrupted run.
+
+    With a results directory every settled hand is exported in columnar
+    chunks (see blackjack_results), in one subdirectory per shard.
+
+    With a status path a JSON progress report is rewritten every
+    status_every rounds (see blackjack_progress). Shards report to their own
+    files, which this process combines into status_path while it waits.
+    '''
+    rules = rules if rules is not None else Rules()
+    start = time.perf_counter()
+    if workers <= 1:
+        stats = simulate_shard(rounds, num_players, strategy_name, rules,
+                               seed, checkpoint_path, checkpoint_every,
+                               results_dir, status_path, status_every)
+    else:
+        # pylint: disable=import-outside-toplevel
+        import multiprocessing
+        from multiprocessing.pool import ThreadPool
+
+        if threads:
+            # The threads share one strategy object
+            pool_class = ThreadPool
+            strategy = get_strategy(strategy_name)
+        else:
+            pool_class = multiprocessing.Pool
+            strategy = strategy_name
+        shards = []
+        for index in range(workers):
+            shard_rounds = rounds // workers + (index < rounds % workers)
+            shard_seed = None if seed is None else f"{seed}:{index}"
+            shard_checkpoint = (None if checkpoint_path is None
+                                else f"{checkpoint_path}.{index}")
+            # Padded so that readers list the shards in order
+            shard_results = (None if results_dir is None
+                             else os.path.join(results_dir,
+                                               f"shard-{index:05d}"))
+            shard_status = (None if status_path is None
+                            else f"{status_path}.{index}")
+            shards.append((shard_rounds, num_players, strategy, rules,
+                           shard_seed, shard_checkpoint, checkpoint_every,
+                           shard_results, shard_status, status_every))
+        with pool_class(workers) as pool:
+            pending = pool.starmap_async(simulate_shard, shards)
+            if status_path is not None:
+                import blackjack_progress
+
+                shard_statuses = [shard[8] for shard in shards]
+                while True:
+                    pending.wait(STATUS_POLL_SECONDS)
+                    blackjack_progress.write_status(
+                        status_path, blackjack_progress.combine_statuses(
+                            [blackjack_progress.read_status(path)
+                             for path in shard_statuses], rounds))
+                    if pending.ready():
+                        break
+            results = pending.get()
+        stats = SimulationStats()
+        for result in results:
+            stats.merge(result)
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def print_summary(stats: SimulationStats) -> None:
+    '''
+    Prints the throughput and results of a simulation.
+    '''
+    elapsed = max(stats.elapsed, 1e-9)
+    print(f"Simulated {stats.rounds} rounds ({stats.hands} hands) "
+          f"in {stats.elapsed:.2f}s")
+    print(f"Throughput: {stats.rounds / elapsed:.0f} rounds/sec, "
+          f"{stats.hands / elapsed:.0f} hands/sec")
+    print(f"Wins: {stats.wins}  Pushes: {stats.pushes}  "
+          f"Losses: {stats.losses}  Blackjacks: {stats.blackjacks}")
+    print(f"Wagered: ${stats.wagered}  Net: ${stats.net}  "
+          f"House edge: {stats.house_edge():.3%}")
+    print(f"Cards dealt: {stats.cards_dealt}  "
+          f"Reshuffles: {stats.reshuffles}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    '''
+    Returns the argument parser for the simulate command.
+    '''
+    parser = argparse.ArgumentParser(
+        prog='python -m blackjack_2026 simulate',
+        description='Simulate blackjack rounds with bot players.')
+    parser.add_argument('-n', '--rounds', type=int, default=10000)
+    parser.add_argument('-p', '--players', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--strategy', default='basic',
+                        help=f"one of {', '.join(sorted(STRATEGIES))}, or "
+                             "a .json/.csv strategy chart")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--threads', action='store_true',
+                        help='run the --workers tables on threads in this '
+                             'process instead of worker processes (for '
+                             'free-threaded Python builds)')
+    parser.add_argument('--compare', nargs='+', default=[], metavar='STRATEGY',
+                        help='play these strategies on the same shoes as '
+                             '--strategy and report the paired difference')
+    parser.add_argument('--shoe-pool', type=int, default=0, metavar='SHOES',
+                        help='play SHOES pre-shuffled shared-memory shoes '
+                             'instead of --rounds (needs NumPy)')
+    parser.add_argument('--crowd', action='store_true',
+                        help='seat all --players at one struct-of-arrays '
+                             'table; for thousands of seats (needs NumPy '
+                             'and a chart strategy)')
+    parser.add_argument('--checkpoint', metavar='PATH', default=None,
+                        help='save progress to PATH and resume from it')
+    parser.add_argument('--checkpoint-every', type=int, default=10000,
+                        metavar='ROUNDS')
+    parser.add_argument('--results', metavar='DIR', default=None,
+                        help='write every settled hand to DIR as columnar '
+                             '.npy chunks (needs NumPy)')
+    parser.add_argument('--status', metavar='PATH', default=None,
+                        help='keep a JSON progress report (throughput, '
+                             'house edge, ETA) up to date in PATH')
+    parser.add_argument('--status-every', type=int, default=10000,
+                        metavar='ROUNDS')
+    add_rules_arguments(parser)
+    return parser
+
+
+def add_rules_arguments(parser: argparse.ArgumentParser) -> None:
+    '''
+    Adds the table rules options to a parser. See rules_from_args().
+    '''
+    rules = parser.add_argument_group('rules')
+    rules.add_argument('--decks', type=int, default=NUM_SHOE_DECKS)
+    rules.add_argument('--cut-card', type=int, default=SHOE_CUT_CARD_POSITION)
+    rules.add_argument('--minimum-bet', type=int, default=MINIMUM_BET)
+    rules.add_argument('--bank', type=int, default=PLAYER_STARTING_BANK)
+    rules.add_argument('--max-splits', type=int, default=MAX_SPLITS)
+
+
+def rules_from_args(args: argparse.Namespace) -> Rules:
+    '''
+    Returns the Rules given by the options from add_rules_arguments().
+    '''
+    return Rules(num_shoe_decks=args.decks,
+                 shoe_cut_card_position=args.cut_card,
+                 minimum_bet=args.minimum_bet,
+                 starting_bank=args.bank,
+                 max_splits=args.max_splits)
+
+
+def main(argv: list[str] | None = None) -> int:
+    '''
+    Entry point for the simulate command. Returns the process exit code.
+    '''
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    for name in [args.strategy] + args.compare:
+        try:
+            get_strategy(name)
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+    rules = rules_from_args(args)
+    if args.compare:
+        # pylint: disable-next=import-outside-toplevel
+        import blackjack_compare
+
+        names = [args.strategy] + args.compare
+        result = blackjack_compare.compare_strategies(
+            args.rounds, {name: get_strategy(name) for name in names},
+            args.players, rules, args.seed)
+        blackjack_compare.print_comparison(result)
+        return 0
+    if args.shoe_pool:
+        # pylint: disable-next=import-outside-toplevel
+        import blackjack_shoepool
+
+        stats = blackjack_shoepool.simulate_pool(
+            args.shoe_pool, args.players, (args.strategy,), rules, args.seed,
+            args.workers)[args.strategy]
+    elif args.crowd:
+        # pylint: disable-next=import-outside-toplevel
+        import blackjack_crowd
+
+        try:
+            stats = blackjack_crowd.simulate_crowd(
+                args.rounds, args.players, get_strategy(args.strategy),
+                rules, args.seed)
+        except ValueError as error:
+            parser.error(str(error))
+    else:
+        threads = args.threads
+        if threads and args.workers > 1 and gil_enabled():
+            print("--threads needs a free-threaded Python build to run "
+                  "tables in parallel; using worker processes instead",
+                  file=sys.stderr)
+            threads = False
+        stats = simulate(args.rounds, args.players, args.strategy, rules,
+                         args.seed, args.workers, args.checkpoint,
+                         args.checkpoint_every, args.results, args.status,
+                         args.status_every, threads)
+    print_summary(stats)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
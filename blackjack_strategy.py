@@ -0,0 +1,236 @@
+'''
+Strategy charts for bots, compiled to flat lookup tables.
+Author: Chris Leung
+
+A chart has three tables, each with one row per player hand and one column
+per dealer upcard (2 through 10, then A):
+
+* hard: rows are hard totals
+* soft: rows are soft totals
+* pairs: rows are the rank of the pair ('2' through '10', then 'A')
+
+Hard and soft cells are one of:
+    H   Hit
+    S   Stay
+    D   Double down if allowed, otherwise hit
+    Ds  Double down if allowed, otherwise stay
+Pair cells are P (split) or N (don't split, play the hand by its total).
+
+A hard or soft total without a row uses the nearest lower row (or the lowest
+row if there is none), so for example a '17' row also covers hard 18 to 21.
+
+Charts can be written as JSON:
+    {"hard": {"12": "H H S S S H H H H H", ...}, "soft": {...},
+     "pairs": {...}}
+or as CSV with a header row:
+    table,player,2,3,4,5,6,7,8,9,10,A
+    hard,12,H,H,S,S,S,H,H,H,H,H
+
+ChartStrategy compiles a chart once into a flat tuple indexed by hand state,
+dealer upcard and whether doubling down is offered, so every decision is a
+single index operation. It respects the offer_double_down and offer_split
+conditions computed by blackjack_2026.play_player_rounds().
+'''
+
+import csv
+import json
+from typing import Callable
+
+from blackjack_2026 import Hand
+
+# A strategy receives the hand being played, the value of the dealer upcard
+# (as in CARD_RANK_VALUES, so an ace is 1) and whether doubling down and
+# splitting are offered. It returns 'h', 's', 'p' or 'd' just like
+# blackjack_2026.hit_stay_split_or_dd().
+Strategy = Callable[[Hand, int, bool, bool], str]
+
+UPCARDS = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'A')
+PAIRS = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'A')
+TOTAL_ACTIONS = {'H': ('h', 'h'), 'S': ('s', 's'), 'D': ('h', 'd'),
+                 'DS': ('s', 'd')}
+PAIR_ACTIONS = ('P', 'N')
+
+# Rows of the lookup table: hard totals are indexed by total, soft totals by
+# SOFT_ROW + total and pairs by PAIR_ROW + card value (an ace is 1)
+SOFT_ROW = 32
+PAIR_ROW = 64
+NUM_ROWS = PAIR_ROW + 11
+NUM_UPCARDS = 11  # Indexed by upcard value 1-10; 0 is unused
+
+BASIC_CHART = {
+    'hard': {
+        '8': 'H H H H H H H H H H',
+        '9': 'H D D D D H H H H H',
+        '10': 'D D D D D D D D H H',
+        '11': 'D D D D D D D D D D',
+        '12': 'H H S S S H H H H H',
+        '13': 'S S S S S H H H H H',
+        '14': 'S S S S S H H H H H',
+        '15': 'S S S S S H H H H H',
+        '16': 'S S S S S H H H H H',
+        '17': 'S S S S S S S S S S',
+    },
+    'soft': {
+        '12': 'H H H H H H H H H H',
+        '13': 'H H H D D H H H H H',
+        '14': 'H H H D D H H H H H',
+        '15': 'H H D D D H H H H H',
+        '16': 'H H D D D H H H H H',
+        '17': 'H D D D D H H H H H',
+        '18': 'Ds Ds Ds Ds Ds S S H H H',
+        '19': 'S S S S Ds S S S S S',
+        '20': 'S S S S S S S S S S',
+    },
+    'pairs': {
+        '2': 'P P P P P P N N N N',
+        '3': 'P P P P P P N N N N',
+        '4': 'N N N P P N N N N N',
+        '5': 'N N N N N N N N N N',
+        '6': 'P P P P P N N N N N',
+        '7': 'P P P P P P N N N N',
+        '8': 'P P P P P P P P P P',
+        '9': 'P P P P P N P P N N',
+        '10': 'N N N N N N N N N N',
+        'A': 'P P P P P P P P P P',
+    },
+}
+
+
+class ChartError(ValueError):
+    '''
+    Raised when a strategy chart is malformed.
+    '''
+
+
+def _upcard_value(upcard: str) -> int:
+    return 1 if upcard == 'A' else int(upcard)
+
+
+def _parse_row(table: str, player: str, cells: object,
+               allowed: tuple[str, ...]) -> list[str]:
+    if isinstance(cells, str):
+        cells = cells.split()
+    cells = [str(cell).strip().upper() for cell in cells]
+    if len(cells) != len(UPCARDS):
+        raise ChartError(f"{table} {player}: expected {len(UPCARDS)} "
+                         f"columns, got {len(cells)}")
+    for cell in cells:
+        if cell not in allowed:
+            raise ChartError(f"{table} {player}: unknown action '{cell}'")
+    return cells
+
+
+def _total_rows(chart: dict, table: str) -> dict[int, list[str]]:
+    rows = {}
+    for player, cells in chart.get(table, {}).items():
+        try:
+            total = int(player)
+        except ValueError as error:
+            raise ChartError(f"{table}: '{player}' is not a total") from error
+        rows[total] = _parse_row(table, player, cells, tuple(TOTAL_ACTIONS))
+    if not rows:
+        raise ChartError(f"Chart has no {table} table")
+    return rows
+
+
+def _row_for_total(rows: dict[int, list[str]], total: int) -> list[str]:
+    lower = [row for row in rows if row <= total]
+    return rows[max(lower) if lower else min(rows)]
+
+
+def compile_chart(chart: dict) -> tuple[str, ...]:
+    '''
+    Compiles a chart into a flat lookup table. The action for a hand is at
+    index (row * NUM_UPCARDS + upcard value) * 2 + offer_double_down.
+    '''
+    hard = _total_rows(chart, 'hard')
+    soft = _total_rows(chart, 'soft')
+    pairs = {}
+    for player, cells in chart.get('pairs', {}).items():
+        if player not in PAIRS:
+            raise ChartError(f"pairs: '{player}' is not a rank")
+        pairs[_upcard_value(player)] = _parse_row('pairs', player, cells,
+                                                  PAIR_ACTIONS)
+
+    table = ['h'] * (NUM_ROWS * NUM_UPCARDS * 2)
+
+    def fill(row: int, cells: list[str]) -> None:
+        for upcard, cell in zip(UPCARDS, cells):
+            index = (row * NUM_UPCARDS + _upcard_value(upcard)) * 2
+            table[index:index+2] = TOTAL_ACTIONS[cell]
+
+    for total in range(4, 22):
+        fill(total, _row_for_total(hard, total))
+    for total in range(12, 22):
+        fill(SOFT_ROW + total, _row_for_total(soft, total))
+    for value in range(1, 11):
+        # Pairs that are not split are played by their total
+        total_row = SOFT_ROW + 12 if value == 1 else value * 2
+        for upcard in range(1, NUM_UPCARDS):
+            index = (total_row * NUM_UPCARDS + upcard) * 2
+            pair_index = ((PAIR_ROW + value) * NUM_UPCARDS + upcard) * 2
+            table[pair_index:pair_index+2] = table[index:index+2]
+        for upcard, cell in zip(UPCARDS, pairs.get(value, ())):
+            if cell == 'P':
+                index = ((PAIR_ROW + value) * NUM_UPCARDS +
+                         _upcard_value(upcard)) * 2
+                table[index:index+2] = ('p', 'p')
+    return tuple(table)
+
+
+def load_chart(path: str) -> dict:
+    '''
+    Reads a chart from a .json or .csv file.
+    '''
+    if path.lower().endswith('.json'):
+        with open(path, encoding='utf-8') as chart_file:
+            chart = json.load(chart_file)
+        if not isinstance(chart, dict):
+            raise ChartError(f"{path}: expected a JSON object")
+        return chart
+
+    chart = {'hard': {}, 'soft': {}, 'pairs': {}}
+    with open(path, newline='', encoding='utf-8') as chart_file:
+        reader = csv.reader(chart_file)
+        header = [cell.strip() for cell in next(reader, [])]
+        if tuple(header[2:]) != UPCARDS:
+            raise ChartError(f"{path}: header must be table,player,"
+                             f"{','.join(UPCARDS)}")
+        for line in reader:
+            if not line or not ''.join(line).strip():
+                continue
+            table, player, *cells = (cell.strip() for cell in line)
+            if table not in chart:
+                raise ChartError(f"{path}: unknown table '{table}'")
+            chart[table][player] = cells
+    return chart
+
+
+class ChartStrategy:
+    '''
+    A Strategy that plays from a compiled chart.
+    '''
+
+    def __init__(self, chart: dict):
+        self.table: tuple[str, ...] = compile_chart(chart)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'ChartStrategy':
+        '''
+        Returns a ChartStrategy for the chart in a .json or .csv file.
+        '''
+        return cls(load_chart(path))
+
+    def __call__(self, hand: Hand, upcard: int, offer_double_down: bool,
+                 offer_split: bool) -> str:
+        if offer_split:
+            row = PAIR_ROW + hand.cards[0].value()
+        else:
+            # pylint: disable-next=protected-access
+            total, is_soft = hand._evaluate()
+            row = SOFT_ROW + total if is_soft else total
+        return self.table[(row * NUM_UPCARDS + upcard) * 2 +
+                          offer_double_down]
+
+
+basic_strategy = ChartStrategy(BASIC_CHART)
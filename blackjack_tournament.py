@@ -0,0 +1,346 @@
+'''
+Multi-table bot tournaments across a process pool.
+Author: Chris Leung
+
+Each table is a Dealer and a list of bot Players playing the blackjack_2026
+rules, with every seat following its own strategy. Tables play a fixed number
+of rounds or until remove_bankrupt_players() would empty them, and the final
+banks of every bot are ranked on a leaderboard.
+
+Tables differ a lot in cost (more seats, more splits, more reshuffles), so
+tables are not split statically between workers. Instead every table plays
+in segments of a few thousand rounds. Whenever a worker becomes free the
+scheduler hands it the next segment of the table with the most estimated
+time left, using the time measured for that table's previous segments. An
+idle worker therefore picks up work from whichever table is behind, and no
+core waits on a single long table while others are still queued.
+
+Every table has its own seeded generator, so the results do not depend on
+the number of workers or the order in which segments ran.
+
+Usage:
+    python blackjack_tournament.py --tables 32 --seats 5 --rounds 20000 \\
+        --entrants basic mimic chart.json --seed 1
+'''
+
+import argparse
+import heapq
+import os
+import queue
+import random
+import time
+from dataclasses import dataclass, field
+
+from blackjack_2026 import Player
+from blackjack_sim import add_rules_arguments
+from blackjack_sim import get_strategy
+from blackjack_sim import Rules
+from blackjack_sim import rules_from_args
+from blackjack_sim import SimulationStats
+from blackjack_sim import Strategy
+from blackjack_sim import Table
+
+DEFAULT_SEGMENT_ROUNDS = 2000
+
+
+class TournamentTable(Table):
+    '''
+    A Table whose seats each follow their own strategy, and which remembers
+    the players it has removed and the round in which they went broke.
+    '''
+
+    def __init__(self, strategies: list[Strategy], rules: Rules | None = None,
+                 rng: random.Random | None = None):
+        super().__init__(len(strategies), strategies[0], rules, rng)
+        self.seat_strategies: dict[int, Strategy] = {
+            player.number: strategy
+            for player, strategy in zip(self.players, strategies)}
+        self.seated: list[Player] = self.players[:]
+        self.eliminated: dict[int, int] = {}
+
+    def play_round(self) -> None:
+        '''
+        Plays one round, noting any players removed at the end of it.
+        '''
+        num_players = len(self.players)
+        super().play_round()
+        if len(self.players) < num_players:
+            remaining = {player.number for player in self.players}
+            for player in self.seated:
+                if (player.number not in remaining and
+                        player.number not in self.eliminated):
+                    self.eliminated[player.number] = self.stats.rounds
+
+    def _play_player(self, player: Player, upcard: int) -> None:
+        self.strategy = self.seat_strategies[player.number]
+        super()._play_player(player, upcard)
+
+
+@dataclass
+class Standing:
+    '''
+    One bot's result. 'rounds' is the number of rounds it played before it
+    was removed from its table or the tournament ended.
+    '''
+    name: str
+    strategy: str
+    table: int
+    bank: int
+    rounds: int
+    eliminated: bool
+
+
+@dataclass
+class StrategyStanding:
+    '''
+    The combined result of every bot playing one strategy.
+    '''
+    strategy: str
+    bots: int = 0
+    survivors: int = 0
+    total_bank: int = 0
+    total_rounds: int = 0
+
+    def mean_bank(self) -> float:
+        '''
+        Returns the mean final bank of the strategy's bots.
+        '''
+        return self.total_bank / self.bots if self.bots else 0.0
+
+
+@dataclass
+class TournamentResult:
+    '''
+    The leaderboards of a tournament: every bot ranked by final bank, and
+    every strategy ranked by the mean final bank of its bots.
+    '''
+    standings: list[Standing] = field(default_factory=list)
+    strategies: list[StrategyStanding] = field(default_factory=list)
+    stats: SimulationStats = field(default_factory=SimulationStats)
+
+
+def _play_segment(index: int, table: TournamentTable,
+                  rounds: int) -> tuple[int, TournamentTable, float]:
+    '''
+    Plays up to the given number of rounds of one table. Module-level so
+    that it can be pickled for worker processes.
+    '''
+    start = time.perf_counter()
+    table.run(rounds)
+    return index, table, time.perf_counter() - start
+
+
+class _Scheduler:
+    '''
+    Tracks the tables of a tournament and decides which one to play next.
+    '''
+
+    def __init__(self, tables: list[TournamentTable], rounds: int,
+                 segment_rounds: int):
+        self.tables = tables
+        self.rounds = rounds
+        self.segment_rounds = segment_rounds
+        # Measured seconds per round of each table, and per seat over all
+        self.round_seconds: dict[int, float] = {}
+        self.seat_seconds: float = 1.0
+        self.ready: list[tuple[float, int]] = []
+        for index in range(len(tables)):
+            self.push(index)
+
+    def remaining_rounds(self, index: int) -> int:
+        '''
+        Returns how many more rounds a table has to play.
+        '''
+        table = self.tables[index]
+        if not table.players:
+            return 0
+        return self.rounds - table.stats.rounds
+
+    def push(self, index: int) -> None:
+        '''
+        Queues a table's next segment, unless it has finished.
+        '''
+        remaining = self.remaining_rounds(index)
+        if remaining <= 0:
+            return
+        round_seconds = self.round_seconds.get(
+            index, self.seat_seconds * len(self.tables[index].players))
+        # Most estimated time left first
+        heapq.heappush(self.ready, (-remaining * round_seconds, index))
+
+    def next_segment(self) -> tuple[int, TournamentTable, int]:
+        '''
+        Removes and returns the next segment to play.
+        '''
+        _, index = heapq.heappop(self.ready)
+        return (index, self.tables[index],
+                min(self.segment_rounds, self.remaining_rounds(index)))
+
+    def finish_segment(self, index: int, table: TournamentTable,
+                       rounds_before: int, seconds: float) -> None:
+        '''
+        Stores a table returned by a segment and requeues it.
+        '''
+        played = table.stats.rounds - rounds_before
+        if played > 0:
+            self.round_seconds[index] = seconds / played
+            measured = [self.round_seconds[i] /
+                        max(1, len(self.tables[i].seated))
+                        for i in self.round_seconds]
+            self.seat_seconds = sum(measured) / len(measured)
+        self.tables[index] = table
+        self.push(index)
+
+
+def _schedule(tables: list[TournamentTable], rounds: int, workers: int,
+              segment_rounds: int) -> list[TournamentTable]:
+    '''
+    Plays every table to the end, running up to 'workers' segments at once.
+    Returns the finished tables in their original order.
+    '''
+    scheduler = _Scheduler(tables, rounds, segment_rounds)
+    if workers <= 1:
+        while scheduler.ready:
+            index, table, segment = scheduler.next_segment()
+            rounds_before = table.stats.rounds
+            _, table, seconds = _play_segment(index, table, segment)
+            scheduler.finish_segment(index, table, rounds_before, seconds)
+        return scheduler.tables
+
+    import multiprocessing  # pylint: disable=import-outside-toplevel
+
+    # Segments are handed out one at a time as workers become free, rather
+    # than queued up front, so that each choice uses the latest timings
+    done: queue.Queue = queue.Queue()
+    in_flight: dict[int, int] = {}
+    with multiprocessing.Pool(workers) as pool:
+        while scheduler.ready or in_flight:
+            while scheduler.ready and len(in_flight) < workers:
+                index, table, segment = scheduler.next_segment()
+                in_flight[index] = table.stats.rounds
+                pool.apply_async(_play_segment, (index, table, segment),
+                                 callback=done.put,
+                                 error_callback=done.put)
+            result = done.get()
+            if isinstance(result, BaseException):
+                raise result
+            index, table, seconds = result
+            scheduler.finish_segment(index, table, in_flight.pop(index),
+                                     seconds)
+    return scheduler.tables
+
+
+def _leaderboards(tables: list[TournamentTable],
+                  names: list[list[str]]) -> TournamentResult:
+    result = TournamentResult()
+    by_strategy: dict[str, StrategyStanding] = {}
+    for index, (table, table_names) in enumerate(zip(tables, names)):
+        result.stats.merge(table.stats)
+        for player, strategy_name in zip(table.seated, table_names):
+            eliminated = player.number in table.eliminated
+            rounds = table.eliminated.get(player.number, table.stats.rounds)
+            result.standings.append(Standing(player.name, strategy_name,
+                                             index, player.bank, rounds,
+                                             eliminated))
+            standing = by_strategy.setdefault(
+                strategy_name, StrategyStanding(strategy_name))
+            standing.bots += 1
+            standing.survivors += not eliminated
+            standing.total_bank += player.bank
+            standing.total_rounds += rounds
+    result.standings.sort(key=lambda standing: (-standing.bank,
+                                                -standing.rounds))
+    result.strategies = sorted(by_strategy.values(),
+                               key=lambda standing: -standing.mean_bank())
+    return result
+
+
+def run_tournament(num_tables: int,
+                   seats: int,
+                   rounds: int,
+                   entrants: list[str],
+                   rules: Rules | None = None,
+                   seed: object = None,
+                   workers: int = 1,
+                   segment_rounds: int = DEFAULT_SEGMENT_ROUNDS
+                   ) -> TournamentResult:
+    '''
+    Plays a tournament of num_tables tables with the given number of seats
+    each, for up to the given number of rounds. Seats are filled with the
+    entrant strategies (built-in names or chart files) in turn, continuing
+    from table to table. Table i is seeded from the base seed and i.
+    '''
+    rules = rules if rules is not None else Rules()
+    strategies = {name: get_strategy(name) for name in entrants}
+    tables = []
+    names = []
+    for index in range(num_tables):
+        table_names = [entrants[(index * seats + seat) % len(entrants)]
+                       for seat in range(seats)]
+        table_seed = None if seed is None else f"{seed}:{index}"
+        table = TournamentTable([strategies[name] for name in table_names],
+                                rules, random.Random(table_seed))
+        for player, name in zip(table.players, table_names):
+            player.name = f"{name} {index + 1}.{player.number}"
+        tables.append(table)
+        names.append(table_names)
+
+    start = time.perf_counter()
+    tables = _schedule(tables, rounds, workers, max(1, segment_rounds))
+    result = _leaderboards(tables, names)
+    result.stats.elapsed = time.perf_counter() - start
+    return result
+
+
+def print_leaderboards(result: TournamentResult, top: int = 10) -> None:
+    '''
+    Prints the strategy leaderboard and the top bots.
+    '''
+    print("Strategies:")
+    for place, standing in enumerate(result.strategies, 1):
+        print(f"{place:>3}. {standing.strategy}: mean bank "
+              f"${standing.mean_bank():.2f}, {standing.survivors} of "
+              f"{standing.bots} bots still seated")
+    print(f"Top {min(top, len(result.standings))} bots:")
+    for place, standing in enumerate(result.standings[:top], 1):
+        status = (f"out after {standing.rounds} rounds"
+                  if standing.eliminated else f"{standing.rounds} rounds")
+        print(f"{place:>3}. {standing.name}: ${standing.bank} ({status})")
+    stats = result.stats
+    elapsed = max(stats.elapsed, 1e-9)
+    print(f"Played {stats.rounds} rounds in {stats.elapsed:.2f}s "
+          f"({stats.rounds / elapsed:.0f} rounds/sec)")
+
+
+def main(argv: list[str] | None = None) -> int:
+    '''
+    Entry point for the tournament command. Returns the process exit code.
+    '''
+    parser = argparse.ArgumentParser(
+        description='Play a multi-table tournament between bot strategies.')
+    parser.add_argument('--tables', type=int, default=8)
+    parser.add_argument('--seats', type=int, default=5)
+    parser.add_argument('-n', '--rounds', type=int, default=10000)
+    parser.add_argument('--entrants', nargs='+', default=['basic', 'mimic'],
+                        metavar='STRATEGY')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--segment-rounds', type=int,
+                        default=DEFAULT_SEGMENT_ROUNDS, metavar='ROUNDS')
+    parser.add_argument('--top', type=int, default=10)
+    add_rules_arguments(parser)
+    args = parser.parse_args(argv)
+    for name in args.entrants:
+        try:
+            get_strategy(name)
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+    result = run_tournament(args.tables, args.seats, args.rounds,
+                            args.entrants, rules_from_args(args), args.seed,
+                            args.workers, args.segment_rounds)
+    print_leaderboards(result, args.top)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
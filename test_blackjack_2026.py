@@ -4,11 +4,19 @@ By Chris Leung
 January 9, 2026
 '''
 
+import contextlib
+import io
+import random
+import threading
 import unittest
+from blackjack_2026 import can_split
 from blackjack_2026 import Card
 from blackjack_2026 import Deck
 from blackjack_2026 import Hand
 from blackjack_2026 import Dealer
+from blackjack_2026 import Player
+from blackjack_2026 import remove_bankrupt_players
+from blackjack_2026 import thread_rng
 
 
 class TestBlackjack2026(unittest.TestCase):
@@ -195,6 +203,15 @@ class TestBlackjack2026(unittest.TestCase):
         dealer.deal_one()
         self.assertEqual(len(dealer.shoe), 51)
 
+    def test_dealer_counts_cards_and_reshuffles(self):
+        dealer = Dealer(1, 52)
+        for _ in range(52):
+            dealer.discard.append(dealer.deal_one())
+        dealer.deal_one()  # Empty shoe: reshuffles the discard pile
+        dealer.reshuffle_shoe_if_needed()
+        self.assertEqual(dealer.cards_dealt, 53)
+        self.assertEqual(dealer.reshuffles, 2)
+
     def test_deal_one_face_up(self):
         dealer = Dealer(1, 52)
         card = dealer.deal_one(True)
@@ -230,6 +247,45 @@ class TestBlackjack2026(unittest.TestCase):
         dealer.reveal_blackjack()
         self.assertTrue(dealer.hand.cards[0].face_up)
 
+    def test_seeded_dealers_deal_same_cards(self):
+        first = Dealer(1, 52, random.Random(42))
+        second = Dealer(1, 52, random.Random(42))
+        self.assertEqual([str(card) for card in first.shoe],
+                         [str(card) for card in second.shoe])
+
+    def test_unseeded_dealers_use_their_threads_generator(self):
+        dealer = Dealer(1, 52)
+        self.assertIs(dealer.rng, thread_rng())
+        other = []
+        thread = threading.Thread(
+            target=lambda: other.append(Dealer(1, 52).rng))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], dealer.rng)
+
+    '''
+    Eligibility tests
+    '''
+
+    def test_can_split_equal_values(self):
+        player = Player(1, "Test", 100)
+        hand = Hand()
+        hand.bet = 15
+        hand.cards.append(Card('K', 'Spades'))
+        hand.cards.append(Card('10', 'Hearts'))
+        self.assertTrue(can_split(player, hand, 1))
+        self.assertFalse(can_split(player, hand, 4))
+        player.bank = 10
+        self.assertFalse(can_split(player, hand, 1))
+
+    def test_remove_bankrupt_players_keeps_order(self):
+        players = [Player(number, "Test", bank)
+                   for number, bank in enumerate((100, 5, 15, 0, 30), 1)]
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            remove_bankrupt_players(players, 15)
+        self.assertEqual([player.number for player in players], [1, 3, 5])
+        self.assertEqual(output.getvalue().count("removed"), 2)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,79 @@
+'''
+Unit tests for blackjack_advisor.py
+'''
+
+import random
+import unittest
+from blackjack_2026 import Card
+from blackjack_2026 import Dealer
+from blackjack_2026 import Hand
+from blackjack_advisor import Advisor
+from blackjack_advisor import composition_of
+from blackjack_advisor import unseen_composition
+
+
+def make_hand(*ranks):
+    hand = Hand()
+    for rank in ranks:
+        hand.cards.append(Card(rank, 'Spades', True))
+    return hand
+
+
+def single_deck_without(*values):
+    counts = [4] * 9 + [16]
+    for value in values:
+        counts[value-1] -= 1
+    return tuple(counts)
+
+
+class TestBlackjackAdvisor(unittest.TestCase):
+
+    def test_composition_of_counts_values(self):
+        cards = [Card('A', 'Spades'), Card('K', 'Hearts'), Card('10', 'Clubs')]
+        self.assertEqual(composition_of(cards),
+                         (1, 0, 0, 0, 0, 0, 0, 0, 0, 2))
+
+    def test_unseen_composition_includes_hole_card(self):
+        dealer = Dealer(1, 10, random.Random(1))
+        dealer.hand.cards.append(dealer.deal_one(False))
+        dealer.hand.cards.append(dealer.deal_one(True))
+        self.assertEqual(sum(unseen_composition(dealer)), 51)
+
+    def test_doubles_eleven_against_six(self):
+        advice = Advisor().advise(single_deck_without(6, 5, 6),
+                                  make_hand('6', '5'), 6, True, False)
+        self.assertEqual(advice.action, 'd')
+        self.assertGreater(advice.evs['d'], advice.evs['h'])
+
+    def test_stands_on_twenty(self):
+        advice = Advisor().advise(single_deck_without(10, 10, 7),
+                                  make_hand('K', 'Q'), 7, True, True)
+        self.assertEqual(advice.action, 's')
+        self.assertEqual(set(advice.evs), {'h', 's', 'd', 'p'})
+        self.assertGreater(advice.evs['s'], 0.5)
+
+    def test_no_double_or_split_when_not_offered(self):
+        advice = Advisor().advise(single_deck_without(8, 8, 10),
+                                  make_hand('8', '8'), 10, False, False)
+        self.assertEqual(set(advice.evs), {'h', 's'})
+
+    def test_results_are_cached(self):
+        advisor = Advisor()
+        composition = single_deck_without(10, 6, 10)
+        first = advisor.advise(composition, make_hand('10', '6'), 10)
+        second = advisor.advise(composition, make_hand('9', '7'), 10)
+        self.assertIs(first, second)
+        self.assertEqual((advisor.hits, advisor.misses), (1, 1))
+
+    def test_cache_is_bounded(self):
+        advisor = Advisor(max_cache_bytes=3000)
+        for upcard in range(2, 11):
+            advisor.advise(single_deck_without(10, 9, upcard),
+                           make_hand('10', '9'), upcard)
+        self.assertLessEqual(advisor.cache_bytes, 3000)
+        self.assertLess(advisor.cache_len(), 9)
+        self.assertGreater(advisor.cache_len(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+'''
+Unit tests for blackjack_analyzer.py
+'''
+
+import contextlib
+import csv
+import gzip
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+from blackjack_2026 import can_double_down
+from blackjack_2026 import can_split
+from blackjack_2026 import Card
+from blackjack_2026 import CARD_RANKS
+from blackjack_2026 import Hand
+from blackjack_2026 import Player
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    from blackjack_analyzer import analyze_records
+    from blackjack_analyzer import AnalysisSummary
+    from blackjack_analyzer import Analyzer
+    from blackjack_analyzer import main
+    from blackjack_analyzer import read_records
+    from blackjack_analyzer import write_results
+    from blackjack_strategy import basic_strategy
+
+
+def make_hand(*ranks):
+    hand = Hand()
+    for rank in ranks:
+        hand.cards.append(Card(rank, 'Spades', True))
+    return hand
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBlackjackAnalyzer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.analyzer = Analyzer()
+
+    def analyze(self, *records, chunk_size=1000):
+        return list(analyze_records(records, self.analyzer, chunk_size))
+
+    def test_offers_match_the_game(self):
+        rng = random.Random(1)
+        for _ in range(300):
+            ranks = [rng.choice(CARD_RANKS) for _ in range(rng.choice((2, 3)))]
+            hand = make_hand(*ranks)
+            hand.bet = 15
+            player = Player(1, 'Ann', rng.choice((10, 15, 500)))
+            num_hands = rng.randint(1, 4)
+            if hand.value() >= 21:
+                continue
+            record = {'cards': ' '.join(ranks), 'upcard': '7', 'bet': 15,
+                      'bank': player.bank, 'num_hands': num_hands}
+            double, split = self.analyze(dict(record, action='d'),
+                                         dict(record, action='p'))
+            self.assertEqual(double['error'] == '',
+                             can_double_down(player, hand, len(ranks) == 2))
+            self.assertEqual(split['error'] == '',
+                             can_split(player, hand, num_hands))
+
+    def test_basic_action_matches_the_chart(self):
+        rng = random.Random(2)
+        for _ in range(300):
+            ranks = [rng.choice(CARD_RANKS) for _ in range(2)]
+            hand = make_hand(*ranks)
+            if hand.value() == 21:
+                continue
+            upcard = Card(rng.choice(CARD_RANKS), 'Hearts', True)
+            result, = self.analyze({'cards': ranks, 'upcard': upcard.rank,
+                                    'action': 's'})
+            offer_split = hand.cards[0].value() == hand.cards[1].value()
+            self.assertEqual(result['basic_action'],
+                             basic_strategy(hand, upcard.value(), True,
+                                            offer_split))
+
+    def test_costs(self):
+        basic, stand, hit = self.analyze(
+            {'cards': '6 5', 'upcard': '6', 'action': 'double'},
+            {'cards': '6 5', 'upcard': '6', 'action': 'stand'},
+            {'cards': '10 7', 'upcard': '5', 'action': 'h'})
+        self.assertEqual(basic['ev_cost'], 0)
+        self.assertGreater(stand['ev_cost'], 0.3)
+        self.assertGreater(hit['ev_cost'], 0.2)
+
+    def test_costs_are_never_negative(self):
+        records = [{'cards': [first, second], 'upcard': upcard,
+                    'action': action}
+                   for first in CARD_RANKS for second in CARD_RANKS
+                   for upcard in CARD_RANKS for action in 'hsdp']
+        costs = [result['ev_cost'] for result in self.analyze(*records)
+                 if not result['error']]
+        self.assertGreater(len(costs), 1000)
+        self.assertGreaterEqual(min(costs), 0)
+
+    def test_csv_output_keeps_every_field(self):
+        stream = io.StringIO('not json\n{"hand_id": 4, "cards": "10 5", '
+                             '"upcard": "5", "action": "h"}\n')
+        output = io.StringIO()
+        write_results(self.analyze(*read_records(stream, False)), output,
+                      True)
+        rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+        self.assertEqual(rows[0]['hand_id'], '')
+        self.assertIn("'not json'", rows[0]['error'])
+        self.assertEqual(rows[1]['hand_id'], '4')
+        self.assertEqual(rows[1]['cards'], '10 5')
+        self.assertEqual(rows[1]['basic_action'], 's')
+        mixed = self.analyze({'cards': '10 5', 'upcard': '5', 'action': 'h'},
+                             {'cards': '10 5', 'upcard': '5', 'action': 'h',
+                              'hand_id': 5})
+        with self.assertRaises(ValueError):
+            write_results(mixed, io.StringIO(), True)
+
+    def test_bad_records_are_reported(self):
+        results = self.analyze({'cards': '10 X', 'upcard': '5', 'action': 'h'},
+                               {'cards': '10 5', 'upcard': '5', 'action': 'y'},
+                               {'cards': '10 5 9', 'upcard': '5',
+                                'action': 'h'},
+                               {'cards': '10 5 2', 'upcard': '5',
+                                'action': 'd'},
+                               {'cards': 5, 'upcard': '5', 'action': 'h'},
+                               {'cards': '10 5', 'upcard': '5', 'action': 'h',
+                                'bet': [10]},
+                               {'cards': '10 5', 'upcard': '5', 'action': 'h',
+                                'bank': 10 ** 30},
+                               [1, 2])
+        stream = io.StringIO('{"cards": "10 5",\n"not json"\n7\n')
+        results += self.analyze(*read_records(stream, False))
+        self.assertEqual(len(results), 11)
+        self.assertTrue(all(result['error'] for result in results))
+        self.assertTrue(all(result['ev_cost'] == '' for result in results))
+        self.assertEqual(results[-1], {'record': 7, 'basic_action': '',
+                                       'ev_cost': '',
+                                       'error': 'record is not an object'})
+
+    def test_long_busted_hands_are_reported(self):
+        result, = self.analyze({'cards': '10 ' * 8, 'upcard': '5',
+                                'action': 'h'})
+        self.assertEqual(result['error'],
+                         "no decision with one card or 21 or more")
+
+    def test_results_do_not_depend_on_chunk_size(self):
+        rng = random.Random(3)
+        records = [{'cards': [rng.choice(CARD_RANKS) for _ in range(2)],
+                    'upcard': rng.choice(CARD_RANKS),
+                    'action': rng.choice('hsdp')} for _ in range(100)]
+        summary = AnalysisSummary()
+        whole = list(analyze_records(records, self.analyzer, 100, summary))
+        self.assertEqual(list(analyze_records(records, self.analyzer, 7)),
+                         whole)
+        self.assertEqual(summary.records, 100)
+
+    def test_main_streams_csv_to_gzipped_json_lines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'audit.csv')
+            destination = os.path.join(directory, 'scored.jsonl.gz')
+            with open(source, 'w', encoding='utf-8', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(['hand_id', 'cards', 'upcard', 'action'])
+                writer.writerow(['1', 'A 7', '9', 's'])
+                writer.writerow(['2', '8 8', '10', 'p'])
+                writer.writerow(['3', '9 9', '7', 'p'])
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                main([source, '--output', destination, '--chunk-size', '2'])
+            with gzip.open(destination, 'rt', encoding='utf-8') as file:
+                results = [json.loads(line) for line in file]
+        self.assertEqual([result['hand_id'] for result in results],
+                         ['1', '2', '3'])
+        self.assertEqual([result['basic_action'] for result in results],
+                         ['h', 'p', 's'])
+        self.assertIn("Analyzed 3 records", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
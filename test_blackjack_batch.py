@@ -0,0 +1,67 @@
+'''
+Unit tests for blackjack_batch.py
+'''
+
+import itertools
+import unittest
+from blackjack_2026 import Card
+from blackjack_2026 import CARD_RANKS
+from blackjack_2026 import Hand
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    from blackjack_batch import encode_hands
+    from blackjack_batch import evaluate_hands
+
+
+def make_hand(*ranks):
+    hand = Hand()
+    for rank in ranks:
+        hand.cards.append(Card(rank, 'Spades'))
+    return hand
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBlackjackBatch(unittest.TestCase):
+
+    def test_matches_hand_for_all_hands_up_to_three_cards(self):
+        hands = [make_hand(*ranks)
+                 for length in range(4)
+                 for ranks in itertools.product(CARD_RANKS, repeat=length)]
+        result = evaluate_hands(encode_hands(hands))
+        for index, hand in enumerate(hands):
+            self.assertEqual(int(result.value[index]), hand.value())
+            self.assertEqual(bool(result.soft[index]), hand.is_soft())
+            self.assertEqual(bool(result.bust[index]), hand.is_bust())
+            self.assertEqual(bool(result.blackjack[index]),
+                             hand.is_blackjack())
+
+    def test_custom_padding_value(self):
+        hands = np.array([[12, 8, 255, 255],
+                          [12, 12, 12, 3],
+                          [8, 8, 1, 255]], dtype=np.uint8)
+        result = evaluate_hands(hands, pad=255)
+        self.assertEqual(result.value.tolist(), [21, 18, 23])
+        self.assertEqual(result.soft.tolist(), [True, True, False])
+        self.assertEqual(result.bust.tolist(), [False, False, True])
+        self.assertEqual(result.blackjack.tolist(), [True, False, False])
+
+    def test_rejects_unknown_codes(self):
+        for hands, pad in (([[12, 13]], -1), ([[12, -2]], -1),
+                           ([[12, -1]], 255), ([[20, 8]], 40)):
+            with self.assertRaises(ValueError):
+                evaluate_hands(np.array(hands), pad=pad)
+        result = evaluate_hands(np.array([[12, 40]]), pad=40)
+        self.assertEqual(result.value.tolist(), [11])
+
+    def test_rejects_one_dimensional_input(self):
+        with self.assertRaises(ValueError):
+            evaluate_hands(np.array([12, 8]))
+
+
+if __name__ == '__main__':
+    unittest.main()
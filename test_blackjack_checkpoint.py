@@ -0,0 +1,99 @@
+'''
+Unit tests for blackjack_checkpoint.py
+'''
+
+import os
+import random
+import tempfile
+import unittest
+from blackjack_2026 import Card
+from blackjack_2026 import Dealer
+from blackjack_2026 import Hand
+from blackjack_2026 import Player
+from blackjack_checkpoint import CheckpointError
+from blackjack_checkpoint import dump_game
+from blackjack_checkpoint import dump_table
+from blackjack_checkpoint import load_game
+from blackjack_checkpoint import load_table
+from blackjack_sim import basic_strategy
+from blackjack_sim import Rules
+from blackjack_sim import simulate
+from blackjack_sim import Table
+
+
+class TestBlackjackCheckpoint(unittest.TestCase):
+
+    def test_game_round_trip(self):
+        dealer = Dealer(2, 52, random.Random(1))
+        for _ in range(10):
+            dealer.discard.append(dealer.deal_one(True))
+        dealer.drew_cut_card = True
+        dealer.hand.cards.append(dealer.deal_one(False))
+        player = Player(3, "Zoë", 250)
+        hand = Hand()
+        hand.bet = 30
+        hand.cards.append(Card('A', 'Hearts', True))
+        player.hands.append(hand)
+
+        restored_dealer, restored_players = load_game(
+            dump_game(dealer, [player]))
+
+        self.assertEqual(restored_dealer.shoe, dealer.shoe)
+        self.assertEqual(restored_dealer.discard, dealer.discard)
+        self.assertEqual(restored_dealer.hand.cards, dealer.hand.cards)
+        self.assertTrue(restored_dealer.drew_cut_card)
+        self.assertEqual(str(restored_players[0]), str(player))
+        self.assertEqual(restored_players[0].bank, 250)
+        self.assertEqual(restored_players[0].hands[0].bet, 30)
+        self.assertEqual(restored_players[0].hands[0].cards, hand.cards)
+        self.assertEqual(restored_dealer.rng.random(), dealer.rng.random())
+
+    def test_resumed_table_matches_uninterrupted(self):
+        rules = Rules(starting_bank=10**6)
+        uninterrupted = Table(3, basic_strategy, rules, random.Random(9))
+        uninterrupted.run(400)
+
+        interrupted = Table(3, basic_strategy, rules, random.Random(9))
+        interrupted.run(150)
+        resumed = load_table(dump_table(interrupted), basic_strategy)
+        resumed.run(250)
+
+        self.assertEqual(resumed.stats.net, uninterrupted.stats.net)
+        self.assertEqual(resumed.stats.hands, uninterrupted.stats.hands)
+        self.assertEqual(resumed.dealer.shoe, uninterrupted.dealer.shoe)
+        self.assertEqual(resumed.dealer.cards_dealt,
+                         uninterrupted.dealer.cards_dealt)
+        self.assertEqual(resumed.dealer.reshuffles,
+                         uninterrupted.dealer.reshuffles)
+        self.assertEqual(resumed.stats.reshuffles,
+                         uninterrupted.stats.reshuffles)
+
+    def test_simulate_resumes_from_checkpoint_file(self):
+        rules = Rules(starting_bank=10**6)
+        expected = simulate(600, 2, 'basic', rules, seed=3)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'table.ckpt')
+            simulate(250, 2, 'basic', rules, 3, checkpoint_path=path,
+                     checkpoint_every=100)
+            resumed = simulate(600, 2, 'basic', rules, 3,
+                               checkpoint_path=path, checkpoint_every=100)
+        self.assertEqual(resumed.net, expected.net)
+        self.assertEqual(resumed.rounds, 600)
+
+    def test_rejects_bad_data(self):
+        with self.assertRaises(CheckpointError):
+            load_game(b'nope')
+        data = dump_game(Dealer(1, 52, random.Random(1)), [])
+        with self.assertRaises(CheckpointError):
+            load_game(data[:20])
+
+    def test_rejects_dealer_subclasses(self):
+        class MarkedDealer(Dealer):
+            pass
+
+        with self.assertRaises(ValueError):
+            dump_game(MarkedDealer(1, 52, random.Random(1)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
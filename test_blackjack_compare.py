@@ -0,0 +1,64 @@
+'''
+Unit tests for blackjack_compare.py
+'''
+
+import unittest
+from blackjack_compare import compare_strategies
+from blackjack_sim import basic_strategy
+from blackjack_sim import mimic_dealer_strategy
+from blackjack_sim import Rules
+
+
+def never_double_strategy(hand, upcard, offer_double_down, offer_split):
+    response = basic_strategy(hand, upcard, offer_double_down, offer_split)
+    return 'h' if response == 'd' else response
+
+
+class TestBlackjackCompare(unittest.TestCase):
+
+    def test_identical_strategies_have_no_difference(self):
+        result = compare_strategies(
+            300, {'a': basic_strategy, 'b': basic_strategy}, seed=1)
+        difference = result.differences['b']
+        self.assertEqual(difference.mean, 0)
+        self.assertEqual(difference.variance, 0)
+        self.assertEqual(result.stats['a'].net, result.stats['b'].net)
+
+    def test_paired_variance_is_smaller_than_independent(self):
+        strategies = {'basic': basic_strategy,
+                      'no double': never_double_strategy}
+        result = compare_strategies(
+            3000, strategies, num_players=2, rules=Rules(num_shoe_decks=2),
+            seed=4)
+        difference = result.differences['no double']
+        self.assertEqual(difference.rounds, 3000)
+        self.assertGreater(difference.variance_reduction(), 5)
+        self.assertEqual(result.stats['basic'].rounds, 3000)
+
+    def test_reproducible_with_seed(self):
+        strategies = {'basic': basic_strategy, 'mimic': mimic_dealer_strategy}
+        first = compare_strategies(200, strategies, seed=7)
+        second = compare_strategies(200, strategies, seed=7)
+        self.assertEqual(first.differences['mimic'],
+                         second.differences['mimic'])
+
+    def test_other_tables_do_not_move_the_reference_shoe(self):
+        # One deck and no cut card, so shoes run out in the middle of rounds
+        rules = Rules(num_shoe_decks=1, shoe_cut_card_position=0)
+        alone = compare_strategies(300, {'basic': basic_strategy},
+                                   num_players=5, rules=rules, seed=8)
+        paired = compare_strategies(
+            300, {'basic': basic_strategy, 'mimic': mimic_dealer_strategy},
+            num_players=5, rules=rules, seed=8)
+        self.assertEqual(alone.stats['basic'], paired.stats['basic'])
+        self.assertGreater(paired.stats['mimic'].reshuffles, 0)
+
+    def test_unlimited_banks_keep_every_seat(self):
+        result = compare_strategies(
+            500, {'mimic': mimic_dealer_strategy},
+            num_players=3, rules=Rules(starting_bank=15), seed=2)
+        self.assertGreaterEqual(result.stats['mimic'].hands, 1500)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+'''
+Unit tests for blackjack_crowd.py
+'''
+
+import random
+import unittest
+from blackjack_sim import basic_strategy
+from blackjack_sim import mimic_dealer_strategy
+from blackjack_sim import Rules
+from blackjack_sim import Table
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    from blackjack_crowd import CrowdTable
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBlackjackCrowd(unittest.TestCase):
+
+    def test_single_seat_matches_table(self):
+        rules = Rules(num_shoe_decks=8, starting_bank=10**6)
+        for seed in range(20):
+            table = Table(1, basic_strategy, rules, random.Random(seed))
+            shoe = np.array([card.value()
+                             for card in reversed(table.dealer.shoe)])
+            crowd = CrowdTable(1, basic_strategy, rules, seed, shoe)
+            # Play until the Table reshuffles with its own generator
+            while True:
+                table.play_round()
+                if table.dealer.reshuffles:
+                    break
+                crowd.play_round()
+                self.assertEqual(crowd.stats, table.stats)
+                self.assertEqual(int(crowd.banks[0]),
+                                 table.players[0].bank)
+
+    def test_bankrupt_seats_are_removed(self):
+        crowd = CrowdTable(50, basic_strategy, Rules(starting_bank=30), 1)
+        crowd.run(1000)
+        self.assertTrue((crowd.banks[crowd.active] >= 15).all())
+        removed = np.setdiff1d(np.arange(50), crowd.active)
+        self.assertTrue((crowd.banks[removed] < 15).all())
+        self.assertGreater(len(removed), 0)
+
+    def test_many_seats_share_one_shoe(self):
+        rules = Rules(num_shoe_decks=100, shoe_cut_card_position=520,
+                      starting_bank=10**6)
+        crowd = CrowdTable(1000, basic_strategy, rules, 2)
+        stats = crowd.run(20)
+        self.assertEqual(stats.rounds, 20)
+        self.assertGreaterEqual(stats.hands, 20000)
+        self.assertEqual(stats.net, int(crowd.banks.sum()) - 1000 * 10**6)
+        self.assertGreater(stats.reshuffles, 0)
+
+    def test_shoe_too_small_for_crowd(self):
+        crowd = CrowdTable(500, basic_strategy, Rules(num_shoe_decks=1), 3)
+        with self.assertRaises(ValueError):
+            crowd.play_round()
+
+    def test_needs_chart_strategy(self):
+        with self.assertRaises(ValueError):
+            CrowdTable(2, mimic_dealer_strategy)
+
+
+if __name__ == '__main__':
+    unittest.main()
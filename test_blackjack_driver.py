@@ -0,0 +1,71 @@
+'''
+Unit tests for blackjack_driver.py
+'''
+
+import random
+import unittest
+from blackjack_2026 import CLEAR_SCREEN
+from blackjack_driver import GeneratedInput
+from blackjack_driver import InputDriver
+from blackjack_driver import PROMPT_BET
+from blackjack_driver import PROMPT_DECISION
+from blackjack_driver import prompt_kind
+from blackjack_driver import run_session
+from blackjack_driver import ScriptedInput
+
+
+class RecordingInput(GeneratedInput):
+    '''
+    A GeneratedInput that keeps every answer it gives.
+    '''
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.answers = []
+
+    def answer(self, prompt, kind):
+        response = super().answer(prompt, kind)
+        self.answers.append(response)
+        return response
+
+
+class TestBlackjackDriver(unittest.TestCase):
+
+    def test_prompt_kinds(self):
+        self.assertEqual(prompt_kind("Player 1 (Ann) has $500. Your bet: "),
+                         PROMPT_BET)
+        self.assertEqual(prompt_kind("Hit or Stay? (h/s): "),
+                         PROMPT_DECISION)
+        with self.assertRaises(ValueError):
+            prompt_kind("Favourite colour? ")
+
+    def test_input_driver_is_abstract(self):
+        with self.assertRaises(TypeError):
+            InputDriver()
+
+    def test_generated_session_records_latency(self):
+        report = run_session(GeneratedInput(2, 30, random.Random(1),
+                                            invalid_rate=0.1), seed=1)
+        # Driven sessions neither clear the screen nor draw the table panel
+        self.assertNotIn(CLEAR_SCREEN, report.output)
+        self.assertNotIn('\x1b', report.output)
+        self.assertIn("Game over", report.output)
+        self.assertEqual(report.prompts,
+                         sum(len(latency.samples)
+                             for latency in report.latencies.values()))
+        self.assertGreater(len(report.latencies[PROMPT_DECISION].samples), 0)
+
+    def test_script_replays_session(self):
+        recorder = RecordingInput(3, 20, random.Random(2))
+        recorded = run_session(recorder, seed=2)
+        replayed = run_session(ScriptedInput(recorder.answers), seed=2)
+        self.assertEqual(replayed.output, recorded.output)
+        self.assertEqual(replayed.prompts, recorded.prompts)
+
+    def test_script_running_out(self):
+        with self.assertRaises(EOFError):
+            run_session(ScriptedInput(['1', 'Ann']), seed=3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+'''
+Unit tests for blackjack_eor.py
+'''
+
+import unittest
+from blackjack_eor import effects_of_removal
+from blackjack_eor import hand_evs
+from blackjack_eor import hand_index
+from blackjack_eor import RoundEV
+from blackjack_eor import shoe_composition
+from blackjack_strategy import basic_strategy
+
+
+class TestBlackjackEOR(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.result = effects_of_removal(1)
+
+    def test_shoe_composition(self):
+        self.assertEqual(shoe_composition(2), (8,) * 9 + (32,))
+
+    def test_effects_have_the_expected_signs(self):
+        effects = self.result.effects
+        for rank in ('2', '3', '4', '5', '6'):
+            self.assertGreater(effects[rank], 0)
+        for rank in ('9', '10', 'K', 'A'):
+            self.assertLess(effects[rank], 0)
+        self.assertEqual(max(effects, key=effects.get), '5')
+        self.assertEqual(self.result.tags()['5'], 1.0)
+
+    def test_effects_balance_over_a_deck(self):
+        # Removing every card of a deck in turn averages out to no change
+        self.assertAlmostEqual(sum(self.result.effects.values()) * 4, 0,
+                               delta=0.002)
+
+    def test_tables_are_shared_between_shoes(self):
+        calculator = RoundEV()
+        shoe = shoe_composition(1)
+        tables = calculator.prepare([shoe])
+        self.assertEqual(calculator.prepare([shoe]), 0)
+        ev = calculator.round_ev(shoe)
+        self.assertEqual(len(calculator.tables), tables)
+        self.assertAlmostEqual(ev, self.result.full_shoe_ev)
+
+    def test_player_blackjack_pays_three_to_two(self):
+        evs = hand_evs(shoe_composition(1), basic_strategy.table, 1.5)
+        self.assertEqual(evs[hand_index(1, 5, 10)], 1.5)
+        self.assertEqual(evs[hand_index(10, 5, 1)], 1.5)
+        self.assertLess(evs[hand_index(1, 10, 10)], 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
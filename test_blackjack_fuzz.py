@@ -0,0 +1,59 @@
+'''
+Unit tests for blackjack_fuzz.py
+'''
+
+import unittest
+from unittest import mock
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    import blackjack_fuzz
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBlackjackFuzz(unittest.TestCase):
+
+    def test_reference_evaluate(self):
+        pad = blackjack_fuzz.PAD
+        hands = np.array([[12, 8, pad],    # A 10 -> soft 21
+                          [12, 12, 3],     # A A 5 -> soft 17
+                          [12, 4, 11],     # A 6 K -> hard 17
+                          [8, 8, 1],       # 10 10 3 -> 23
+                          [pad, pad, pad]], dtype=np.int8)
+        values, soft = blackjack_fuzz.reference_evaluate(hands)
+        self.assertEqual(values.tolist(), [21, 17, 17, 23, 0])
+        self.assertEqual(soft.tolist(), [True, True, False, False, False])
+
+    def test_random_hands_padding(self):
+        hands = blackjack_fuzz.random_hands(1000, 5,
+                                            np.random.default_rng(0))
+        self.assertEqual(hands.shape, (1000, 5))
+        # Padding only ever follows the cards in a hand
+        padded = hands == blackjack_fuzz.PAD
+        self.assertTrue((padded[:, :-1] <= padded[:, 1:]).all())
+
+    def test_scorers_agree_with_reference(self):
+        report = blackjack_fuzz.fuzz(20000, max_cards=6, seed=1,
+                                     chunk_size=5000)
+        self.assertEqual(report.hands, 20000)
+        self.assertTrue(report.passed(), [str(e) for e in report.examples])
+
+    def test_broken_scorer_is_reported(self):
+        def always_hard(ranks):
+            value, _ = blackjack_fuzz.score_blackjack_2026(ranks)
+            return (value, False)
+
+        with mock.patch.dict(blackjack_fuzz.SCORERS,
+                             {'always_hard': always_hard}):
+            report = blackjack_fuzz.fuzz(2000, seed=2, max_examples=3)
+        self.assertGreater(report.mismatches['always_hard'], 0)
+        self.assertEqual(len(report.examples), 3)
+        self.assertTrue(report.examples[0].expected_soft)
+
+
+if __name__ == '__main__':
+    unittest.main()
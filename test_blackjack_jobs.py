@@ -0,0 +1,121 @@
+'''
+Unit tests for blackjack_jobs.py
+'''
+
+import os
+import tempfile
+import time
+import unittest
+from dataclasses import replace
+from unittest import mock
+import blackjack_jobs
+from blackjack_jobs import claim_shard
+from blackjack_jobs import create_job
+from blackjack_jobs import JobSpec
+from blackjack_jobs import load_job
+from blackjack_jobs import merge_results
+from blackjack_jobs import queue_counts
+from blackjack_jobs import requeue_stale
+from blackjack_jobs import run_shard
+from blackjack_jobs import work
+from blackjack_sim import Rules
+from blackjack_sim import simulate
+
+
+class TestBlackjackJobs(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.queue = os.path.join(self.directory.name, 'queue')
+        self.rules = Rules(starting_bank=1000000)
+        create_job(self.queue, JobSpec(1003, 4, 2, 'basic', self.rules, '7'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_merge_matches_simulate(self):
+        self.assertEqual(work(self.queue, 'a', max_shards=1), 1)
+        self.assertEqual(work(self.queue, 'b'), 3)
+        merged = merge_results(self.queue)
+        expected = simulate(1003, 2, 'basic', self.rules, seed='7', workers=4)
+        self.assertEqual(replace(merged, elapsed=0),
+                         replace(expected, elapsed=0))
+        self.assertEqual(queue_counts(self.queue),
+                         {'pending': 0, 'claimed': 0, 'done': 4})
+
+    def test_each_shard_is_claimed_once(self):
+        claims = [claim_shard(self.queue, f"worker{n}") for n in range(5)]
+        self.assertEqual(claims, [0, 1, 2, 3, None])
+
+    def test_stale_claims_are_retried_without_double_counting(self):
+        job = load_job(self.queue)
+        index = claim_shard(self.queue, 'slow')
+        self.assertEqual(requeue_stale(self.queue, lease_seconds=60), [])
+        claim = os.path.join(self.queue, 'claimed', 'shard-000000.json')
+        old = time.time() - 120
+        os.utime(claim, (old, old))
+        self.assertEqual(requeue_stale(self.queue, lease_seconds=60), [index])
+        self.assertEqual(claim_shard(self.queue, 'retry'), index)
+        status = os.path.join(self.queue, 'status', 'shard-000000.json')
+        with open(status, 'w', encoding='utf-8') as status_file:
+            status_file.write('{}')
+        # The slow worker finishes after its claim was given away, and
+        # leaves the new claim and its files alone
+        first = run_shard(self.queue, job, index, 'slow')
+        self.assertTrue(os.path.exists(claim))
+        self.assertTrue(os.path.exists(status))
+        self.assertEqual(run_shard(self.queue, job, index, 'retry'), first)
+        self.assertFalse(os.path.exists(status))
+        work(self.queue)
+        self.assertEqual(merge_results(self.queue).rounds, 1003)
+
+    def test_workers_wait_for_crashed_shards(self):
+        claim_shard(self.queue, 'crashed')
+        self.assertEqual(work(self.queue, 'live', lease_seconds=0.3,
+                              poll_seconds=0.05), 4)
+        self.assertEqual(merge_results(self.queue).rounds, 1003)
+
+    def test_running_shards_renew_their_lease(self):
+        job = load_job(self.queue)
+        index = claim_shard(self.queue, 'live')
+        claim = os.path.join(self.queue, 'claimed', 'shard-000000.json')
+        stale = []
+        original = blackjack_jobs.simulate_shard
+
+        def slow_shard(*args, **kwargs):
+            time.sleep(0.3)
+            stale.extend(requeue_stale(self.queue, lease_seconds=0.2))
+            return original(*args, **kwargs)
+
+        with mock.patch('blackjack_jobs.simulate_shard', slow_shard):
+            run_shard(self.queue, job, index, 'live', lease_seconds=0.2)
+        self.assertEqual(stale, [])
+        self.assertFalse(os.path.exists(claim))
+
+    def test_merge_requires_every_shard(self):
+        work(self.queue, max_shards=3)
+        with self.assertRaises(ValueError):
+            merge_results(self.queue)
+
+    def test_old_shards_are_not_stale_when_claimed(self):
+        pending = os.path.join(self.queue, 'pending', 'shard-000000.json')
+        old = time.time() - 120
+        os.utime(pending, (old, old))
+        self.assertEqual(claim_shard(self.queue, 'a'), 0)
+        self.assertEqual(requeue_stale(self.queue, lease_seconds=60), [])
+        self.assertEqual(queue_counts(self.queue)['claimed'], 1)
+
+    def test_bad_jobs_are_rejected_before_writing(self):
+        for spec in (JobSpec(10, 0), JobSpec(-5, 2), JobSpec(10, 2, 0)):
+            queue = os.path.join(self.directory.name, 'bad')
+            with self.assertRaises(ValueError):
+                create_job(queue, spec)
+            self.assertFalse(os.path.exists(queue))
+
+    def test_existing_job_is_not_replaced(self):
+        with self.assertRaises(FileExistsError):
+            create_job(self.queue, JobSpec(10, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
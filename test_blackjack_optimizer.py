@@ -0,0 +1,79 @@
+'''
+Unit tests for blackjack_optimizer.py
+'''
+
+import random
+import unittest
+from blackjack_2026 import Card
+from blackjack_optimizer import Candidate
+from blackjack_optimizer import Evaluator
+from blackjack_optimizer import FLAT_RAMP
+from blackjack_optimizer import mutate
+from blackjack_optimizer import optimize
+from blackjack_optimizer import RampTable
+from blackjack_sim import basic_strategy
+from blackjack_sim import Rules
+from blackjack_strategy import BASIC_CHART
+
+ALWAYS_HIT = {'hard': {'4': 'H H H H H H H H H H'},
+              'soft': {'12': 'H H H H H H H H H H'}}
+
+
+class TestBlackjackOptimizer(unittest.TestCase):
+
+    def test_ramp_bets_on_true_count(self):
+        table = RampTable(1, basic_strategy, (1, 2, 3, 4, 5, 6),
+                          Rules(starting_bank=10**6), random.Random(1))
+        self.assertEqual(table.bet_size(), 15)
+        # Twenty low cards seen with five decks left is a true count of 4
+        table.dealer.shoe = table.dealer.shoe[:260]
+        table.dealer.discard = [Card('5', 'Hearts')] * 20
+        self.assertEqual(table.bet_size(), 75)
+        table.dealer.reshuffles += 1
+        table.dealer.discard = []
+        self.assertEqual(table.bet_size(), 15)
+
+    def test_mutate_changes_one_thing(self):
+        rng = random.Random(2)
+        start = Candidate(BASIC_CHART)
+        for _ in range(20):
+            mutant = mutate(start, rng)
+            chart_changed = mutant.key[0] != start.key[0]
+            ramp_changed = mutant.ramp != start.ramp
+            self.assertNotEqual(chart_changed, ramp_changed)
+            self.assertEqual(list(mutant.ramp), sorted(mutant.ramp))
+        self.assertEqual(mutate(start, rng, mutate_chart=False).key[0],
+                         start.key[0])
+        self.assertEqual(mutate(start, rng, mutate_ramp=False).ramp,
+                         FLAT_RAMP)
+
+    def test_identical_candidates_share_the_cache(self):
+        evaluator = Evaluator(seed=3, stages=2, stage_rounds=200)
+        basic = Candidate(BASIC_CHART)
+        ramp = Candidate(BASIC_CHART, (1, 1, 1, 2, 2, 2))
+        evaluator.race([basic, Candidate(BASIC_CHART), ramp])
+        played = evaluator.stages_played
+        self.assertLessEqual(played, 4)
+        evaluator.race([ramp, basic])
+        self.assertEqual(evaluator.stages_played, played)
+        self.assertGreater(evaluator.stages_cached, 0)
+
+    def test_weak_candidates_are_pruned(self):
+        evaluator = Evaluator(seed=4, stages=5, stage_rounds=2000)
+        basic = Candidate(BASIC_CHART)
+        survivors = evaluator.race([basic, Candidate(ALWAYS_HIT)])
+        self.assertEqual(survivors, [basic])
+        self.assertLess(evaluator.estimate(Candidate(ALWAYS_HIT)).rounds,
+                        10000)
+
+    def test_results_do_not_depend_on_workers(self):
+        single = optimize(2, 3, seed=5, stages=2, stage_rounds=300)
+        pooled = optimize(2, 3, seed=5, workers=2, stages=2,
+                          stage_rounds=300)
+        self.assertEqual(single.best.key, pooled.best.key)
+        self.assertEqual(single.estimate, pooled.estimate)
+        self.assertEqual(len(single.history), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+'''
+Unit tests for blackjack_progress.py
+'''
+
+import os
+import tempfile
+import unittest
+from blackjack_progress import combine_statuses
+from blackjack_progress import ProgressReporter
+from blackjack_progress import read_status
+from blackjack_progress import STATE_DONE
+from blackjack_progress import STATE_RUNNING
+from blackjack_sim import Rules
+from blackjack_sim import SimulationStats
+from blackjack_sim import simulate
+
+
+class TestBlackjackProgress(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'status.json')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_reporter_writes_status(self):
+        reporter = ProgressReporter(self.path, 1000)
+        reporter.report(SimulationStats(rounds=250, wagered=3750, net=-75,
+                                        cards_dealt=1300, reshuffles=4))
+        status = read_status(self.path)
+        self.assertEqual(status['state'], STATE_RUNNING)
+        self.assertEqual(status['rounds'], 250)
+        self.assertEqual(status['reshuffles'], 4)
+        self.assertAlmostEqual(status['house_edge'], 0.02)
+        self.assertGreater(status['eta_seconds'], 0)
+
+    def test_read_missing_status(self):
+        self.assertIsNone(read_status(self.path))
+
+    def test_combine_statuses(self):
+        reporter = ProgressReporter(self.path, 100)
+        done = reporter.status(SimulationStats(rounds=100, wagered=100,
+                                               net=10), done=True)
+        running = reporter.status(SimulationStats(rounds=50, wagered=100,
+                                                  net=-30))
+        combined = combine_statuses([done, running], 200)
+        self.assertEqual(combined['state'], STATE_RUNNING)
+        self.assertEqual(combined['rounds'], 150)
+        self.assertAlmostEqual(combined['house_edge'], 0.1)
+        self.assertEqual(combine_statuses([done, done], 200)['state'],
+                         STATE_DONE)
+        self.assertEqual(combine_statuses([done, None], 200)['state'],
+                         STATE_RUNNING)
+
+    def test_simulate_reports_final_status(self):
+        stats = simulate(500, 2, 'basic', Rules(starting_bank=10**6), 3,
+                         status_path=self.path, status_every=100)
+        status = read_status(self.path)
+        self.assertEqual(status['state'], STATE_DONE)
+        self.assertEqual(status['rounds'], 500)
+        self.assertEqual(status['eta_seconds'], 0)
+        self.assertEqual(status['cards_dealt'], stats.cards_dealt)
+        self.assertGreater(stats.reshuffles, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+'''
+Unit tests for blackjack_render.py
+'''
+
+import contextlib
+import io
+import os
+import random
+import threading
+import unittest
+from unittest import mock
+import blackjack_2026
+from blackjack_2026 import Card
+from blackjack_2026 import Dealer
+from blackjack_2026 import Hand
+from blackjack_2026 import Player
+from blackjack_driver import ScriptedInput
+from blackjack_render import CLEAR_TO_END_OF_LINE
+from blackjack_render import DiffRenderer
+from blackjack_render import move_to
+from blackjack_render import panel_fits
+from blackjack_render import RESET_SCROLL_REGION
+from blackjack_render import table_lines
+from blackjack_render import TableDisplay
+
+
+class TestBlackjackRender(unittest.TestCase):
+
+    def test_unchanged_lines_produce_no_output(self):
+        renderer = DiffRenderer()
+        renderer.diff(['Dealer: [  ] [5♠]', 'Player 1'])
+        self.assertEqual(renderer.diff(['Dealer: [  ] [5♠]', 'Player 1']),
+                         '')
+
+    def test_only_changed_characters_are_written(self):
+        renderer = DiffRenderer(top=2)
+        renderer.diff(['Bank $500', 'Hand [2♠]'])
+        self.assertEqual(renderer.diff(['Bank $400', 'Hand [2♠]']),
+                         move_to(2, 6) + '4')
+        self.assertEqual(renderer.diff(['Bank $400', 'Hand [2♠] [K♥]']),
+                         move_to(3, 9) + ' [K♥]')
+        self.assertEqual(renderer.diff(['Bank $400', 'Hand']),
+                         move_to(3, 4) + CLEAR_TO_END_OF_LINE)
+
+    def test_lines_are_cut_to_width(self):
+        renderer = DiffRenderer(width=5)
+        self.assertEqual(renderer.diff(['abcdefgh']), move_to(0, 0) + 'abcde')
+
+    def test_dealing_a_card_sends_only_that_card(self):
+        stream = io.StringIO()
+        dealer = Dealer(1, 10, random.Random(1))
+        hand = Hand()
+        hand.cards.append(Card('9', 'Clubs', True))
+        player = Player(1, 'Ann', 485, [hand])
+        display = TableDisplay(1, stream, rows=24)
+        display.update(dealer, [player])
+        before = len(stream.getvalue())
+        player.hands[0].cards.append(Card('K', 'Hearts', True))
+        display.update(dealer, [player])
+        update = stream.getvalue()[before:]
+        self.assertIn('[K♥]', update)
+        self.assertNotIn('[9♣]', update)
+        self.assertLess(len(update), 40)
+
+    def test_split_hands_wrap_and_grow_the_panel(self):
+        stream = io.StringIO()
+        dealer = Dealer(1, 10, random.Random(1))
+        hands = []
+        for ranks in (('10', '2', '3', '2'), ('10', 'A', '2', '3'),
+                      ('8', '2', '2', 'A', 'A', '3')):
+            hand = Hand()
+            hand.cards.extend(Card(rank, 'Spades', True) for rank in ranks)
+            hand.bet = 15
+            hands.append(hand)
+        player = Player(1, 'Ann', 455, hands)
+        lines = table_lines(dealer, [player])
+        self.assertTrue(all(len(line) <= 80 for line in lines))
+        self.assertEqual(len(lines), 5)
+        self.assertIn(f"{hands[2]} $15", lines[3])
+        display = TableDisplay(1, stream, rows=24)
+        display.update(dealer, [player])
+        self.assertEqual(display.height, 5)
+        self.assertIn(f"{hands[2]} $15", stream.getvalue())
+
+    def test_short_terminals_get_no_panel(self):
+        self.assertTrue(panel_fits(4, rows=10))
+        self.assertFalse(panel_fits(5, rows=10))
+        with self.assertRaises(ValueError):
+            TableDisplay(5, io.StringIO(), rows=10)
+        output = io.StringIO()
+        script = ScriptedInput(['1', 'Ann', '15', 's', 'n'])
+        with contextlib.redirect_stdout(output), \
+                mock.patch('shutil.get_terminal_size',
+                           return_value=os.terminal_size((80, 5))):
+            blackjack_2026.main(read_input=script, clear_screen=False,
+                                rng=random.Random(3), render=True)
+        self.assertNotIn('\x1b', output.getvalue())
+        self.assertIn('Dealer: ', output.getvalue())
+
+    def test_game_runs_with_the_table_panel(self):
+        output = io.StringIO()
+        script = ScriptedInput(['1', 'Ann', '15', 's', 'n'])
+        with contextlib.redirect_stdout(output):
+            blackjack_2026.main(read_input=script, clear_screen=False,
+                                rng=random.Random(3), render=True)
+        self.assertIn('Game over', output.getvalue())
+        self.assertIn('Player 1 (Ann) $', output.getvalue())
+
+    def test_terminal_is_restored_when_input_ends(self):
+        output = io.StringIO()
+        threads = threading.active_count()
+        script = ScriptedInput(['1', 'Ann', '15'])
+        with contextlib.redirect_stdout(output), \
+                self.assertRaises(EOFError):
+            blackjack_2026.main(prepare_shoes=True, read_input=script,
+                                clear_screen=False, rng=random.Random(4),
+                                render=True)
+        self.assertIn(RESET_SCROLL_REGION, output.getvalue())
+        self.assertEqual(threading.active_count(), threads)
+
+
+if __name__ == '__main__':
+    unittest.main()
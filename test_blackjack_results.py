@@ -0,0 +1,111 @@
+'''
+Unit tests for blackjack_results.py
+'''
+
+import os
+import random
+import tempfile
+import unittest
+from blackjack_sim import basic_strategy
+from blackjack_sim import OUTCOME_BLACKJACK
+from blackjack_sim import OUTCOME_BUST
+from blackjack_sim import Rules
+from blackjack_sim import simulate
+from blackjack_sim import Table
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    from blackjack_results import ResultReader
+    from blackjack_results import ResultWriter
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBlackjackResults(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_writes_in_chunks_and_reads_back(self):
+        with ResultWriter(self.path, chunk_rows=4) as writer:
+            for round_number in range(10):
+                writer.record(round_number, 1, 0, 15, 30, 20, 19, 2, 530)
+        reader = ResultReader(self.path)
+        self.assertEqual(len(reader.chunk_paths), 3)
+        self.assertEqual(len(reader), 10)
+        self.assertEqual(reader.column('round').tolist(), list(range(10)))
+        self.assertEqual(int(reader.column('final_bet').sum()), 300)
+
+    def test_chunks_are_memory_mapped(self):
+        with ResultWriter(self.path) as writer:
+            writer.record(0, 1, 0, 15, 15, 21, 17, 3, 537)
+        chunk = next(ResultReader(self.path).chunks())
+        self.assertIsInstance(chunk['outcome'], np.memmap)
+
+    def test_table_records_every_hand(self):
+        table = Table(3, basic_strategy, Rules(starting_bank=10**6),
+                      random.Random(2))
+        with ResultWriter(self.path, chunk_rows=100) as writer:
+            table.recorder = writer
+            table.run(300)
+        reader = ResultReader(self.path)
+        self.assertEqual(len(reader), table.stats.hands)
+        outcome = reader.column('outcome')
+        final_bet = reader.column('final_bet')
+        initial_bet = reader.column('initial_bet')
+        self.assertEqual(int((outcome == OUTCOME_BLACKJACK).sum()),
+                         table.stats.blackjacks)
+        self.assertTrue((reader.column('player_total')[
+            outcome == OUTCOME_BUST] > 21).all())
+        self.assertTrue((final_bet >= initial_bet).all())
+        # Net result rebuilt from the columns matches the stats
+        payout = np.select(
+            [outcome == 0, outcome == 1, outcome == 2, outcome == 3,
+             outcome == 4],
+            [-final_bet, 0, final_bet, final_bet * 3 // 2, -final_bet])
+        self.assertEqual(int(payout.sum()), table.stats.net)
+
+    def test_many_shards_are_read_in_order(self):
+        simulate(240, 1, 'basic', Rules(starting_bank=10**6), 6, workers=12,
+                 results_dir=self.path)
+        banks = ResultReader(self.path).column('bank_after').tolist()
+        by_shard = []
+        for index in range(12):
+            shard = os.path.join(self.path, f"shard-{index:05d}")
+            by_shard += ResultReader(shard).column('bank_after').tolist()
+        self.assertEqual(banks, by_shard)
+
+    def test_writer_ignores_shard_subdirectories(self):
+        simulate(40, 1, 'basic', Rules(starting_bank=10**6), 6, workers=2,
+                 results_dir=self.path)
+        before = len(ResultReader(self.path).chunk_paths)
+        writer = ResultWriter(self.path)
+        self.assertEqual(writer.next_chunk, 0)
+        writer.discard_from_round(0)
+        self.assertEqual(len(ResultReader(self.path).chunk_paths), before)
+
+    def test_resumed_simulation_does_not_duplicate_rows(self):
+        rules = Rules(starting_bank=10**6)
+        expected = os.path.join(self.path, 'expected')
+        simulate(300, 2, 'basic', rules, 5, results_dir=expected)
+        checkpoint = os.path.join(self.path, 'table.ckpt')
+        resumed = os.path.join(self.path, 'resumed')
+        simulate(120, 2, 'basic', rules, 5, checkpoint_path=checkpoint,
+                 checkpoint_every=50, results_dir=resumed)
+        simulate(300, 2, 'basic', rules, 5, checkpoint_path=checkpoint,
+                 checkpoint_every=50, results_dir=resumed)
+        for column in ('round', 'final_bet', 'bank_after'):
+            self.assertEqual(
+                ResultReader(resumed).column(column).tolist(),
+                ResultReader(expected).column(column).tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
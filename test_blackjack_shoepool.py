@@ -0,0 +1,77 @@
+'''
+Unit tests for blackjack_shoepool.py
+'''
+
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    from blackjack_shoepool import CODE_CARDS
+    from blackjack_shoepool import PooledDealer
+    from blackjack_shoepool import ShoePool
+    from blackjack_shoepool import simulate_pool
+    from blackjack_sim import Rules
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBlackjackShoePool(unittest.TestCase):
+
+    def test_pool_shoes_are_full_shuffled_shoes(self):
+        pool = ShoePool.create(5, num_shoe_decks=2, seed=1)
+        try:
+            self.assertEqual(pool.shoes.shape, (5, 104))
+            expected = sorted(list(range(52)) * 2)
+            for shoe in pool.shoes:
+                self.assertEqual(sorted(shoe.tolist()), expected)
+            self.assertFalse((pool.shoes[0] == pool.shoes[1]).all())
+        finally:
+            pool.close()
+            pool.unlink()
+
+    def test_attach_sees_same_shoes(self):
+        pool = ShoePool.create(3, num_shoe_decks=1, seed=2)
+        try:
+            attached = ShoePool.attach(*pool.spec())
+            self.assertTrue((attached.shoes == pool.shoes).all())
+            attached.close()
+        finally:
+            pool.close()
+            pool.unlink()
+
+    def test_pooled_dealer_deals_in_order_and_reloads(self):
+        shoes = np.array([list(range(52)), list(range(51, -1, -1))],
+                         dtype=np.uint8)
+        dealer = PooledDealer(shoes, 50)
+        card = dealer.deal_one(True)
+        self.assertEqual((card.rank, card.suit), CODE_CARDS[0])
+        dealer.discard.append(card)
+        for _ in range(2):
+            dealer.discard.append(dealer.deal_one())
+        self.assertTrue(dealer.drew_cut_card)
+        dealer.reshuffle_shoe_if_needed()
+        self.assertEqual(len(dealer.shoe), 52)
+        self.assertEqual(dealer.discard, [])
+        card = dealer.deal_one()
+        self.assertEqual((card.rank, card.suit), CODE_CARDS[51])
+        self.assertFalse(dealer.exhausted)
+        dealer.drew_cut_card = True
+        dealer.reshuffle_shoe_if_needed()
+        self.assertTrue(dealer.exhausted)
+
+    def test_results_do_not_depend_on_worker_count(self):
+        rules = Rules(starting_bank=10**6)
+        single = simulate_pool(40, 2, ('basic', 'mimic'), rules, seed=5)
+        multi = simulate_pool(40, 2, ('basic', 'mimic'), rules, seed=5,
+                              workers=2)
+        for name in ('basic', 'mimic'):
+            self.assertEqual(single[name].net, multi[name].net)
+            self.assertEqual(single[name].rounds, multi[name].rounds)
+        self.assertGreater(single['basic'].rounds, 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+'''
+Unit tests for blackjack_shoeprep.py
+'''
+
+import random
+import time
+import unittest
+from collections import Counter
+from blackjack_shoeprep import PreparedShoeDealer
+
+
+def deal_cards(dealer, count, pause=0.0):
+    '''
+    Deals count cards one round's worth at a time, reshuffling between
+    rounds, and returns them as strings.
+    '''
+    dealt = []
+    for index in range(count):
+        card = dealer.deal_one(True)
+        dealt.append(str(card))
+        dealer.discard.append(card)
+        if index % 10 == 9:
+            dealer.reshuffle_shoe_if_needed()
+            time.sleep(pause)
+    return dealt
+
+
+class TestBlackjackShoePrep(unittest.TestCase):
+
+    def test_seeded_dealers_deal_the_same_cards(self):
+        with PreparedShoeDealer(1, 20, random.Random(1)) as fast, \
+                PreparedShoeDealer(1, 20, random.Random(1)) as slow:
+            self.assertEqual(deal_cards(fast, 500),
+                             deal_cards(slow, 500, 0.001))
+            self.assertGreater(fast.reshuffles, 5)
+
+    def test_prepared_shoe_is_complete(self):
+        with PreparedShoeDealer(2, 52, random.Random(2)) as dealer:
+            deal_cards(dealer, 60)
+            self.assertEqual(dealer.reshuffles, 1)
+            self.assertEqual(len(dealer.shoe), 104)
+            self.assertEqual(dealer.discard, [])
+            counts = Counter((card.rank, card.suit) for card in dealer.shoe)
+            self.assertEqual(set(counts.values()), {2})
+
+    def test_close_stops_thread(self):
+        dealer = PreparedShoeDealer(1, 20, random.Random(3))
+        dealer.close()
+        # pylint: disable-next=protected-access
+        self.assertFalse(dealer._thread.is_alive())
+
+    def test_failed_preparation_is_raised(self):
+        class BrokenRandom(random.Random):
+            def shuffle(self, x):
+                raise OSError("no entropy")
+
+        with PreparedShoeDealer(1, 20, random.Random(4)) as dealer:
+            dealer.prepare_rng = BrokenRandom()
+            with self.assertRaises(RuntimeError) as raised:
+                # The shoes already shuffled come out first
+                for _ in range(3):
+                    dealer.drew_cut_card = True
+                    dealer.reshuffle_shoe_if_needed()
+            self.assertIsInstance(raised.exception.__cause__, OSError)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+'''
+Unit tests for blackjack_shuffles.py
+'''
+
+import random
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    from blackjack_shuffles import box
+    from blackjack_shuffles import exposure
+    from blackjack_shuffles import generate_shoes
+    from blackjack_shuffles import riffle
+    from blackjack_shuffles import ShuffleModelDealer
+    from blackjack_shuffles import ShuffleProcedure
+    from blackjack_shuffles import strip
+    from blackjack_sim import basic_strategy
+    from blackjack_sim import Table
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBlackjackShuffles(unittest.TestCase):
+
+    def test_generated_shoes_are_full_shoes(self):
+        shoes = generate_shoes(50, ShuffleProcedure('riffle*2,strip,box'),
+                               num_shoe_decks=2, seed=1)
+        self.assertEqual(shoes.shape, (50, 104))
+        expected = sorted(list(range(52)) * 2)
+        for shoe in shoes:
+            self.assertEqual(sorted(shoe.tolist()), expected)
+
+    def test_riffle_interleaves_two_packets(self):
+        shoes = riffle(np.tile(np.arange(52), (20, 1)),
+                       np.random.default_rng(2))
+        for shoe in shoes:
+            # Each packet keeps its order, so the cards' positions, in the
+            # original order, rise in at most two runs
+            positions = np.argsort(shoe)
+            self.assertLessEqual((np.diff(positions) < 0).sum(), 1)
+
+    def test_strip_reverses_packets(self):
+        shoes = strip(np.arange(12)[None, :], np.random.default_rng(3),
+                      num_packets=3, cut_sd=0.0)
+        self.assertEqual(shoes[0].tolist(),
+                         [8, 9, 10, 11, 4, 5, 6, 7, 0, 1, 2, 3])
+
+    def test_box_deals_packets_onto_piles(self):
+        shoes = box(np.arange(8)[None, :], np.random.default_rng(4),
+                    num_piles=2, packets_per_pile=2, cut_sd=0.0)
+        self.assertEqual(shoes[0].tolist(), [4, 5, 0, 1, 6, 7, 2, 3])
+
+    def test_bad_procedures_are_rejected(self):
+        with self.assertRaises(ValueError):
+            ShuffleProcedure('riffle,wash')
+        with self.assertRaises(ValueError):
+            ShuffleProcedure('riffle*x')
+
+    def test_exposure_separates_perfect_and_strip(self):
+        perfect_correlation, perfect_together = exposure(
+            ShuffleProcedure('perfect'), 200, seed=5)
+        strip_correlation, strip_together = exposure(
+            ShuffleProcedure('strip'), 200, seed=5)
+        self.assertLess(abs(perfect_correlation), 0.05)
+        self.assertLess(strip_correlation, -0.9)
+        self.assertGreater(strip_together, perfect_together * 5)
+
+    def test_dealer_is_reproducible_and_plays(self):
+        first = ShuffleModelDealer(1, 20, random.Random(6))
+        second = ShuffleModelDealer(1, 20, random.Random(6))
+        cards = [(card.rank, card.suit) for card in first.shoe]
+        self.assertEqual(cards,
+                         [(card.rank, card.suit) for card in second.shoe])
+        self.assertEqual(len(set(cards)), 52)
+        table = Table(2, basic_strategy, dealer=first)
+        stats = table.run(200)
+        self.assertGreater(first.reshuffles, 0)
+        self.assertEqual(stats.rounds, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
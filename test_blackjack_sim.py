@@ -0,0 +1,116 @@
+'''
+Unit tests for blackjack_sim.py
+'''
+
+import io
+import random
+import unittest
+from contextlib import redirect_stderr
+from contextlib import redirect_stdout
+from unittest import mock
+from blackjack_2026 import Card
+from blackjack_2026 import Hand
+from blackjack_sim import basic_strategy
+from blackjack_sim import main
+from blackjack_sim import Rules
+from blackjack_sim import simulate
+from blackjack_sim import Table
+
+
+def make_hand(*ranks):
+    hand = Hand()
+    for rank in ranks:
+        hand.cards.append(Card(rank, 'Spades', True))
+    return hand
+
+
+class TestBlackjackSim(unittest.TestCase):
+
+    '''
+    Strategy tests
+    '''
+
+    def test_basic_strategy_splits_aces_and_eights(self):
+        self.assertEqual(basic_strategy(make_hand('A', 'A'), 10, True, True),
+                         'p')
+        self.assertEqual(basic_strategy(make_hand('8', '8'), 1, True, True),
+                         'p')
+
+    def test_basic_strategy_falls_back_without_double(self):
+        self.assertEqual(basic_strategy(make_hand('6', '5'), 6, True, False),
+                         'd')
+        self.assertEqual(basic_strategy(make_hand('6', '5'), 6, False, False),
+                         'h')
+        self.assertEqual(basic_strategy(make_hand('A', '7'), 4, False, False),
+                         's')
+
+    def test_basic_strategy_stiff_hands(self):
+        self.assertEqual(basic_strategy(make_hand('10', '6'), 6, True, False),
+                         's')
+        self.assertEqual(basic_strategy(make_hand('10', '6'), 7, True, False),
+                         'h')
+
+    '''
+    Table tests
+    '''
+
+    def test_round_conserves_cards(self):
+        table = Table(3, basic_strategy, Rules(num_shoe_decks=2),
+                      rng=random.Random(3))
+        for _ in range(200):
+            table.play_round()
+            dealer = table.dealer
+            self.assertEqual(len(dealer.shoe) + len(dealer.discard), 104)
+
+    def test_bankrupt_players_leave_table(self):
+        table = Table(2, basic_strategy, Rules(starting_bank=15),
+                      rng=random.Random(5))
+        stats = table.run(1000)
+        self.assertEqual(table.players, [])
+        self.assertLess(stats.rounds, 1000)
+
+    '''
+    Simulate tests
+    '''
+
+    def test_simulate_is_reproducible_with_seed(self):
+        rules = Rules(starting_bank=10**6)
+        first = simulate(500, 2, 'basic', rules, seed=7)
+        second = simulate(500, 2, 'basic', rules, seed=7)
+        self.assertEqual(first.net, second.net)
+        self.assertEqual(first.hands, second.hands)
+        self.assertEqual(first.rounds, 500)
+        self.assertEqual(first.wagered, 500 * 2 * rules.minimum_bet)
+
+    def test_threads_match_processes(self):
+        rules = Rules(starting_bank=10**6)
+        processes = simulate(600, 2, 'basic', rules, seed=4, workers=3)
+        threads = simulate(600, 2, 'basic', rules, seed=4, workers=3,
+                           threads=True)
+        self.assertEqual(threads.rounds, 600)
+        self.assertEqual(threads.net, processes.net)
+        self.assertEqual(threads.cards_dealt, processes.cards_dealt)
+
+    def test_threads_fall_back_to_processes_with_the_gil(self):
+        errors = io.StringIO()
+        with mock.patch('blackjack_sim.gil_enabled', return_value=True), \
+                mock.patch('blackjack_sim.simulate',
+                           wraps=simulate) as wrapped, \
+                redirect_stdout(io.StringIO()), redirect_stderr(errors):
+            main(['--rounds', '40', '--seed', '1', '--workers', '2',
+                  '--threads'])
+        self.assertFalse(wrapped.call_args.args[-1])
+        self.assertIn("free-threaded", errors.getvalue())
+
+    def test_main_prints_summary(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            exit_code = main(['--rounds', '50', '--seed', '1',
+                              '--strategy', 'mimic'])
+        self.assertEqual(exit_code, 0)
+        self.assertIn("rounds/sec", output.getvalue())
+        self.assertIn("House edge", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+'''
+Unit tests for blackjack_strategy.py
+'''
+
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from blackjack_2026 import Card
+from blackjack_2026 import Dealer
+from blackjack_2026 import Hand
+from blackjack_2026 import Player
+from blackjack_2026 import play_player_rounds
+from blackjack_strategy import basic_strategy
+from blackjack_strategy import BASIC_CHART
+from blackjack_strategy import ChartError
+from blackjack_strategy import ChartStrategy
+from blackjack_strategy import load_chart
+
+STAND_ON_17 = {
+    'hard': {'4': 'H H H H H H H H H H', '17': 'S S S S S S S S S S'},
+    'soft': {'12': 'H H H H H H H H H H', '18': 'S S S S S S S S S S'},
+}
+
+
+def make_hand(*ranks):
+    hand = Hand()
+    for rank in ranks:
+        hand.cards.append(Card(rank, 'Spades', True))
+    return hand
+
+
+class TestBlackjackStrategy(unittest.TestCase):
+
+    '''
+    Lookup tests
+    '''
+
+    def test_basic_pairs(self):
+        self.assertEqual(basic_strategy(make_hand('8', '8'), 1, True, True),
+                         'p')
+        self.assertEqual(basic_strategy(make_hand('9', '9'), 7, True, True),
+                         's')
+        self.assertEqual(basic_strategy(make_hand('K', 'Q'), 6, True, True),
+                         's')
+
+    def test_pair_not_split_when_not_offered(self):
+        self.assertEqual(basic_strategy(make_hand('8', '8'), 10, True, False),
+                         'h')
+        self.assertEqual(basic_strategy(make_hand('A', 'A'), 6, True, False),
+                         'h')
+
+    def test_double_down_fallbacks(self):
+        self.assertEqual(basic_strategy(make_hand('A', '7'), 5, True, False),
+                         'd')
+        self.assertEqual(basic_strategy(make_hand('A', '7'), 5, False, False),
+                         's')
+        self.assertEqual(basic_strategy(make_hand('A', '6'), 5, False, False),
+                         'h')
+
+    def test_missing_rows_use_nearest_lower_row(self):
+        strategy = ChartStrategy(STAND_ON_17)
+        self.assertEqual(strategy(make_hand('10', '9'), 10, True, False), 's')
+        self.assertEqual(strategy(make_hand('10', '6'), 10, True, False), 'h')
+        self.assertEqual(strategy(make_hand('A', '8'), 10, True, False), 's')
+        self.assertEqual(strategy(make_hand('8', '8'), 10, True, True), 'h')
+
+    '''
+    Chart file tests
+    '''
+
+    def test_load_json_and_csv_charts(self):
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, 'basic.json')
+            with open(json_path, 'w', encoding='utf-8') as chart_file:
+                json.dump(BASIC_CHART, chart_file)
+            csv_path = os.path.join(directory, 'basic.csv')
+            with open(csv_path, 'w', encoding='utf-8') as chart_file:
+                chart_file.write("table,player,2,3,4,5,6,7,8,9,10,A\n")
+                for table, rows in BASIC_CHART.items():
+                    for player, cells in rows.items():
+                        chart_file.write(
+                            f"{table},{player},{','.join(cells.split())}\n")
+            self.assertEqual(ChartStrategy.from_file(json_path).table,
+                             basic_strategy.table)
+            self.assertEqual(ChartStrategy(load_chart(csv_path)).table,
+                             basic_strategy.table)
+
+    def test_bad_charts_are_rejected(self):
+        with self.assertRaises(ChartError):
+            ChartStrategy({'hard': {'12': 'H H H'}, 'soft': {'13': 'H'}})
+        with self.assertRaises(ChartError):
+            ChartStrategy({'hard': {'12': 'H H H H H H H H H X'},
+                           'soft': STAND_ON_17['soft']})
+        with self.assertRaises(ChartError):
+            ChartStrategy({'hard': STAND_ON_17['hard']})
+
+    '''
+    Game integration tests
+    '''
+
+    def test_play_player_rounds_uses_strategy(self):
+        dealer = Dealer(1, 10, random.Random(1))
+        dealer.hand.cards.append(Card('10', 'Clubs'))
+        dealer.hand.cards.append(Card('6', 'Clubs', True))
+        player = Player(1, "Bot", 100)
+        hand = make_hand('5', '6')
+        hand.bet = 20
+        player.hands.append(hand)
+        player.bank -= 20
+        with redirect_stdout(io.StringIO()):
+            play_player_rounds([player], dealer, basic_strategy)
+        self.assertEqual(hand.bet, 40)
+        self.assertEqual(len(hand.cards), 3)
+        self.assertEqual(player.bank, 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
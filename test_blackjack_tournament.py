@@ -0,0 +1,60 @@
+'''
+Unit tests for blackjack_tournament.py
+'''
+
+import random
+import unittest
+from blackjack_sim import Rules
+from blackjack_tournament import run_tournament
+from blackjack_tournament import TournamentTable
+
+
+class TestBlackjackTournament(unittest.TestCase):
+
+    def test_each_seat_plays_its_own_strategy(self):
+        calls = {'first': 0, 'second': 0}
+
+        def counting(name):
+            def strategy(hand, upcard, offer_double_down, offer_split):
+                calls[name] += 1
+                return 's'
+            return strategy
+
+        table = TournamentTable([counting('first'), counting('second')],
+                                Rules(starting_bank=10**6), random.Random(1))
+        table.run(200)
+        self.assertGreater(calls['first'], 0)
+        self.assertGreater(calls['second'], 0)
+
+    def test_empty_tables_finish_early(self):
+        result = run_tournament(3, 2, 10**6, ['mimic'],
+                                Rules(starting_bank=100), seed=2)
+        self.assertEqual(len(result.standings), 6)
+        self.assertTrue(all(standing.eliminated
+                            for standing in result.standings))
+        self.assertLess(result.stats.rounds, 3 * 10**6)
+        self.assertEqual(result.strategies[0].survivors, 0)
+
+    def test_leaderboards(self):
+        result = run_tournament(4, 3, 300, ['basic', 'mimic'], seed=3,
+                                segment_rounds=50)
+        banks = [standing.bank for standing in result.standings]
+        self.assertEqual(banks, sorted(banks, reverse=True))
+        self.assertEqual({standing.strategy
+                          for standing in result.strategies},
+                         {'basic', 'mimic'})
+        self.assertEqual(sum(standing.bots
+                             for standing in result.strategies), 12)
+
+    def test_results_do_not_depend_on_workers(self):
+        single = run_tournament(3, 2, 400, ['basic', 'mimic'], seed=4,
+                                segment_rounds=100)
+        pooled = run_tournament(3, 2, 400, ['basic', 'mimic'], seed=4,
+                                workers=2, segment_rounds=100)
+        self.assertEqual(
+            [(standing.name, standing.bank) for standing in single.standings],
+            [(standing.name, standing.bank) for standing in pooled.standings])
+
+
+if __name__ == '__main__':
+    unittest.main()